@@ -0,0 +1,211 @@
+"""
+Compression benchmarks for pyNVTT.
+
+Drives `Surface`, `Context.compress_all` and `EasyDDS` across formats, qualities, image sizes and with or
+without mipmaps on CPU, reporting megapixels/s, peak RSS and output size. Every case runs in a fresh process
+so its peak RSS is its own.
+
+    python benchmarks/bench_compression.py run --out baseline.json
+    python benchmarks/bench_compression.py run --formats BC7 --qualities Fastest --sizes 512 --out new.json
+    python benchmarks/bench_compression.py compare baseline.json new.json --threshold 0.1
+"""
+from pathlib import Path
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from nvtt.surface import Surface  # noqa: E402
+from nvtt.compression import CompressionOptions  # noqa: E402
+from nvtt.context import Context  # noqa: E402
+from nvtt.enums import Format, Quality, InputFormat, Filters  # noqa: E402
+from nvtt.utils.easy_dds import EasyDDS  # noqa: E402
+from nvtt.core import nvtt  # noqa: E402
+
+DEFAULT_FORMATS: list[str] = ["BC1", "BC3", "BC4", "BC5", "BC6U", "BC7", "ASTC_LDR_4x4", "ASTC_LDR_6x6", "ASTC_LDR_8x8"]
+DEFAULT_QUALITIES: list[str] = [q.name for q in Quality]
+DEFAULT_SIZES: list[int] = [256, 1024, 2048]
+SEED_SIZE: int = 64
+
+
+def make_surface(size: int, seed: int = 0) -> Surface:
+    """Returns a deterministic, smooth random RGBA surface of `size` x `size`."""
+    rng = random.Random(seed)
+    surf: Surface = Surface()
+    surf.set_image_data(InputFormat.BGRA_8UB, SEED_SIZE, SEED_SIZE, 1, rng.randbytes(SEED_SIZE * SEED_SIZE * 4))
+    surf.resize(size, size, 1, Filters.MITCHELL)
+    return surf
+
+
+def peak_rss_kb() -> int:
+    """Returns the peak resident set size of this process in KiB."""
+    if sys.platform.startswith("win"):
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize // 1024
+    import resource
+    rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def bench_compress(format: str, quality: str, size: int, mips: bool, repeat: int) -> dict:
+    """Benchmarks Context.compress_all of a generated surface into memory."""
+    source: Surface = make_surface(size)
+    co: CompressionOptions = CompressionOptions()
+    co.format(Format[format])
+    co.quality(Quality[quality])
+    ctx: Context = Context()
+    ctx.enable_cuda_acceleration(False)
+    best: float = float("inf")
+    output_bytes: int = 0
+    for _ in range(repeat):
+        surf: Surface = source.clone()
+        start: float = time.perf_counter()
+        data = ctx.compress_all_to_buffer(surf, co, do_mips=mips)
+        best = min(best, time.perf_counter() - start)
+        output_bytes = len(data)
+    return {"seconds": best, "output_bytes": output_bytes}
+
+
+def bench_easy_dds(size: int, repeat: int) -> dict:
+    """Benchmarks EasyDDS.convert_img of a PNG file, load and write included."""
+    with tempfile.TemporaryDirectory() as tmp:
+        png: Path = Path(tmp) / "bench.png"
+        make_surface(size).save(str(png))
+        best: float = float("inf")
+        for _ in range(repeat):
+            start: float = time.perf_counter()
+            EasyDDS.convert_img(png)
+            best = min(best, time.perf_counter() - start)
+        return {"seconds": best, "output_bytes": png.with_suffix(".dds").stat().st_size}
+
+
+def run_case(case: dict) -> dict:
+    """Runs one benchmark case, meant to be called in a fresh process."""
+    if case["kind"] == "compress":
+        result = bench_compress(case["format"], case["quality"], case["size"], case["mips"], case["repeat"])
+    else:
+        result = bench_easy_dds(case["size"], case["repeat"])
+    # Only the top level is counted, so numbers stay comparable with and without mipmaps.
+    result["mpix_per_s"] = case["size"] * case["size"] / 1e6 / result["seconds"]
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+
+def case_id(case: dict) -> str:
+    """Returns the stable identifier of a case, used to match baselines."""
+    if case["kind"] == "compress":
+        return f"compress/{case['format']}/{case['quality']}/{case['size']}/{'mips' if case['mips'] else 'nomips'}"
+    return f"easy_dds/{case['size']}"
+
+
+def build_cases(args: argparse.Namespace) -> list[dict]:
+    """Returns every case selected on the command line."""
+    cases: list[dict] = []
+    for size in args.sizes:
+        for format in args.formats:
+            for quality in args.qualities:
+                for mips in ((True, False) if args.mips == "both" else (args.mips == "on",)):
+                    cases.append({"kind": "compress", "format": format, "quality": quality, "size": size,
+                                  "mips": mips, "repeat": args.repeat})
+        if not args.no_easy_dds:
+            cases.append({"kind": "easy_dds", "size": size, "repeat": args.repeat})
+    return cases
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    """Runs the selected cases and writes a JSON baseline."""
+    results: dict[str, dict] = {}
+    cases: list[dict] = build_cases(args)
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for i, case in enumerate(cases, 1):
+            result: dict = pool.apply(run_case, (case,))
+            results[case_id(case)] = result
+            print(f"[{i}/{len(cases)}] {case_id(case):48} {result['mpix_per_s']:10.2f} MP/s "
+                  f"{result['peak_rss_kb'] / 1024:8.1f} MiB {result['output_bytes']:>10} B", flush=True)
+    baseline: dict = {
+        "meta": {
+            "nvtt_version": nvtt.version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(baseline, indent=1, sort_keys=True), encoding="utf-8")
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    """Compares two baselines, returning 1 if any case regressed by more than the threshold."""
+    old: dict = json.loads(Path(args.old).read_text(encoding="utf-8"))["results"]
+    new: dict = json.loads(Path(args.new).read_text(encoding="utf-8"))["results"]
+    regressions: int = 0
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        speed: float = after["mpix_per_s"] / before["mpix_per_s"] - 1.0
+        rss: float = after["peak_rss_kb"] / before["peak_rss_kb"] - 1.0
+        flags: list[str] = []
+        if speed < -args.threshold:
+            flags.append("SLOWER")
+        if rss > args.threshold:
+            flags.append("MORE MEMORY")
+        if after["output_bytes"] != before["output_bytes"]:
+            flags.append("SIZE CHANGED")
+        if flags:
+            regressions += 1
+        print(f"{key:48} speed {speed:+7.1%} rss {rss:+7.1%} size {after['output_bytes'] - before['output_bytes']:+8} "
+              f"{' '.join(flags)}")
+    for key in sorted(old.keys() - new.keys()):
+        print(f"{key:48} missing from {args.new}")
+    print(f"{regressions} regression(s) above {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="pyNVTT compression benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the benchmarks.")
+    run.add_argument("--formats", nargs="+", default=DEFAULT_FORMATS, choices=list(Format.__members__))
+    run.add_argument("--qualities", nargs="+", default=DEFAULT_QUALITIES, choices=[q.name for q in Quality])
+    run.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    run.add_argument("--mips", choices=["on", "off", "both"], default="both")
+    run.add_argument("--repeat", type=int, default=3, help="Runs per case, the fastest one is kept.")
+    run.add_argument("--no-easy-dds", action="store_true", help="Skip the EasyDDS file conversion cases.")
+    run.add_argument("--out", help="Path of the JSON baseline to write.")
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="Compare two JSON baselines.")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=0.1, help="Relative change flagged as a regression.")
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Startup benchmark for pyNVTT.
+
+Measures, in fresh interpreters, the time to import the wrapper modules, to import them and bind every
+native function eagerly (what every import used to cost), and to import them and create a first Surface.
+
+    python benchmarks/bench_import.py --runs 20
+"""
+from pathlib import Path
+import argparse
+import statistics
+import subprocess
+import sys
+
+SRC: Path = Path(__file__).resolve().parents[1] / "src"
+
+IMPORTS: str = (
+    "import nvtt.surface, nvtt.context, nvtt.compression, nvtt.output, nvtt.utils.easy_dds\n"
+    "from nvtt.core import nvtt as native\n"
+)
+
+SCENARIOS: dict[str, str] = {
+    "import": IMPORTS + "assert not native.is_loaded\n",
+    "import + preload": IMPORTS + "native.preload()\n",
+    "import + first Surface": IMPORTS + "nvtt.surface.Surface()\n",
+}
+
+TIMED: str = (
+    "import sys, time\n"
+    "sys.path.insert(0, {src!r})\n"
+    "start = time.perf_counter()\n"
+    "{code}"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def measure(code: str, runs: int) -> list[float]:
+    """Returns the in-process wall time of `code` over `runs` fresh interpreters, in seconds."""
+    timings: list[float] = []
+    script: str = TIMED.format(src=str(SRC), code=code)
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="pyNVTT startup benchmark.")
+    parser.add_argument("--runs", type=int, default=20, help="Fresh interpreters per scenario.")
+    args = parser.parse_args(argv)
+
+    medians: dict[str, float] = {}
+    for name, code in SCENARIOS.items():
+        timings: list[float] = measure(code, args.runs)
+        medians[name] = statistics.median(timings)
+        print(f"{name:24} median {medians[name] * 1000:8.2f} ms  min {min(timings) * 1000:8.2f} ms")
+    print(f"Lazy import is {medians['import + preload'] / medians['import']:.1f}x faster than eager binding.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
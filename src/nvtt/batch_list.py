@@ -0,0 +1,43 @@
+from .surface import Surface
+from .output import OutputOptions
+from .core import nvtt
+
+
+class BatchList:
+    """High-level wrapper for nvttBatchList."""
+
+    def __init__(self):
+        """Creates an empty batch list."""
+        self._lib = nvtt._lib
+        self._ptr = nvtt._lib.nvttCreateBatchList()
+        # Keeps the appended wrappers alive until the batch has been compressed.
+        self._items: list[tuple[Surface, int, int, OutputOptions]] = []
+        if not self._ptr:
+            raise RuntimeError("Failed to create nvttBatchList.")
+
+    def __del__(self):
+        """Destructor."""
+        if getattr(self, "_ptr", None):
+            self._lib.nvttDestroyBatchList(self._ptr)
+
+    def __len__(self) -> int:
+        """Returns the number of items in the batch."""
+        if not self._ptr:
+            raise RuntimeError("Batch list has already been destroyed or not initialized.")
+        return self._lib.nvttBatchListGetSize(self._ptr)
+
+    def clear(self) -> None:
+        """Clears the batch list."""
+        if not self._ptr:
+            raise RuntimeError("Batch list has already been destroyed or not initialized.")
+        self._lib.nvttBatchListClear(self._ptr)
+        self._items.clear()
+
+    def append(self, surface: Surface, face: int, mipmap: int, oo: OutputOptions) -> None:
+        """Appends a pointer to a Surface, face, mipmap level and OutputOptions to the batch."""
+        if not self._ptr:
+            raise RuntimeError("Batch list has already been destroyed or not initialized.")
+        if surface.is_null:
+            raise RuntimeError("Surface is null or has not been initialized.")
+        self._lib.nvttBatchListAppend(self._ptr, surface._ptr, face, mipmap, oo._ptr)
+        self._items.append((surface, face, mipmap, oo))
@@ -8,19 +8,39 @@ class CompressionOptions:
         """Create a new instance of CompressionOptions."""
         self._lib = nvtt._lib
         self._ptr = nvtt._lib.nvttCreateCompressionOptions()
+        # NVTT cannot read options back, so every setting is mirrored here.
+        self._settings: dict[str, object] = {}
         if not self._ptr:
             raise RuntimeError("Failed to create nvttCompressionOptions.")
     
     def __del__(self):
         """Destructor."""
-        if getattr(self, '_ptr', None):
-            self._lib.nvttDestroyCompressionOptions(self._ptr)
+        self.close()
+
+    def __enter__(self) -> "CompressionOptions":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Frees the native options now instead of on garbage collection. The options cannot be used afterwards."""
+        ptr = getattr(self, "_ptr", None)
+        if ptr:
+            self._ptr = None
+            self._lib.nvttDestroyCompressionOptions(ptr)
+
+    @property
+    def closed(self) -> bool:
+        """Returns whether the native options has been freed."""
+        return not getattr(self, "_ptr", None)
     
     def reset(self):
         """Reset the compression options to default values."""
         if not self._ptr:
             raise RuntimeError("Compression options have already been destroyed or not initialized.")
         self._lib.nvttResetCompressionOptions(self._ptr)
+        self._settings.clear()
         
     def format(self, format: Format):
         """Set the compression format."""
@@ -28,6 +48,7 @@ class CompressionOptions:
         if not self._ptr:
             raise RuntimeError("Compression options have already been destroyed or not initialized.")
         self._lib.nvttSetCompressionOptionsFormat(self._ptr, get_format)
+        self._settings["format"] = get_format
         
     def quality(self, quality: Quality):
         """Set the compression quality."""
@@ -35,18 +56,21 @@ class CompressionOptions:
         if not self._ptr:
             raise RuntimeError("Compression options have already been destroyed or not initialized.")
         self._lib.nvttSetCompressionOptionsQuality(self._ptr, get_quality)
+        self._settings["quality"] = get_quality
         
     def color_weights(self, r: float, g: float, b: float, a: float):
         """Set the weights of each color channel used to measure compression error."""
         if not self._ptr:
             raise RuntimeError("Compression options have already been destroyed or not initialized.")
         self._lib.nvttSetCompressionOptionsColorWeights(self._ptr, r, g, b, a)
+        self._settings["color_weights"] = [r, g, b, a]
         
     def pixel_format(self, bitcount: int, rmask: int, gmask: int, bmask: int, amask: int):
         """Describes an RGB/RGBA format using 32-bit masks per channel."""
         if not self._ptr:
             raise RuntimeError("Compression options have already been destroyed or not initialized.")
         self._lib.nvttSetCompressionOptionsPixelFormat(self._ptr, bitcount, rmask, gmask, bmask, amask)
+        self._settings["pixel_format"] = [bitcount, rmask, gmask, bmask, amask]
         
     def pixel_type(self, pixel_type: PixelType):
         """Set the pixel type."""
@@ -54,19 +78,27 @@ class CompressionOptions:
         if not self._ptr:
             raise RuntimeError("Compression options have already been destroyed or not initialized.")
         self._lib.nvttSetCompressionOptionsPixelType(self._ptr, get_pixel_type)
+        self._settings["pixel_type"] = get_pixel_type
         
     def pitch_alignment(self, alignment: int):
         """Set pitch alignment in bytes."""
         if not self._ptr:
             raise RuntimeError("Compression options have already been destroyed or not initialized.")
         self._lib.nvttSetCompressionOptionsPitchAlignment(self._ptr, alignment)
+        self._settings["pitch_alignment"] = alignment
         
     def quantization(self, color_dithering: bool, alpha_dithering: bool, binary_alpha: bool, alpha_threshold: int):
         """Set the quantization options."""
         if not self._ptr:
             raise RuntimeError("Compression options have already been destroyed or not initialized.")
         self._lib.nvttSetCompressionOptionsQuantization(self._ptr, color_dithering, alpha_dithering, binary_alpha, alpha_threshold)
+        self._settings["quantization"] = [color_dithering, alpha_dithering, binary_alpha, alpha_threshold]
         
+    @property
+    def settings(self) -> dict[str, object]:
+        """Returns every option set since creation or the last reset."""
+        return dict(self._settings)
+
     def d3d9_format(self) -> int:
         """Translates to a D3D format. Returns 0 if no corresponding format could be found."""
         if not self._ptr:
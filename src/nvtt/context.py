@@ -1,9 +1,20 @@
 import ctypes
+import threading
+from concurrent.futures import CancelledError, Future, wait as wait_futures
+from typing import Iterable
 from .surface import Surface
 from .compression import CompressionOptions
-from .output import OutputOptions
-from .enums import Filters
+from .output import OutputOptions, OutputBuffer
+from .batch_list import BatchList
+from .mip_chain import MipChain
+from .timing import TimingContext, DEFAULT_DETAIL_LEVEL
+from .enums import Filters, TextureType
+from .tiled import TileSource, compress_tiled, DEFAULT_MEMORY_BUDGET
+from .layered import CUBE_FACES, compress_layers
+from pathlib import Path
 from .core import nvtt
+from .utils.dds import MAX_HEADER_SIZE
+from .utils.async_helper import run_blocking
 
 class Context:
     """High-level wrapper for nvttContext."""
@@ -12,13 +23,34 @@ class Context:
         """Creates a new instance of Context."""
         self._lib = nvtt._lib
         self._ptr = nvtt._lib.nvttCreateContext()
+        # Set by the async API, checked between mipmap levels to stop a cancelled compression.
+        self._cancel_event: threading.Event | None = None
+        # Executor calls of the async API still running on this Context, see wait().
+        self._pending: set[Future] = set()
         if not self._ptr:
             raise RuntimeError("Failed to create NVTT context.")
         
     def __del__(self):
         """Destructor."""
-        if getattr(self, '_ptr', None):
-            self._lib.nvttDestroyContext(self._ptr)
+        self.close()
+
+    def __enter__(self) -> "Context":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Frees the native context now instead of on garbage collection. Its timing_context and the Context cannot be used afterwards."""
+        ptr = getattr(self, "_ptr", None)
+        if ptr:
+            self._ptr = None
+            self._lib.nvttDestroyContext(ptr)
+
+    @property
+    def closed(self) -> bool:
+        """Returns whether the native context has been freed."""
+        return not getattr(self, "_ptr", None)
             
     def enable_cuda_acceleration(self, enabled: bool):
         """Enable CUDA acceleration; initializes CUDA if not already initialized.."""
@@ -33,6 +65,25 @@ class Context:
             raise RuntimeError("Context has already been destroyed or not initialized.")
         return self._lib.nvttContextIsCudaAccelerationEnabled(self._ptr)
     
+    def enable_timing(self, enabled: bool, detail_level: int = DEFAULT_DETAIL_LEVEL) -> None:
+        """
+        Enable or disable recording the time spent in each compression stage, see `timing_context`.
+
+        NVTT records the Context stages (size estimate, header, conversion and encoding of each mipmap) from
+        detail level 3, the default; lower levels record nothing.
+        """
+        if not self._ptr:
+            raise RuntimeError("Context has already been destroyed or not initialized.")
+        self._lib.nvttContextEnableTiming(self._ptr, int(enabled), detail_level)
+
+    @property
+    def timing_context(self) -> TimingContext | None:
+        """Returns the Context's own TimingContext, or None if timing is not enabled."""
+        if not self._ptr:
+            raise RuntimeError("Context has already been destroyed or not initialized.")
+        ptr = self._lib.nvttContextGetTimingContext(self._ptr)
+        return TimingContext._borrow(ptr, self) if ptr else None
+
     def output_header(self, surface: Surface, mipmap_count: int, co: CompressionOptions, oo: OutputOptions):
         """Write the #Container's header to the output."""
         if not self._ptr:
@@ -40,6 +91,13 @@ class Context:
         return self._lib.nvttContextOutputHeader(self._ptr, surface._ptr, mipmap_count, 
                                                  co._ptr, oo._ptr)
         
+    def output_header_data(self, type: TextureType, width: int, height: int, depth: int, mipmap_count: int, is_normal_map: bool, co: CompressionOptions, oo: OutputOptions):
+        """Write the #Container's header to the output from the texture's description, without needing a Surface."""
+        if not self._ptr:
+            raise RuntimeError("Context has already been destroyed or not initialized.")
+        return self._lib.nvttContextOutputHeaderData(self._ptr, int(type), width, height, depth, mipmap_count,
+                                                     is_normal_map, co._ptr, oo._ptr)
+
     def compress(self, surface: Surface, face: int, mipmap: int, co: CompressionOptions, oo: OutputOptions):
         """Compress the Surface and write the compressed data to the output."""
         if not self._ptr:
@@ -49,17 +107,151 @@ class Context:
         
     def compress_all(self, surface: Surface, co: CompressionOptions, oo: OutputOptions, face=0, min_level = 1, mipmap_filter: Filters = Filters.MITCHELL, do_mips: bool = True):
         """Compress the Surface and write the compressed data to the output including all mipmap levels at once."""
+        if not oo.has_output:
+            raise RuntimeError("No output set, call filename() or output_handler() on the output options first.")
         mipmap_count: int = surface.count_mipmaps(min_level) if do_mips else 1
-        self.output_header(surface, mipmap_count, co, oo)
-        self.compress(surface, face, 0, co, oo)
-        mip: int = 1
-        while surface.can_make_next_mipmap(min_level):
+        if not self.output_header(surface, mipmap_count, co, oo):
+            raise RuntimeError(f"Failed to write the header for the {surface._ptr} surface.")
+        if not self.compress(surface, face, 0, co, oo):
+            raise RuntimeError(f"Failed to compress the {surface._ptr} surface.")
+        mip: int = 0
+        while do_mips and surface.can_make_next_mipmap(min_level):
+            if self._cancel_event is not None and self._cancel_event.is_set():
+                raise CancelledError(f"Compression of the {surface._ptr} surface was cancelled.")
             if not surface.build_next_mipmap(int(mipmap_filter), min_level):
                 raise RuntimeError(f"Failed to build a mipmap level for surface {surface._ptr}.")
             mip += 1
             if not self.compress(surface, face, mip, co, oo):
                 raise RuntimeError(f"Failed to compress the {surface._ptr} surface.")
-        
+
+    def compress_all_to_buffer(self, surface: Surface, co: CompressionOptions, buffer = None, oo: OutputOptions | None = None, face=0, min_level = 1, mipmap_filter: Filters = Filters.MITCHELL, do_mips: bool = True) -> memoryview:
+        """
+        Variant of compress_all() that writes into memory instead of a file.
+
+        `buffer` can be any writable buffer-protocol object, if omitted a bytearray sized with estimate_size() is allocated.
+        `oo` can be passed to use its container and header settings, it is not modified.
+        Returns a view over the written bytes.
+        """
+        if buffer is None:
+            mipmap_count: int = surface.count_mipmaps(min_level) if do_mips else 1
+            buffer = bytearray(self.estimate_size(surface, mipmap_count, co) + MAX_HEADER_SIZE)
+        # Only the settings of `oo` are read, the data goes through options of our own.
+        with (oo.copy() if oo is not None else OutputOptions()) as buffer_oo:
+            out: OutputBuffer = buffer_oo.output_to_buffer(buffer)
+            self.compress_all(surface, co, buffer_oo, face, min_level, mipmap_filter, do_mips)
+        return out.getvalue()
+
+    def compress_to_bytes(self, surface: Surface, co: CompressionOptions, oo: OutputOptions | None = None, face=0, min_level = 1, mipmap_filter: Filters = Filters.MITCHELL, do_mips: bool = True) -> bytes:
+        """Variant of compress_all() that returns the compressed data as bytes instead of writing a file."""
+        return bytes(self.compress_all_to_buffer(surface, co, None, oo, face, min_level, mipmap_filter, do_mips))
+
+    async def compress_all_async(self, surface: Surface, co: CompressionOptions, oo: OutputOptions, face=0, min_level = 1, mipmap_filter: Filters = Filters.MITCHELL, do_mips: bool = True):
+        """
+        Variant of compress_all() running on the bounded executor of the async API.
+
+        Cancelling it stops the compression at the next mipmap level. The Context, Surface and options must not
+        be used by anything else until it completes, after a cancellation call wait() before reusing them.
+        """
+        await self._run_async(self.compress_all, surface, co, oo, face, min_level, mipmap_filter, do_mips)
+
+    async def compress_to_bytes_async(self, surface: Surface, co: CompressionOptions, oo: OutputOptions | None = None, face=0, min_level = 1, mipmap_filter: Filters = Filters.MITCHELL, do_mips: bool = True) -> bytes:
+        """Variant of compress_to_bytes() running on the bounded executor of the async API, see compress_all_async()."""
+        return await self._run_async(self.compress_to_bytes, surface, co, oo, face, min_level, mipmap_filter, do_mips)
+
+    async def _run_async(self, func, *args):
+        """Runs one of this Context's methods on the async executor, with cancellation between mipmap levels."""
+        cancel_event = threading.Event()
+
+        def run():
+            self._cancel_event = cancel_event
+            try:
+                return func(*args)
+            finally:
+                self._cancel_event = None
+
+        def on_submit(future: Future) -> None:
+            self._pending.add(future)
+            future.add_done_callback(self._pending.discard)
+
+        return await run_blocking(run, cancel_event=cancel_event, on_submit=on_submit)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until the calls of the async API on this Context have returned, including cancelled ones still
+        stopping on their worker thread. Returns False if `timeout` seconds elapsed first.
+        """
+        return not wait_futures(set(self._pending), timeout).not_done
+
+    def compress_batch(self, batch: BatchList | Iterable[tuple[Surface, int, int, OutputOptions]], co: CompressionOptions) -> bool:
+        """
+        Compress a batch of (Surface, face, mipmap, OutputOptions) entries sharing the same CompressionOptions.
+
+        Every entry is encoded in a single native call, so NVTT can parallelize across the whole set.
+        """
+        if not self._ptr:
+            raise RuntimeError("Context has already been destroyed or not initialized.")
+        if not isinstance(batch, BatchList):
+            entries = batch
+            batch = BatchList()
+            for surface, face, mipmap, oo in entries:
+                batch.append(surface, face, mipmap, oo)
+        if not self._lib.nvttContextCompressBatch(self._ptr, batch._ptr, co._ptr):
+            raise RuntimeError("Failed to compress the batch.")
+        return True
+
+    def compress_chain(self, chain: MipChain, co: CompressionOptions, oo: OutputOptions, face=0):
+        """Compress every level of a MipChain, header included, without modifying it."""
+        if not self.output_header(chain.top, len(chain), co, oo):
+            raise RuntimeError(f"Failed to write the header for the {chain.top._ptr} surface.")
+        for mip, level in enumerate(chain):
+            if not self.compress(level, face, mip, co, oo):
+                raise RuntimeError(f"Failed to compress the {level._ptr} surface.")
+
+    def compress_variants(self, chain: MipChain, targets: Iterable[tuple[CompressionOptions, OutputOptions]], face=0):
+        """Compress the same MipChain once per (CompressionOptions, OutputOptions) target, reusing the decoded and filtered levels."""
+        for co, oo in targets:
+            self.compress_chain(chain, co, oo, face)
+
+    def compress_tiled(self, source: TileSource, co: CompressionOptions, output: str, oo: OutputOptions | None = None, memory_budget: int = DEFAULT_MEMORY_BUDGET, min_level = 1, do_mips: bool = True) -> int:
+        """
+        Compress a texture too large for a Surface to the DDS file `output`, one block-aligned tile at a time.
+
+        Tiles are read from `source` (e.g. a PillowTileSource or RawTileSource) and sized so that one tile fits
+        `memory_budget` bytes. Each mipmap level is built from the box-downsampled tiles of the previous one and
+        kept in a temporary file, so peak memory depends on the budget and not on the texture size. The output
+        matches compress_all() with Filters.BOX as long as every level has even dimensions.
+        Only block-compressed formats are supported, only the container of `oo` is used. Returns the number of
+        tiles compressed.
+        """
+        if not self._ptr:
+            raise RuntimeError("Context has already been destroyed or not initialized.")
+        return compress_tiled(self, source, co, output, oo, memory_budget, min_level, do_mips)
+
+    def compress_cube(self, faces: list[Surface | str | Path], co: CompressionOptions, output: str | Path | None = None, oo: OutputOptions | None = None, min_level = 1, mipmap_filter: Filters = Filters.MITCHELL, do_mips: bool = True, workers: int | None = None) -> bytes:
+        """
+        Compress the 6 faces of a cube map (+X, -X, +Y, -Y, +Z, -Z; Surfaces or image paths) to a single DDS.
+
+        The header is written once, then each face's mip chain is built and compressed on its own worker thread
+        with its own Context, and the faces are assembled in DDS order. Like compress_all(), the surfaces are left
+        at their last mipmap. Returns the DDS bytes, also written atomically to `output` if given.
+        """
+        if not self._ptr:
+            raise RuntimeError("Context has already been destroyed or not initialized.")
+        if len(faces) != CUBE_FACES:
+            raise ValueError(f"A cube map needs {CUBE_FACES} faces, got {len(faces)}.")
+        return compress_layers(self, TextureType.CUBE, list(faces), co, output, oo, min_level, mipmap_filter, do_mips, workers)
+
+    def compress_array(self, layers: list[Surface | str | Path], co: CompressionOptions, output: str | Path | None = None, oo: OutputOptions | None = None, min_level = 1, mipmap_filter: Filters = Filters.MITCHELL, do_mips: bool = True, workers: int | None = None) -> bytes:
+        """
+        Compress the layers of a 2D texture array (Surfaces or image paths) to a single DDS, see compress_cube().
+
+        More than one layer requires `oo` set to the DDS10 container, the only one storing an array size. Only the
+        container of `oo` is read, its output is left untouched.
+        """
+        if not self._ptr:
+            raise RuntimeError("Context has already been destroyed or not initialized.")
+        return compress_layers(self, TextureType.TEXTURE_2D, list(layers), co, output, oo, min_level, mipmap_filter, do_mips, workers)
+
     def estimate_size(self, surface: Surface, mipmap_count: int, co: CompressionOptions):
         """Returns the total compressed size of mips, without compressing the image."""
         if not self._ptr:
@@ -1,27 +1,52 @@
 import ctypes
 from pathlib import Path
 import sys
+import threading
 LIBRARY_PATH = Path(Path(__file__).parent) / "libs"
 
 WINDOWS_NVTT: str = "nvtt30205.dll"
 LINUX_NVTT: str = "libnvtt.so.30205"
 
+# Object a function operates on (its name without "nvtt" and a leading verb) mapped to the method binding its group.
+# Functions matching none of them are bound by map_nvtt_funcs.
+FUNCTION_GROUPS: dict[str, str] = {
+    "TimingContext": "map_timing_context_funcs",
+    "BatchList": "map_batch_list_funcs",
+    "CompressionOptions": "map_comp_options_funcs",
+    "OutputOptions": "map_out_options_funcs",
+    "Context": "map_context_funcs",
+    "Surface": "map_surface_funcs",
+    "CPUInputBuffer": "map_low_level_funcs",
+    "EncodeCPU": "map_low_level_funcs",
+}
+FUNCTION_VERBS: tuple[str, ...] = ("Create", "Destroy", "Reset", "Set", "Get")
+
+
+class _LazyLibrary:
+    """Stand-in for the NVTT shared library, loading it and binding each function group on first use."""
+
+    def __init__(self, owner: "NVTT"):
+        self._owner = owner
+
+    def __getattr__(self, name: str):
+        func = self._owner._bind(name)
+        # Cached as a plain attribute, so later lookups never come back here.
+        setattr(self, name, func)
+        return func
+
 
 class NVTT:
-    """Wrapper for the NVIDIA Texture Tools (nvtt) library."""
+    """
+    Wrapper for the NVIDIA Texture Tools (nvtt) library.
+
+    The shared library is only opened when a function is first used, and functions are bound
+    (argtypes/restype) one group at a time, so importing pyNVTT does not touch the native library.
+    """
     def __init__(self):
-        dll_path: str = None
-        if sys.platform.startswith("win"):
-            dll_path = str(LIBRARY_PATH / WINDOWS_NVTT)
-        elif sys.platform.startswith("linux"):
-            dll_path = str(LIBRARY_PATH / LINUX_NVTT)
-        else:
-            raise RuntimeError("Unsupported platform for NVTT library.")
-        
-        if not dll_path:
-            raise RuntimeError("NVTT library not found at expected path: {}".format(dll_path))
-        
-        self._lib = ctypes.CDLL(dll_path)
+        self._dll: ctypes.CDLL | None = None
+        self._lib = _LazyLibrary(self)
+        self._mapped: set[str] = set()
+        self._lock = threading.RLock()
         self._version: int = 0
 
         class NvttCompressionOptions(ctypes.Structure):
@@ -36,6 +61,36 @@ class NVTT:
         class NvttSurface(ctypes.Structure):
             pass
 
+        class NvttBatchList(ctypes.Structure):
+            pass
+
+        class NvttTimingContext(ctypes.Structure):
+            pass
+
+        class NvttCPUInputBuffer(ctypes.Structure):
+            pass
+
+        class NvttRefImage(ctypes.Structure):
+            _fields_ = [
+                ("data", ctypes.c_void_p),
+                ("width", ctypes.c_int),
+                ("height", ctypes.c_int),
+                ("depth", ctypes.c_int),
+                ("num_channels", ctypes.c_int),
+                ("channel_swizzle", ctypes.c_int * 4),  # ChannelOrder
+                ("channel_interleave", ctypes.c_int),  # NvttBoolean
+            ]
+
+        class NvttEncodeSettings(ctypes.Structure):
+            _fields_ = [
+                ("sType", ctypes.c_uint32),
+                ("format", ctypes.c_int),
+                ("quality", ctypes.c_int),
+                ("rgb_pixel_type", ctypes.c_int),
+                ("timing_context", ctypes.c_void_p),
+                ("encode_flags", ctypes.c_uint32),
+            ]
+
         self.NvttCompressionOptionsPtr = ctypes.POINTER(NvttCompressionOptions)
 
         self.NvttOutputOptionsPtr = ctypes.POINTER(NvttOutputOptions)
@@ -44,70 +99,167 @@ class NVTT:
 
         self.NvttSurfacePtr = ctypes.POINTER(NvttSurface)
 
-        self.map_comp_options_funcs()
-        self.map_out_options_funcs()
-        self.map_context_funcs()
-        self.map_surface_funcs()
-        self.map_nvtt_funcs()
+        self.NvttBatchListPtr = ctypes.POINTER(NvttBatchList)
+
+        self.NvttTimingContextPtr = ctypes.POINTER(NvttTimingContext)
+
+        self.NvttCPUInputBufferPtr = ctypes.POINTER(NvttCPUInputBuffer)
+
+        self.NvttRefImage = NvttRefImage
+
+        self.NvttEncodeSettings = NvttEncodeSettings
+
+        # Callbacks used by nvttSetOutputOptionsOutputHandler.
+        self.BeginImageHandler = ctypes.CFUNCTYPE(
+            None,
+            ctypes.c_int,  # size
+            ctypes.c_int,  # width
+            ctypes.c_int,  # height
+            ctypes.c_int,  # depth
+            ctypes.c_int,  # face
+            ctypes.c_int,  # miplevel
+        )
+        self.OutputHandler = ctypes.CFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_int)
+        self.EndImageHandler = ctypes.CFUNCTYPE(None)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Returns whether the shared library has been opened."""
+        return self._dll is not None
+
+    def load(self) -> ctypes.CDLL:
+        """Opens the shared library if it is not open yet."""
+        with self._lock:
+            if self._dll is None:
+                dll_path: str = None
+                if sys.platform.startswith("win"):
+                    dll_path = str(LIBRARY_PATH / WINDOWS_NVTT)
+                elif sys.platform.startswith("linux"):
+                    dll_path = str(LIBRARY_PATH / LINUX_NVTT)
+                else:
+                    raise RuntimeError("Unsupported platform for NVTT library.")
+
+                if not dll_path:
+                    raise RuntimeError("NVTT library not found at expected path: {}".format(dll_path))
+
+                self._dll = ctypes.CDLL(dll_path)
+            return self._dll
+
+    def preload(self) -> None:
+        """Opens the shared library and binds every function group at once, e.g. to warm up a worker."""
+        with self._lock:
+            for group in FUNCTION_GROUPS.values():
+                self._map_group(group)
+            self._map_group("map_nvtt_funcs")
+
+    def _bind(self, name: str):
+        """Binds the group `name` belongs to and returns the bound function."""
+        obj: str = name.removeprefix("nvtt")
+        for verb in FUNCTION_VERBS:
+            if obj.startswith(verb):
+                obj = obj.removeprefix(verb)
+                break
+        group: str = "map_nvtt_funcs"
+        for prefix, candidate in FUNCTION_GROUPS.items():
+            if obj.startswith(prefix):
+                group = candidate
+                break
+        with self._lock:
+            self._map_group(group)
+            return getattr(self._dll, name)
+
+    def _map_group(self, group: str) -> None:
+        """Runs the `group` mapping method once."""
+        if group not in self._mapped:
+            self.load()
+            getattr(self, group)()
+            self._mapped.add(group)
 
     def map_nvtt_funcs(self):
         """Map NVTT functions."""
-        self._lib.nvttVersion.restype = ctypes.c_uint
-        self._lib.nvttVersion.argtypes = []
+        self._dll.nvttVersion.restype = ctypes.c_uint
+        self._dll.nvttVersion.argtypes = []
         
-        self._lib.nvttIsCudaSupported.restype = ctypes.c_bool
-        self._lib.nvttIsCudaSupported.argtypes = []
+        self._dll.nvttIsCudaSupported.restype = ctypes.c_bool
+        self._dll.nvttIsCudaSupported.argtypes = []
+
+        self._dll.nvttRmsError.restype = ctypes.c_float
+        self._dll.nvttRmsError.argtypes = [
+            self.NvttSurfacePtr,  # reference
+            self.NvttSurfacePtr,  # image
+            ctypes.c_void_p,  # NvttTimingContext
+        ]
+
+        self._dll.nvttRmsAlphaError.restype = ctypes.c_float
+        self._dll.nvttRmsAlphaError.argtypes = [
+            self.NvttSurfacePtr,  # reference
+            self.NvttSurfacePtr,  # image
+            ctypes.c_void_p,  # NvttTimingContext
+        ]
 
     def map_surface_funcs(self):
         """Map nvttSurface functions."""
 
-        self._lib.nvttCreateSurface.restype = self.NvttSurfacePtr
-        self._lib.nvttCreateSurface.argtypes = ()
+        self._dll.nvttCreateSurface.restype = self.NvttSurfacePtr
+        self._dll.nvttCreateSurface.argtypes = ()
 
-        self._lib.nvttDestroySurface.restype = None
-        self._lib.nvttDestroySurface.argtypes = [self.NvttSurfacePtr]
+        self._dll.nvttDestroySurface.restype = None
+        self._dll.nvttDestroySurface.argtypes = [self.NvttSurfacePtr]
         
-        self._lib.nvttSurfaceClone.restype = self.NvttSurfacePtr
-        self._lib.nvttSurfaceClone.argtypes = [self.NvttSurfacePtr]
+        self._dll.nvttSurfaceClone.restype = self.NvttSurfacePtr
+        self._dll.nvttSurfaceClone.argtypes = [self.NvttSurfacePtr]
         
-        self._lib.nvttSetSurfaceWrapMode.restype = None
-        self._lib.nvttSetSurfaceWrapMode.argtypes = [self.NvttSurfacePtr, ctypes.c_int]
+        self._dll.nvttSurfaceWrapMode.restype = ctypes.c_int
+        self._dll.nvttSurfaceWrapMode.argtypes = [self.NvttSurfacePtr]
+
+        self._dll.nvttSurfaceAlphaMode.restype = ctypes.c_int
+        self._dll.nvttSurfaceAlphaMode.argtypes = [self.NvttSurfacePtr]
+
+        self._dll.nvttSurfaceIsNormalMap.restype = ctypes.c_bool
+        self._dll.nvttSurfaceIsNormalMap.argtypes = [self.NvttSurfacePtr]
+
+        self._dll.nvttSetSurfaceWrapMode.restype = None
+        self._dll.nvttSetSurfaceWrapMode.argtypes = [self.NvttSurfacePtr, ctypes.c_int]
         
-        self._lib.nvttSetSurfaceAlphaMode.restype = None
-        self._lib.nvttSetSurfaceAlphaMode.argtypes = [self.NvttSurfacePtr, ctypes.c_int]
+        self._dll.nvttSetSurfaceAlphaMode.restype = None
+        self._dll.nvttSetSurfaceAlphaMode.argtypes = [self.NvttSurfacePtr, ctypes.c_int]
         
-        self._lib.nvttSetSurfaceNormalMap.restype = None
-        self._lib.nvttSetSurfaceNormalMap.argtypes = [self.NvttSurfacePtr, ctypes.c_bool]
+        self._dll.nvttSetSurfaceNormalMap.restype = None
+        self._dll.nvttSetSurfaceNormalMap.argtypes = [self.NvttSurfacePtr, ctypes.c_bool]
         
-        self._lib.nvttSurfaceIsNull.restype = ctypes.c_bool
-        self._lib.nvttSurfaceIsNull.argtypes = [self.NvttSurfacePtr]
+        self._dll.nvttSurfaceIsNull.restype = ctypes.c_bool
+        self._dll.nvttSurfaceIsNull.argtypes = [self.NvttSurfacePtr]
         
-        self._lib.nvttSurfaceWidth.restype = ctypes.c_int
-        self._lib.nvttSurfaceWidth.argtypes = [self.NvttSurfacePtr]
+        self._dll.nvttSurfaceWidth.restype = ctypes.c_int
+        self._dll.nvttSurfaceWidth.argtypes = [self.NvttSurfacePtr]
         
-        self._lib.nvttSurfaceHeight.restype = ctypes.c_int
-        self._lib.nvttSurfaceHeight.argtypes = [self.NvttSurfacePtr]
+        self._dll.nvttSurfaceHeight.restype = ctypes.c_int
+        self._dll.nvttSurfaceHeight.argtypes = [self.NvttSurfacePtr]
 
-        self._lib.nvttSurfaceDepth.restype = ctypes.c_int
-        self._lib.nvttSurfaceDepth.argtypes = [self.NvttSurfacePtr]
+        self._dll.nvttSurfaceDepth.restype = ctypes.c_int
+        self._dll.nvttSurfaceDepth.argtypes = [self.NvttSurfacePtr]
         
-        self._lib.nvttSurfaceType.restype = ctypes.c_int
-        self._lib.nvttSurfaceType.argtypes = [self.NvttSurfacePtr]
+        self._dll.nvttSurfaceType.restype = ctypes.c_int
+        self._dll.nvttSurfaceType.argtypes = [self.NvttSurfacePtr]
         
-        self._lib.nvttSurfaceCountMipmaps.restype = ctypes.c_int
-        self._lib.nvttSurfaceCountMipmaps.argtypes = [self.NvttSurfacePtr, ctypes.c_int]
+        self._dll.nvttSurfaceCountMipmaps.restype = ctypes.c_int
+        self._dll.nvttSurfaceCountMipmaps.argtypes = [self.NvttSurfacePtr, ctypes.c_int]
         
-        self._lib.nvttSurfaceAlphaTestCoverage.restype = ctypes.c_float
-        self._lib.nvttSurfaceAlphaTestCoverage.argtypes = [self.NvttSurfacePtr, ctypes.c_float, ctypes.c_int]
+        self._dll.nvttSurfaceAlphaTestCoverage.restype = ctypes.c_float
+        self._dll.nvttSurfaceAlphaTestCoverage.argtypes = [self.NvttSurfacePtr, ctypes.c_float, ctypes.c_int]
         
         #Ignore Average
-        #Ignore Data
-        #Ignore channel
+        self._dll.nvttSurfaceData.restype = ctypes.POINTER(ctypes.c_float)
+        self._dll.nvttSurfaceData.argtypes = [self.NvttSurfacePtr]
+
+        self._dll.nvttSurfaceChannel.restype = ctypes.POINTER(ctypes.c_float)
+        self._dll.nvttSurfaceChannel.argtypes = [self.NvttSurfacePtr, ctypes.c_int]
+
         #Ignore Histogram
         #Ignore Range
 
-        self._lib.nvttSurfaceLoad.restype = ctypes.c_bool
-        self._lib.nvttSurfaceLoad.argtypes = (
+        self._dll.nvttSurfaceLoad.restype = ctypes.c_bool
+        self._dll.nvttSurfaceLoad.argtypes = (
             self.NvttSurfacePtr,  # Surface
             ctypes.c_char_p,  # filename
             ctypes.POINTER(ctypes.c_bool),  # hasAlpha
@@ -115,8 +267,8 @@ class NVTT:
             ctypes.c_void_p,  # NvttTimingContext
         )
         
-        self._lib.nvttSurfaceLoadFromMemory.restype = ctypes.c_bool
-        self._lib.nvttSurfaceLoadFromMemory.argtypes = (
+        self._dll.nvttSurfaceLoadFromMemory.restype = ctypes.c_bool
+        self._dll.nvttSurfaceLoadFromMemory.argtypes = (
             self.NvttSurfacePtr,  # Surface
             ctypes.c_void_p,
             ctypes.c_ulonglong,
@@ -125,8 +277,8 @@ class NVTT:
             ctypes.c_void_p,  # NvttTimingContext
         )
         
-        self._lib.nvttSurfaceSave.restype = ctypes.c_bool
-        self._lib.nvttSurfaceSave.argtypes = (
+        self._dll.nvttSurfaceSave.restype = ctypes.c_bool
+        self._dll.nvttSurfaceSave.argtypes = (
             self.NvttSurfacePtr,
             ctypes.c_char_p,
             ctypes.c_bool,
@@ -134,14 +286,46 @@ class NVTT:
             ctypes.c_void_p
         )
         
-        #Ignore SetImage
-        #Ignore SetImageData
-        #Ignore SetImageRGBA
+        self._dll.nvttSurfaceSetImage.restype = ctypes.c_bool
+        self._dll.nvttSurfaceSetImage.argtypes = [
+            self.NvttSurfacePtr,
+            ctypes.c_int,  # width
+            ctypes.c_int,  # height
+            ctypes.c_int,  # depth
+            ctypes.c_void_p  # NvttTimingContext
+        ]
+
+        self._dll.nvttSurfaceSetImageData.restype = ctypes.c_bool
+        self._dll.nvttSurfaceSetImageData.argtypes = [
+            self.NvttSurfacePtr,
+            ctypes.c_int,  # InputFormat
+            ctypes.c_int,  # width
+            ctypes.c_int,  # height
+            ctypes.c_int,  # depth
+            ctypes.c_void_p,  # data
+            ctypes.c_int,  # NvttBoolean unsignedToSigned
+            ctypes.c_void_p  # NvttTimingContext
+        ]
+
+        self._dll.nvttSurfaceSetImageRGBA.restype = ctypes.c_bool
+        self._dll.nvttSurfaceSetImageRGBA.argtypes = [
+            self.NvttSurfacePtr,
+            ctypes.c_int,  # InputFormat
+            ctypes.c_int,  # width
+            ctypes.c_int,  # height
+            ctypes.c_int,  # depth
+            ctypes.c_void_p,  # r
+            ctypes.c_void_p,  # g
+            ctypes.c_void_p,  # b
+            ctypes.c_void_p,  # a
+            ctypes.c_void_p  # NvttTimingContext
+        ]
+
         #Ignore SetImage2D
         #Ignore SetImage3D
         
-        self._lib.nvttSurfaceResize.restype = None
-        self._lib.nvttSurfaceResize.argtypes = [
+        self._dll.nvttSurfaceResize.restype = None
+        self._dll.nvttSurfaceResize.argtypes = [
             self.NvttSurfacePtr,
             ctypes.c_int,  # width
             ctypes.c_int,  # height
@@ -152,8 +336,8 @@ class NVTT:
             ctypes.c_void_p # NvttTimingContext
         ]
         
-        self._lib.nvttSurfaceResizeMax.restype = None
-        self._lib.nvttSurfaceResizeMax.argtypes = [
+        self._dll.nvttSurfaceResizeMax.restype = None
+        self._dll.nvttSurfaceResizeMax.argtypes = [
             self.NvttSurfacePtr,
             ctypes.c_int,  # maxExtent
             ctypes.c_int,  # RoundMode
@@ -163,8 +347,8 @@ class NVTT:
         
         #Ignore ResizeMaxParams
         
-        self._lib.nvttSurfaceResizeMakeSquare.restype = None
-        self._lib.nvttSurfaceResizeMakeSquare.argtypes = [
+        self._dll.nvttSurfaceResizeMakeSquare.restype = None
+        self._dll.nvttSurfaceResizeMakeSquare.argtypes = [
             self.NvttSurfacePtr,
             ctypes.c_int,  # maxExtent
             ctypes.c_int,  # RoundMode
@@ -174,78 +358,80 @@ class NVTT:
         
         #Ignore BuildNextMipmap
         
-        self._lib.nvttSurfaceBuildNextMipmapDefaults.restype = ctypes.c_bool
-        self._lib.nvttSurfaceBuildNextMipmapDefaults.argtypes = [
+        self._dll.nvttSurfaceBuildNextMipmapDefaults.restype = ctypes.c_bool
+        self._dll.nvttSurfaceBuildNextMipmapDefaults.argtypes = [
             self.NvttSurfacePtr,
-            ctypes.c_int,
+            ctypes.c_int,  # Filter
+            ctypes.c_int,  # min_size
+            ctypes.c_void_p  # NvttTimingContext
         ]
         
         #Ignore BuildNextMipmapSolidColor
-        self._lib.nvttSurfaceCanvasSize.restype = None
-        self._lib.nvttSurfaceCanvasSize.argtypes = [self.NvttSurfacePtr, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+        self._dll.nvttSurfaceCanvasSize.restype = None
+        self._dll.nvttSurfaceCanvasSize.argtypes = [self.NvttSurfacePtr, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
         
-        self._lib.nvttSurfaceCanMakeNextMipmap.restype = ctypes.c_bool
-        self._lib.nvttSurfaceCanMakeNextMipmap.argtypes = [self.NvttSurfacePtr, ctypes.c_int]
+        self._dll.nvttSurfaceCanMakeNextMipmap.restype = ctypes.c_bool
+        self._dll.nvttSurfaceCanMakeNextMipmap.argtypes = [self.NvttSurfacePtr, ctypes.c_int]
         
-        self._lib.nvttSurfaceToLinear.restype = None
-        self._lib.nvttSurfaceToLinear.argtypes = [self.NvttSurfacePtr, ctypes.c_float, ctypes.c_void_p]
+        self._dll.nvttSurfaceToLinear.restype = None
+        self._dll.nvttSurfaceToLinear.argtypes = [self.NvttSurfacePtr, ctypes.c_float, ctypes.c_void_p]
         
-        self._lib.nvttSurfaceToGamma.restype = None
-        self._lib.nvttSurfaceToGamma.argtypes = [self.NvttSurfacePtr, ctypes.c_float, ctypes.c_void_p]
+        self._dll.nvttSurfaceToGamma.restype = None
+        self._dll.nvttSurfaceToGamma.argtypes = [self.NvttSurfacePtr, ctypes.c_float, ctypes.c_void_p]
         
-        self._lib.nvttSurfaceToLinearChannel.restype = None
-        self._lib.nvttSurfaceToLinearChannel.argtypes = [self.NvttSurfacePtr, ctypes.c_int, ctypes.c_float, ctypes.c_void_p]
+        self._dll.nvttSurfaceToLinearChannel.restype = None
+        self._dll.nvttSurfaceToLinearChannel.argtypes = [self.NvttSurfacePtr, ctypes.c_int, ctypes.c_float, ctypes.c_void_p]
         
-        self._lib.nvttSurfaceToGammaChannel.restype = None
-        self._lib.nvttSurfaceToGammaChannel.argtypes = [self.NvttSurfacePtr, ctypes.c_int, ctypes.c_float, ctypes.c_void_p]
+        self._dll.nvttSurfaceToGammaChannel.restype = None
+        self._dll.nvttSurfaceToGammaChannel.argtypes = [self.NvttSurfacePtr, ctypes.c_int, ctypes.c_float, ctypes.c_void_p]
         
-        self._lib.nvttSurfaceToSrgb.restype = None
-        self._lib.nvttSurfaceToSrgb.argtypes = [self.NvttSurfacePtr, ctypes.c_void_p]
+        self._dll.nvttSurfaceToSrgb.restype = None
+        self._dll.nvttSurfaceToSrgb.argtypes = [self.NvttSurfacePtr, ctypes.c_void_p]
         
-        self._lib.nvttSurfaceToSrgbUnclamped.restype = None
-        self._lib.nvttSurfaceToSrgbUnclamped.argtypes = [self.NvttSurfacePtr, ctypes.c_void_p]
+        self._dll.nvttSurfaceToSrgbUnclamped.restype = None
+        self._dll.nvttSurfaceToSrgbUnclamped.argtypes = [self.NvttSurfacePtr, ctypes.c_void_p]
         
-        self._lib.nvttSurfaceToLinearFromSrgb.restype = None
-        self._lib.nvttSurfaceToLinearFromSrgb.argtypes = [self.NvttSurfacePtr, ctypes.c_void_p]
+        self._dll.nvttSurfaceToLinearFromSrgb.restype = None
+        self._dll.nvttSurfaceToLinearFromSrgb.argtypes = [self.NvttSurfacePtr, ctypes.c_void_p]
         
-        self._lib.nvttSurfaceToLinearFromSrgbUnclamped.restype = None
-        self._lib.nvttSurfaceToLinearFromSrgbUnclamped.argtypes = [self.NvttSurfacePtr, ctypes.c_void_p]
+        self._dll.nvttSurfaceToLinearFromSrgbUnclamped.restype = None
+        self._dll.nvttSurfaceToLinearFromSrgbUnclamped.argtypes = [self.NvttSurfacePtr, ctypes.c_void_p]
         
-        self._lib.nvttSurfaceToXenonSrgb.restype = None
-        self._lib.nvttSurfaceToXenonSrgb.argtypes = [self.NvttSurfacePtr, ctypes.c_void_p]
+        self._dll.nvttSurfaceToXenonSrgb.restype = None
+        self._dll.nvttSurfaceToXenonSrgb.argtypes = [self.NvttSurfacePtr, ctypes.c_void_p]
         
-        self._lib.nvttSurfaceToLinearFromXenonSrgb.restype = None
-        self._lib.nvttSurfaceToLinearFromXenonSrgb.argtypes = [self.NvttSurfacePtr, ctypes.c_void_p]
+        self._dll.nvttSurfaceToLinearFromXenonSrgb.restype = None
+        self._dll.nvttSurfaceToLinearFromXenonSrgb.argtypes = [self.NvttSurfacePtr, ctypes.c_void_p]
 
     def map_comp_options_funcs(self):
         """Map nvttCompressionOptions functions."""
-        self._lib.nvttCreateCompressionOptions.restype = self.NvttCompressionOptionsPtr
-        self._lib.nvttCreateCompressionOptions.argtypes = ()
+        self._dll.nvttCreateCompressionOptions.restype = self.NvttCompressionOptionsPtr
+        self._dll.nvttCreateCompressionOptions.argtypes = ()
 
-        self._lib.nvttDestroyCompressionOptions.restype = None
-        self._lib.nvttDestroyCompressionOptions.argtypes = [
+        self._dll.nvttDestroyCompressionOptions.restype = None
+        self._dll.nvttDestroyCompressionOptions.argtypes = [
             self.NvttCompressionOptionsPtr
         ]
 
-        self._lib.nvttResetCompressionOptions.restype = None
-        self._lib.nvttResetCompressionOptions.argtypes = [
+        self._dll.nvttResetCompressionOptions.restype = None
+        self._dll.nvttResetCompressionOptions.argtypes = [
             self.NvttCompressionOptionsPtr
         ]
 
-        self._lib.nvttSetCompressionOptionsFormat.restype = None
-        self._lib.nvttSetCompressionOptionsFormat.argtypes = [
+        self._dll.nvttSetCompressionOptionsFormat.restype = None
+        self._dll.nvttSetCompressionOptionsFormat.argtypes = [
             self.NvttCompressionOptionsPtr,
             ctypes.c_int,
         ]
 
-        self._lib.nvttSetCompressionOptionsQuality.restype = None
-        self._lib.nvttSetCompressionOptionsQuality.argtypes = [
+        self._dll.nvttSetCompressionOptionsQuality.restype = None
+        self._dll.nvttSetCompressionOptionsQuality.argtypes = [
             self.NvttCompressionOptionsPtr,
             ctypes.c_int,
         ]
 
-        self._lib.nvttSetCompressionOptionsColorWeights.restype = None
-        self._lib.nvttSetCompressionOptionsColorWeights.argtypes = [
+        self._dll.nvttSetCompressionOptionsColorWeights.restype = None
+        self._dll.nvttSetCompressionOptionsColorWeights.argtypes = [
             self.NvttCompressionOptionsPtr,
             ctypes.c_float,
             ctypes.c_float,
@@ -253,8 +439,8 @@ class NVTT:
             ctypes.c_float,
         ]
 
-        self._lib.nvttSetCompressionOptionsPixelFormat.restype = None
-        self._lib.nvttSetCompressionOptionsPixelFormat.argtypes = [
+        self._dll.nvttSetCompressionOptionsPixelFormat.restype = None
+        self._dll.nvttSetCompressionOptionsPixelFormat.argtypes = [
             self.NvttCompressionOptionsPtr,
             ctypes.c_uint,
             ctypes.c_uint,
@@ -262,20 +448,20 @@ class NVTT:
             ctypes.c_uint,
         ]
 
-        self._lib.nvttSetCompressionOptionsPixelType.restype = None
-        self._lib.nvttSetCompressionOptionsPixelType.argtypes = [
+        self._dll.nvttSetCompressionOptionsPixelType.restype = None
+        self._dll.nvttSetCompressionOptionsPixelType.argtypes = [
             self.NvttCompressionOptionsPtr,
             ctypes.c_int,
         ]
 
-        self._lib.nvttSetCompressionOptionsPitchAlignment.restype = None
-        self._lib.nvttSetCompressionOptionsPitchAlignment.argtypes = [
+        self._dll.nvttSetCompressionOptionsPitchAlignment.restype = None
+        self._dll.nvttSetCompressionOptionsPitchAlignment.argtypes = [
             self.NvttCompressionOptionsPtr,
             ctypes.c_int,
         ]
 
-        self._lib.nvttSetCompressionOptionsQuantization.restype = None
-        self._lib.nvttSetCompressionOptionsQuantization.argtypes = [
+        self._dll.nvttSetCompressionOptionsQuantization.restype = None
+        self._dll.nvttSetCompressionOptionsQuantization.argtypes = [
             self.NvttCompressionOptionsPtr,
             ctypes.c_bool,
             ctypes.c_bool,
@@ -283,77 +469,85 @@ class NVTT:
             ctypes.c_int,
         ]
 
-        self._lib.nvttGetCompressionOptionsD3D9Format.restype = ctypes.c_uint
-        self._lib.nvttGetCompressionOptionsD3D9Format.argtypes = [
+        self._dll.nvttGetCompressionOptionsD3D9Format.restype = ctypes.c_uint
+        self._dll.nvttGetCompressionOptionsD3D9Format.argtypes = [
             self.NvttCompressionOptionsPtr
         ]
 
     def map_out_options_funcs(self):
         """Map nvttOutputOptions functions."""
-        self._lib.nvttCreateOutputOptions.restype = self.NvttOutputOptionsPtr
-        self._lib.nvttCreateOutputOptions.argtypes = ()
+        self._dll.nvttCreateOutputOptions.restype = self.NvttOutputOptionsPtr
+        self._dll.nvttCreateOutputOptions.argtypes = ()
 
-        self._lib.nvttDestroyOutputOptions.restype = None
-        self._lib.nvttDestroyOutputOptions.argtypes = [self.NvttOutputOptionsPtr]
+        self._dll.nvttDestroyOutputOptions.restype = None
+        self._dll.nvttDestroyOutputOptions.argtypes = [self.NvttOutputOptionsPtr]
 
-        self._lib.nvttResetOutputOptions.restype = None
-        self._lib.nvttResetOutputOptions.argtypes = [self.NvttOutputOptionsPtr]
+        self._dll.nvttResetOutputOptions.restype = None
+        self._dll.nvttResetOutputOptions.argtypes = [self.NvttOutputOptionsPtr]
 
-        self._lib.nvttSetOutputOptionsFileName.restype = None
-        self._lib.nvttSetOutputOptionsFileName.argtypes = [
+        self._dll.nvttSetOutputOptionsFileName.restype = None
+        self._dll.nvttSetOutputOptionsFileName.argtypes = [
             self.NvttOutputOptionsPtr,
             ctypes.c_char_p,
         ]
 
-        self._lib.nvttSetOutputOptionsErrorHandler.restype = None
-        self._lib.nvttSetOutputOptionsErrorHandler.argtypes = [
+        self._dll.nvttSetOutputOptionsErrorHandler.restype = None
+        self._dll.nvttSetOutputOptionsErrorHandler.argtypes = [
             self.NvttOutputOptionsPtr,
             ctypes.c_int,
         ]
 
-        self._lib.nvttSetOutputOptionsContainer.restype = None
-        self._lib.nvttSetOutputOptionsContainer.argtypes = [
+        self._dll.nvttSetOutputOptionsOutputHandler.restype = None
+        self._dll.nvttSetOutputOptionsOutputHandler.argtypes = [
+            self.NvttOutputOptionsPtr,
+            self.BeginImageHandler,
+            self.OutputHandler,
+            self.EndImageHandler,
+        ]
+
+        self._dll.nvttSetOutputOptionsContainer.restype = None
+        self._dll.nvttSetOutputOptionsContainer.argtypes = [
             self.NvttOutputOptionsPtr,
             ctypes.c_int,
         ]
 
-        self._lib.nvttSetOutputOptionsOutputHeader.restype = None
-        self._lib.nvttSetOutputOptionsOutputHeader.argtypes = [
+        self._dll.nvttSetOutputOptionsOutputHeader.restype = None
+        self._dll.nvttSetOutputOptionsOutputHeader.argtypes = [
             self.NvttOutputOptionsPtr,
             ctypes.c_bool,
         ]
 
-        self._lib.nvttSetOutputOptionsUserVersion.restype = None
-        self._lib.nvttSetOutputOptionsUserVersion.argtypes = [
+        self._dll.nvttSetOutputOptionsUserVersion.restype = None
+        self._dll.nvttSetOutputOptionsUserVersion.argtypes = [
             self.NvttOutputOptionsPtr,
             ctypes.c_int,
         ]
 
-        self._lib.nvttSetOutputOptionsSrgbFlag.restype = None
-        self._lib.nvttSetOutputOptionsSrgbFlag.argtypes = [
+        self._dll.nvttSetOutputOptionsSrgbFlag.restype = None
+        self._dll.nvttSetOutputOptionsSrgbFlag.argtypes = [
             self.NvttOutputOptionsPtr,
             ctypes.c_bool,
         ]
 
     def map_context_funcs(self):
         """Map nvttContext functions."""
-        self._lib.nvttCreateContext.restype = self.NvttContextPtr
-        self._lib.nvttCreateContext.argtypes = ()
+        self._dll.nvttCreateContext.restype = self.NvttContextPtr
+        self._dll.nvttCreateContext.argtypes = ()
 
-        self._lib.nvttDestroyContext.restype = None
-        self._lib.nvttDestroyContext.argtypes = [self.NvttContextPtr]
+        self._dll.nvttDestroyContext.restype = None
+        self._dll.nvttDestroyContext.argtypes = [self.NvttContextPtr]
 
-        self._lib.nvttSetContextCudaAcceleration.restype = None
-        self._lib.nvttSetContextCudaAcceleration.argtypes = [
+        self._dll.nvttSetContextCudaAcceleration.restype = None
+        self._dll.nvttSetContextCudaAcceleration.argtypes = [
             self.NvttContextPtr,
             ctypes.c_bool,
         ]
 
-        self._lib.nvttContextIsCudaAccelerationEnabled.restype = ctypes.c_bool
-        self._lib.nvttContextIsCudaAccelerationEnabled.argtypes = [self.NvttContextPtr]
+        self._dll.nvttContextIsCudaAccelerationEnabled.restype = ctypes.c_bool
+        self._dll.nvttContextIsCudaAccelerationEnabled.argtypes = [self.NvttContextPtr]
 
-        self._lib.nvttContextOutputHeader.restype = ctypes.c_bool
-        self._lib.nvttContextOutputHeader.argtypes = [
+        self._dll.nvttContextOutputHeader.restype = ctypes.c_bool
+        self._dll.nvttContextOutputHeader.argtypes = [
             self.NvttContextPtr,
             self.NvttSurfacePtr,
             ctypes.c_int,
@@ -361,8 +555,21 @@ class NVTT:
             self.NvttOutputOptionsPtr,
         ]
 
-        self._lib.nvttContextCompress.restype = ctypes.c_bool
-        self._lib.nvttContextCompress.argtypes = [
+        self._dll.nvttContextOutputHeaderData.restype = ctypes.c_bool
+        self._dll.nvttContextOutputHeaderData.argtypes = [
+            self.NvttContextPtr,
+            ctypes.c_int,  # TextureType
+            ctypes.c_int,  # width
+            ctypes.c_int,  # height
+            ctypes.c_int,  # depth
+            ctypes.c_int,  # mipmapCount
+            ctypes.c_int,  # NvttBoolean isNormalMap
+            self.NvttCompressionOptionsPtr,
+            self.NvttOutputOptionsPtr,
+        ]
+
+        self._dll.nvttContextCompress.restype = ctypes.c_bool
+        self._dll.nvttContextCompress.argtypes = [
             self.NvttContextPtr,
             self.NvttSurfacePtr,
             ctypes.c_int,
@@ -371,14 +578,125 @@ class NVTT:
             self.NvttOutputOptionsPtr,
         ]
 
-        self._lib.nvttContextEstimateSize.restype = ctypes.c_int
-        self._lib.nvttContextEstimateSize.argtypes = [
+        self._dll.nvttContextCompressBatch.restype = ctypes.c_bool
+        self._dll.nvttContextCompressBatch.argtypes = [
+            self.NvttContextPtr,
+            self.NvttBatchListPtr,
+            self.NvttCompressionOptionsPtr,
+        ]
+
+        self._dll.nvttContextEnableTiming.restype = None
+        self._dll.nvttContextEnableTiming.argtypes = [
+            self.NvttContextPtr,
+            ctypes.c_int,  # NvttBoolean enable
+            ctypes.c_int,  # detailLevel
+        ]
+
+        self._dll.nvttContextGetTimingContext.restype = self.NvttTimingContextPtr
+        self._dll.nvttContextGetTimingContext.argtypes = [self.NvttContextPtr]
+
+        self._dll.nvttContextEstimateSize.restype = ctypes.c_int
+        self._dll.nvttContextEstimateSize.argtypes = [
             self.NvttContextPtr,
             self.NvttSurfacePtr,
             ctypes.c_int,
             self.NvttCompressionOptionsPtr,
         ]
 
+    def map_low_level_funcs(self):
+        """Map the low-level encoding functions (nvttCPUInputBuffer, nvttEncodeCPU)."""
+        self._dll.nvttCreateCPUInputBuffer.restype = self.NvttCPUInputBufferPtr
+        self._dll.nvttCreateCPUInputBuffer.argtypes = [
+            ctypes.POINTER(self.NvttRefImage),  # images
+            ctypes.c_int,  # ValueType
+            ctypes.c_int,  # numImages
+            ctypes.c_int,  # tile_w
+            ctypes.c_int,  # tile_h
+            ctypes.c_float,  # WeightR
+            ctypes.c_float,  # WeightG
+            ctypes.c_float,  # WeightB
+            ctypes.c_float,  # WeightA
+            ctypes.c_void_p,  # NvttTimingContext
+            ctypes.POINTER(ctypes.c_uint),  # num_tiles
+        ]
+
+        self._dll.nvttDestroyCPUInputBuffer.restype = None
+        self._dll.nvttDestroyCPUInputBuffer.argtypes = [self.NvttCPUInputBufferPtr]
+
+        self._dll.nvttCPUInputBufferNumTiles.restype = ctypes.c_int
+        self._dll.nvttCPUInputBufferNumTiles.argtypes = [self.NvttCPUInputBufferPtr]
+
+        self._dll.nvttCPUInputBufferTileSize.restype = None
+        self._dll.nvttCPUInputBufferTileSize.argtypes = [
+            self.NvttCPUInputBufferPtr,
+            ctypes.POINTER(ctypes.c_int),  # tile_w
+            ctypes.POINTER(ctypes.c_int),  # tile_h
+        ]
+
+        self._dll.nvttEncodeCPU.restype = ctypes.c_int  # NvttBoolean
+        self._dll.nvttEncodeCPU.argtypes = [
+            self.NvttCPUInputBufferPtr,
+            ctypes.c_void_p,  # output
+            ctypes.POINTER(self.NvttEncodeSettings),
+        ]
+
+    def map_batch_list_funcs(self):
+        """Map nvttBatchList functions."""
+        self._dll.nvttCreateBatchList.restype = self.NvttBatchListPtr
+        self._dll.nvttCreateBatchList.argtypes = ()
+
+        self._dll.nvttDestroyBatchList.restype = None
+        self._dll.nvttDestroyBatchList.argtypes = [self.NvttBatchListPtr]
+
+        self._dll.nvttBatchListClear.restype = None
+        self._dll.nvttBatchListClear.argtypes = [self.NvttBatchListPtr]
+
+        self._dll.nvttBatchListAppend.restype = None
+        self._dll.nvttBatchListAppend.argtypes = [
+            self.NvttBatchListPtr,
+            self.NvttSurfacePtr,
+            ctypes.c_int,  # face
+            ctypes.c_int,  # mipmap
+            self.NvttOutputOptionsPtr,
+        ]
+
+        self._dll.nvttBatchListGetSize.restype = ctypes.c_uint
+        self._dll.nvttBatchListGetSize.argtypes = [self.NvttBatchListPtr]
+
+    def map_timing_context_funcs(self):
+        """Map nvttTimingContext functions."""
+        self._dll.nvttCreateTimingContext.restype = self.NvttTimingContextPtr
+        self._dll.nvttCreateTimingContext.argtypes = [ctypes.c_int]
+
+        self._dll.nvttDestroyTimingContext.restype = None
+        self._dll.nvttDestroyTimingContext.argtypes = [self.NvttTimingContextPtr]
+
+        self._dll.nvttTimingContextSetDetailLevel.restype = None
+        self._dll.nvttTimingContextSetDetailLevel.argtypes = [self.NvttTimingContextPtr, ctypes.c_int]
+
+        self._dll.nvttTimingContextGetRecordCount.restype = ctypes.c_int
+        self._dll.nvttTimingContextGetRecordCount.argtypes = [self.NvttTimingContextPtr]
+
+        self._dll.nvttTimingContextGetRecord.restype = None
+        self._dll.nvttTimingContextGetRecord.argtypes = [
+            self.NvttTimingContextPtr,
+            ctypes.c_int,  # i
+            ctypes.c_char_p,  # description
+            ctypes.POINTER(ctypes.c_double),  # seconds
+        ]
+
+        self._dll.nvttTimingContextGetRecordSafe.restype = ctypes.c_size_t
+        self._dll.nvttTimingContextGetRecordSafe.argtypes = [
+            self.NvttTimingContextPtr,
+            ctypes.c_int,  # i
+            ctypes.c_char_p,  # outDescription
+            ctypes.c_size_t,  # outDescriptionSize
+            ctypes.POINTER(ctypes.c_double),  # seconds
+        ]
+
+        self._dll.nvttTimingContextPrintRecords.restype = None
+        self._dll.nvttTimingContextPrintRecords.argtypes = [self.NvttTimingContextPtr]
+
     @property
     def version(self) -> int:
         """Get NVTT's version."""
@@ -0,0 +1,118 @@
+import ctypes
+from .surface import pinned_buffer
+from .timing import TimingContext
+from .enums import Format, Quality, PixelType, EncodeFlags, ChannelOrder, ValueType
+from .utils.dds import block_info, level_size
+from .core import nvtt
+
+# Version of the NvttEncodeSettings layout.
+ENCODE_SETTINGS_VERSION: int = 1
+RGBA: tuple[ChannelOrder, ...] = (ChannelOrder.RED, ChannelOrder.GREEN, ChannelOrder.BLUE, ChannelOrder.ALPHA)
+BGRA: tuple[ChannelOrder, ...] = (ChannelOrder.BLUE, ChannelOrder.GREEN, ChannelOrder.RED, ChannelOrder.ALPHA)
+
+# Bytes per channel of each ValueType.
+VALUE_SIZES: dict[ValueType, int] = {ValueType.UINT8: 1, ValueType.SINT8: 1, ValueType.FLOAT32: 4}
+
+
+class CPUInputBuffer:
+    """High-level wrapper for nvttCPUInputBuffer, raw interleaved pixels split into blocks for the low-level encoder."""
+
+    def __init__(self,
+                 data,
+                 width: int,
+                 height: int,
+                 format: Format,
+                 value_type: ValueType = ValueType.UINT8,
+                 channel_order: tuple[ChannelOrder, ...] = RGBA,
+                 weights: tuple[float, float, float, float] = (1.0, 1.0, 1.0, 1.0),
+                 timing_context: TimingContext | None = None,
+                 ):
+        """
+        Wraps `data`, any buffer-protocol object holding `width` x `height` 4-channel pixels of `value_type`.
+
+        `channel_order` gives, for R, G, B and A, which channel of `data` to read (or ZERO/ONE).
+        The buffer is split in blocks of `format` and holds its own copy, `data` can be released afterwards.
+        """
+        self._lib = nvtt._lib
+        self._ptr = None
+        self._format = Format(format)
+        self._width = width
+        self._height = height
+        block_width, block_height, _ = block_info(self._format)
+        if len(channel_order) != 4:
+            raise ValueError("channel_order must have 4 entries.")
+        with pinned_buffer(data) as (buf, size):
+            if size < width * height * 4 * VALUE_SIZES[ValueType(value_type)]:
+                raise ValueError(f"data is too small for a {width}x{height} image.")
+            # Not ctypes.cast() on pinned arrays: it would keep them, and the buffer export, alive.
+            address: int = ctypes.addressof(buf) if isinstance(buf, ctypes.Array) else ctypes.cast(buf, ctypes.c_void_p).value
+            image = nvtt.NvttRefImage(address, width, height, 1, 4,
+                                      (ctypes.c_int * 4)(*channel_order), 1)
+            num_tiles = ctypes.c_uint(0)
+            self._ptr = self._lib.nvttCreateCPUInputBuffer(
+                ctypes.byref(image), int(value_type), 1, block_width, block_height, *weights,
+                timing_context._ptr if timing_context is not None else None, ctypes.byref(num_tiles)
+            )
+            del image
+        if not self._ptr:
+            raise RuntimeError("Failed to create nvttCPUInputBuffer.")
+
+    def __del__(self):
+        """Destructor."""
+        if getattr(self, "_ptr", None):
+            self._lib.nvttDestroyCPUInputBuffer(self._ptr)
+
+    @property
+    def format(self) -> Format:
+        """Get the format the buffer was split for."""
+        return self._format
+
+    @property
+    def num_tiles(self) -> int:
+        """Returns the number of blocks."""
+        if not self._ptr:
+            raise RuntimeError("CPU input buffer has already been destroyed or not initialized.")
+        return self._lib.nvttCPUInputBufferNumTiles(self._ptr)
+
+    @property
+    def encoded_size(self) -> int:
+        """Returns the size in bytes of the encoded data."""
+        return level_size(self._format, self._width, self._height)
+
+    def encode_into(self, output, quality: Quality = Quality.Normal, flags: EncodeFlags = EncodeFlags.NONE, pixel_type: PixelType = PixelType.UnsignedNorm, timing_context: TimingContext | None = None) -> int:
+        """Encodes the blocks into the writable buffer `output`, returning the number of bytes written."""
+        if not self._ptr:
+            raise RuntimeError("CPU input buffer has already been destroyed or not initialized.")
+        if flags & (EncodeFlags.USE_GPU | EncodeFlags.OUTPUT_TO_GPU_MEMORY):
+            raise ValueError("GPU encode flags are not supported by the CPU encoder.")
+        size: int = self.encoded_size
+        settings = nvtt.NvttEncodeSettings(ENCODE_SETTINGS_VERSION, int(self._format), int(quality), int(pixel_type),
+                                           timing_context._ptr if timing_context is not None else None, int(flags))
+        with memoryview(output) as view, view.cast("B") as out:
+            if out.readonly or len(out) < size:
+                raise ValueError(f"output must be a writable buffer of at least {size} bytes.")
+            buf = (ctypes.c_ubyte * len(out)).from_buffer(out)
+            try:
+                if not self._lib.nvttEncodeCPU(self._ptr, buf, ctypes.byref(settings)):
+                    raise RuntimeError(f"Failed to encode {self._format.name} data.")
+            finally:
+                del buf
+        return size
+
+    def encode(self, quality: Quality = Quality.Normal, flags: EncodeFlags = EncodeFlags.NONE, pixel_type: PixelType = PixelType.UnsignedNorm, timing_context: TimingContext | None = None) -> bytes:
+        """Encodes the blocks and returns the encoded data."""
+        output = bytearray(self.encoded_size)
+        self.encode_into(output, quality, flags, pixel_type, timing_context)
+        return bytes(output)
+
+
+def encode(data, width: int, height: int, format: Format, quality: Quality = Quality.Normal,
+           channel_order: tuple[ChannelOrder, ...] = RGBA,
+           flags: EncodeFlags = EncodeFlags.NONE,
+           ) -> bytes:
+    """
+    Encodes raw interleaved 8-bit pixels (RGBA by default, see `BGRA`) to a block-compressed `format`.
+
+    Skips Surface and its float32 planar copy, and returns the bare block data of a single level, without header.
+    """
+    return CPUInputBuffer(data, width, height, format, ValueType.UINT8, channel_order).encode(quality, flags)
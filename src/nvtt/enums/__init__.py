@@ -13,4 +13,7 @@ from .encode_flags import EncodeFlags
 from .wrap_mode import WrapMode
 from .texture_type import TextureType
 from .wrap_mode import WrapMode
-from .channel import Channel
\ No newline at end of file
+from .channel import Channel
+from .input_format import InputFormat
+from .channel_order import ChannelOrder
+from .value_type import ValueType
\ No newline at end of file
@@ -0,0 +1,10 @@
+from enum import IntEnum
+
+class ChannelOrder(IntEnum):
+    """Enum for the source of each channel of a raw image, see `encode`."""
+    RED = 0
+    GREEN = 1
+    BLUE = 2
+    ALPHA = 3
+    ZERO = 4
+    ONE = 5
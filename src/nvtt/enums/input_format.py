@@ -0,0 +1,9 @@
+from enum import IntEnum
+
+class InputFormat(IntEnum):
+    """Enum for the layout of raw pixel data passed to a Surface."""
+    BGRA_8UB = 0
+    BGRA_8SB = 1
+    RGBA_16F = 2
+    RGBA_32F = 3
+    R_32F = 4
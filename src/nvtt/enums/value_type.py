@@ -0,0 +1,7 @@
+from enum import IntEnum
+
+class ValueType(IntEnum):
+    """Enum for the channel value types of a raw image."""
+    UINT8 = 0
+    SINT8 = 1
+    FLOAT32 = 2
@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import os
+from .surface import Surface
+from .compression import CompressionOptions
+from .output import OutputOptions, OutputBuffer
+from .enums import Container, Filters, TextureType
+from .utils.dds import MAX_HEADER_SIZE, set_array_size
+
+CUBE_FACES: int = 6
+
+
+def _compress_face(ctx_type, use_cuda: bool, surface: Surface, index: int, co: CompressionOptions, container: int | None, min_level: int, mipmap_filter: Filters, do_mips: bool) -> bytes:
+    """Compresses the mip chain of one face or layer without header, with a Context of its own."""
+    oo: OutputOptions = OutputOptions()
+    oo.output_header(False)
+    if container is not None:
+        oo.container(container)
+    with ctx_type() as ctx:
+        ctx.enable_cuda_acceleration(use_cuda)
+        return bytes(ctx.compress_all_to_buffer(surface, co, None, oo, index, min_level, mipmap_filter, do_mips))
+
+
+def compress_layers(ctx, type: TextureType, surfaces: list[Surface | str | Path], co: CompressionOptions,
+                    output: str | Path | None = None,
+                    oo: OutputOptions | None = None,
+                    min_level: int = 1,
+                    mipmap_filter: Filters = Filters.MITCHELL,
+                    do_mips: bool = True,
+                    workers: int | None = None,
+                    ) -> bytes:
+    """
+    Compresses the faces of a cube map (TextureType.CUBE) or the layers of a texture array (TextureType.TEXTURE_2D)
+    to a single DDS, see Context.compress_cube and Context.compress_array.
+
+    Returns the DDS bytes, also written atomically to `output` if given.
+    """
+    surfaces = [Surface(str(s)) if isinstance(s, (str, Path)) else s for s in surfaces]
+    if not surfaces:
+        raise ValueError("At least one surface is required.")
+    first: Surface = surfaces[0]
+    for surface in surfaces:
+        if (surface.width, surface.height, surface.depth) != (first.width, first.height, 1):
+            raise ValueError("Every surface must be a 2D image of the same size.")
+    if type == TextureType.CUBE and first.width != first.height:
+        raise ValueError("Cube map faces must be square.")
+    # The same Surface given twice would be built into mipmaps by two threads at once.
+    seen: set[int] = set()
+    for i, surface in enumerate(surfaces):
+        if id(surface) in seen:
+            surfaces[i] = surface.clone()
+        seen.add(id(surface))
+
+    # Only the settings of `oo` are read, the header goes through options of our own.
+    container: int | None = oo.settings.get("container") if oo is not None else None
+    if type != TextureType.CUBE and len(surfaces) > 1 and container != Container.DDS10:
+        raise ValueError("Texture arrays require the DDS10 container.")
+    mipmap_count: int = first.count_mipmaps(min_level) if do_mips else 1
+    with OutputOptions() as header_oo:
+        if container is not None:
+            header_oo.container(container)
+        header: OutputBuffer = header_oo.output_to_buffer(bytearray(MAX_HEADER_SIZE))
+        if not ctx.output_header_data(type, first.width, first.height, 1, mipmap_count, first.normal_map, co, header_oo):
+            raise RuntimeError("Failed to write the header.")
+        header_data = bytearray(header.getvalue())
+    if type != TextureType.CUBE and container == Container.DDS10:
+        set_array_size(header_data, len(surfaces))
+
+    # Faces are independent, each one is built and compressed on its own thread, NVTT releases the GIL.
+    use_cuda: bool = bool(ctx.is_cuda_acceleration_enabled)
+    with ThreadPoolExecutor(max_workers=workers or min(len(surfaces), os.cpu_count() or 1)) as pool:
+        futures = [pool.submit(_compress_face, ctx.__class__, use_cuda, surface, index, co, container, min_level, mipmap_filter, do_mips)
+                   for index, surface in enumerate(surfaces)]
+        faces: list[bytes] = [future.result() for future in futures]
+    # DDS order is face (or layer) major, each one holding its whole mip chain.
+    data: bytes = bytes(header_data) + b"".join(faces)
+    if output is not None:
+        # Imported here, utils.cache depends on Context which depends on this module.
+        from .utils.cache import write_atomic
+        write_atomic(output, data)
+    return data
@@ -0,0 +1,43 @@
+from .surface import Surface
+from .enums import Filters
+
+
+class MipChain:
+    """A full mipmap chain built once from a Surface, reusable to compress several targets."""
+
+    def __init__(self, levels: list[Surface]):
+        """Creates a chain from already built levels, largest first."""
+        if not levels:
+            raise ValueError("A mipmap chain needs at least one level.")
+        self._levels: list[Surface] = levels
+
+    @classmethod
+    def build(cls, surface: Surface, mipmap_filter: Filters = Filters.MITCHELL, min_level: int = 1, do_mips: bool = True) -> "MipChain":
+        """Builds every mipmap level of `surface` down to `min_level`. The source surface is left untouched."""
+        if surface.is_null:
+            raise RuntimeError("Surface is null or has not been initialized.")
+        level: Surface = surface.clone()
+        levels: list[Surface] = [level]
+        while do_mips and level.can_make_next_mipmap(min_level):
+            level = level.clone()
+            if not level.build_next_mipmap(int(mipmap_filter), min_level):
+                raise RuntimeError(f"Failed to build a mipmap level for surface {surface._ptr}.")
+            levels.append(level)
+        return cls(levels)
+
+    def __len__(self) -> int:
+        """Returns the number of mipmap levels."""
+        return len(self._levels)
+
+    def __getitem__(self, level: int) -> Surface:
+        """Returns the Surface of the given mipmap level."""
+        return self._levels[level]
+
+    def __iter__(self):
+        """Iterates over the levels, largest first."""
+        return iter(self._levels)
+
+    @property
+    def top(self) -> Surface:
+        """Returns the largest level."""
+        return self._levels[0]
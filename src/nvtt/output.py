@@ -1,29 +1,167 @@
+import ctypes
+from typing import Callable
 from .enums import Container
 from .core import nvtt
 
 
+class OutputBuffer:
+    """Writable in-memory target for compressed data, see `OutputOptions.output_to_buffer`."""
+
+    def __init__(self, buffer):
+        """Wraps any writable buffer-protocol object (bytearray, memoryview, mmap, ...)."""
+        self._buffer = buffer
+        self._view = memoryview(buffer).cast("B")
+        if self._view.readonly:
+            raise TypeError("buffer must be writable.")
+        self._address: int = ctypes.addressof((ctypes.c_char * len(self._view)).from_buffer(self._view))
+        self._size: int = 0
+
+    @property
+    def size(self) -> int:
+        """Returns the number of bytes written so far."""
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Returns the size of the underlying buffer."""
+        return len(self._view)
+
+    def write(self, data: int, size: int) -> bool:
+        """Copies `size` bytes from the `data` address into the buffer. Returns False if it does not fit."""
+        if self._size + size > len(self._view):
+            return False
+        ctypes.memmove(self._address + self._size, data, size)
+        self._size += size
+        return True
+
+    def getvalue(self) -> memoryview:
+        """Returns a view over the written bytes."""
+        return self._view[:self._size]
+
+
 class OutputOptions:
     """High-level wrapper for nvttOutputOptions."""
 
     def __init__(self):
         self._lib = nvtt._lib
         self._ptr = nvtt._lib.nvttCreateOutputOptions()
+        # NVTT cannot read options back, so every setting affecting the output data is mirrored here.
+        self._settings: dict[str, object] = {}
+        self._filename: str | None = None
+        self._handlers: tuple | None = None
         if not self._ptr:
             raise RuntimeError("Failed to create nvttCompressionOptions.")
 
     def __del__(self):
-        if getattr(self, "_ptr", None):
-            self._lib.nvttDestroyOutputOptions(self._ptr)
+        """Destructor."""
+        self.close()
+
+    def __enter__(self) -> "OutputOptions":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Frees the native options now instead of on garbage collection. This also flushes and closes the file set with filename()."""
+        ptr = getattr(self, "_ptr", None)
+        if ptr:
+            self._ptr = None
+            self._lib.nvttDestroyOutputOptions(ptr)
+            self._handlers = None
+
+    @property
+    def closed(self) -> bool:
+        """Returns whether the native options has been freed."""
+        return not getattr(self, "_ptr", None)
 
     def reset(self):
         """Reset the options to their default values."""
-        self._lib.nvttResetOutputOptions(self._ptr)
+        if not self._ptr:
+            raise RuntimeError("Output options have already been destroyed or not initialized.")
+        if self._filename is not None:
+            # NVTT drops the file handler on reset without flushing or closing it, recreate the options instead.
+            self._recreate()
+        else:
+            self._lib.nvttResetOutputOptions(self._ptr)
+            self._handlers = None
+        self._settings.clear()
+
+    def _recreate(self) -> None:
+        """Replaces the native options with default ones, flushing and closing the output file if any."""
+        ptr = self._lib.nvttCreateOutputOptions()
+        if not ptr:
+            raise RuntimeError("Failed to create nvttOutputOptions.")
+        self._lib.nvttDestroyOutputOptions(self._ptr)
+        self._ptr = ptr
+        self._filename = None
+        self._handlers = None
 
     def filename(self, filename: str) -> None:
         """Set the output filename."""
         if not self._ptr:
             raise RuntimeError("Failed to set output filename.")
         self._lib.nvttSetOutputOptionsFileName(self._ptr, filename.encode("utf-8"))
+        self._filename = filename
+        self._handlers = None
+
+    def close_file(self) -> None:
+        """
+        Flushes and closes the file set with filename(), which NVTT otherwise only does when the filename changes
+        or the options are freed. The other settings are kept, but no output is set until filename() or
+        output_handler() is called again.
+        """
+        if not self._ptr:
+            raise RuntimeError("Output options have already been destroyed or not initialized.")
+        if self._filename is not None:
+            self._recreate()
+            self._apply_settings(self._settings)
+
+    @property
+    def has_output(self) -> bool:
+        """Returns whether a file or an output handler is set to receive the compressed data."""
+        return self._filename is not None or self._handlers is not None
+
+    def copy(self) -> "OutputOptions":
+        """Returns new options with the same settings (see `settings`), without the output file or handler."""
+        oo: OutputOptions = OutputOptions()
+        oo._apply_settings(self._settings)
+        return oo
+
+    def _apply_settings(self, settings: dict[str, object]) -> None:
+        """Sets every option of `settings`, as returned by the settings property."""
+        if "output_header" in settings:
+            self.output_header(settings["output_header"])
+        if "container" in settings:
+            self.container(settings["container"])
+
+    def output_handler(self,
+                       output_handler: Callable[[int, int], bool],
+                       begin_image_handler: Callable[[int, int, int, int, int, int], None] | None = None,
+                       end_image_handler: Callable[[], None] | None = None,
+                       ) -> None:
+        """
+        Set output handler, replacing the output filename.
+
+        `output_handler(data, size)` receives the address and size of each chunk and returns whether it was written,
+        `begin_image_handler(size, width, height, depth, face, miplevel)` and `end_image_handler()` are optional.
+        """
+        if not self._ptr:
+            raise RuntimeError("Failed to set output handler.")
+        # The callbacks must outlive this call, as NVTT only stores the function pointers.
+        self._handlers = (
+            nvtt.BeginImageHandler(begin_image_handler or (lambda *args: None)),
+            nvtt.OutputHandler(lambda data, size: bool(output_handler(data, size))),
+            nvtt.EndImageHandler(end_image_handler or (lambda: None)),
+        )
+        self._lib.nvttSetOutputOptionsOutputHandler(self._ptr, *self._handlers)
+        self._filename = None
+
+    def output_to_buffer(self, buffer) -> OutputBuffer:
+        """Set a writable buffer as output instead of a file. Returns the OutputBuffer tracking the written size."""
+        out: OutputBuffer = buffer if isinstance(buffer, OutputBuffer) else OutputBuffer(buffer)
+        self.output_handler(out.write)
+        return out
 
     def error_handler(self) -> int:
         """Set the current error handler."""
@@ -36,6 +174,7 @@ class OutputOptions:
         if not self._ptr:
             raise RuntimeError("Failed to set output header option.")
         self._lib.nvttSetOutputOptionsOutputHeader(self._ptr, output_header)
+        self._settings["output_header"] = bool(output_header)
 
     def container(self, container: Container) -> None:
         """Set container. Defaults to Container."""
@@ -43,3 +182,9 @@ class OutputOptions:
         if not self._ptr:
             raise RuntimeError("Failed to set output container format.")
         self._lib.nvttSetOutputOptionsContainer(self._ptr, get_container)
+        self._settings["container"] = get_container
+
+    @property
+    def settings(self) -> dict[str, object]:
+        """Returns every option affecting the output data set since creation or the last reset."""
+        return dict(self._settings)
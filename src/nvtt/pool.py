@@ -0,0 +1,442 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Generic, TypeVar
+import os
+import threading
+from .context import Context
+from .compression import CompressionOptions
+from .output import OutputOptions
+from .surface import Surface
+from .preset import CompressionPreset
+from .enums import Filters, Format, Quality, WrapMode, AlphaMode
+from .utils.cache import write_atomic
+from .core import nvtt
+
+T = TypeVar("T")
+
+
+class PooledContext:
+    """A Context and its options set, owned by a single thread while checked out of a ContextPool."""
+
+    def __init__(self, ctx: Context, co: CompressionOptions, oo: OutputOptions):
+        self._ctx = ctx
+        self._co = co
+        self._oo = oo
+        self._owner: int | None = None
+
+    def _check_owner(self) -> None:
+        """Raises if the calling thread does not own this object."""
+        if self._owner is None:
+            raise RuntimeError("Pooled context has been returned to its pool.")
+        if self._owner != threading.get_ident():
+            raise RuntimeError("Pooled context is owned by another thread.")
+
+    @property
+    def ctx(self) -> Context:
+        """Get the Context."""
+        self._check_owner()
+        return self._ctx
+
+    @property
+    def co(self) -> CompressionOptions:
+        """Get the CompressionOptions."""
+        self._check_owner()
+        return self._co
+
+    @property
+    def oo(self) -> OutputOptions:
+        """Get the OutputOptions."""
+        self._check_owner()
+        return self._oo
+
+    def compress_all(self, surface: Surface, output: str | None = None, **kwargs) -> None:
+        """
+        Context.compress_all() with the pooled options. If `output` is given, it is written through a copy of the
+        pooled OutputOptions and closed on return, the pooled options keep their own output.
+        """
+        self._check_owner()
+        if output is None:
+            self._ctx.compress_all(surface, self._co, self._oo, **kwargs)
+            return
+        with self._oo.copy() as oo:
+            oo.filename(output)
+            self._ctx.compress_all(surface, self._co, oo, **kwargs)
+
+    def compress_to_bytes(self, surface: Surface, **kwargs) -> bytes:
+        """Context.compress_to_bytes() with the pooled options, only their settings are used."""
+        self._check_owner()
+        return self._ctx.compress_to_bytes(surface, self._co, self._oo, **kwargs)
+
+    def _close(self) -> None:
+        """Frees the native objects."""
+        self._ctx.close()
+        self._co.close()
+        self._oo.close()
+
+
+class ContextPool:
+    """
+    Pool handing out Context/CompressionOptions/OutputOptions sets to threads through checkout/checkin.
+
+    Sets are created on demand, up to `size` (defaults to the CPU count), and configured with `format` and
+    `quality` (or a `preset` replacing both), `use_cuda` and an optional `setup(co, oo)` callback. Checking out blocks while every set is in use.
+
+    Thread-safety rules:
+    - `Context`, `OutputOptions` and `Surface` must only be used by one thread at a time.
+    - A `CompressionOptions` may be read by several threads at once (NVTT only reads it while compressing),
+      but must not be modified while any thread compresses with it.
+    - The module-level `nvtt` library object is safe to share, loading and binding are locked.
+
+    The pool enforces the first rule for its sets: a checked out `PooledContext` can only be used by the
+    thread that checked it out, and not at all once it has been returned.
+    """
+
+    def __init__(self,
+                 size: int | None = None,
+                 format: Format = Format.DXT1,
+                 quality: Quality = Quality.Normal,
+                 use_cuda: bool = False,
+                 setup: Callable[[CompressionOptions, OutputOptions], None] | None = None,
+                 preset: CompressionPreset | None = None,
+                 ):
+        self._size: int = size or os.cpu_count() or 1
+        self._format = format
+        self._quality = quality
+        self._use_cuda = use_cuda
+        self._setup = setup
+        self._preset = preset
+        self._idle: list[PooledContext] = []
+        self._created: int = 0
+        self._lock = threading.Lock()
+        # Notified when a set is checked in, a set could not be created or the pool is closed.
+        self._available = threading.Condition(self._lock)
+        self._closed: bool = False
+
+    @property
+    def size(self) -> int:
+        """Get the maximum number of sets."""
+        return self._size
+
+    @property
+    def created(self) -> int:
+        """Returns the number of sets created so far."""
+        return self._created
+
+    def _create(self) -> PooledContext:
+        """Creates and configures a new set."""
+        if self._preset is not None:
+            co: CompressionOptions = self._preset.create_options()
+        else:
+            co = CompressionOptions()
+            co.format(self._format)
+            co.quality(self._quality)
+        oo: OutputOptions = OutputOptions()
+        if self._setup is not None:
+            self._setup(co, oo)
+        ctx: Context = Context()
+        ctx.enable_cuda_acceleration(self._use_cuda)
+        return PooledContext(ctx, co, oo)
+
+    def checkout(self, timeout: float | None = None) -> PooledContext:
+        """
+        Takes a set for the calling thread, creating one if none is idle and the pool is not full.
+        Otherwise waits up to `timeout` seconds (forever if None) for a set to be checked in.
+        """
+        with self._available:
+            if not self._available.wait_for(lambda: self._closed or self._idle or self._created < self._size, timeout):
+                raise TimeoutError("No pooled context became available in time.")
+            if self._closed:
+                raise RuntimeError("Context pool has already been closed.")
+            item: PooledContext | None = self._idle.pop() if self._idle else None
+            if item is None:
+                self._created += 1
+        if item is None:
+            try:
+                item = self._create()
+            except BaseException:
+                with self._available:
+                    self._created -= 1
+                    self._available.notify()
+                raise
+        item._owner = threading.get_ident()
+        return item
+
+    def checkin(self, item: PooledContext) -> None:
+        """Returns a set taken with checkout(), it cannot be used anymore by the calling thread."""
+        item._check_owner()
+        item._owner = None
+        with self._available:
+            if not self._closed:
+                self._idle.append(item)
+                self._available.notify()
+                return
+        item._close()
+
+    @contextmanager
+    def context(self, timeout: float | None = None):
+        """Checks a set out for the duration of the block."""
+        item: PooledContext = self.checkout(timeout)
+        try:
+            yield item
+        finally:
+            self.checkin(item)
+
+    def close(self) -> None:
+        """Frees every idle set. Sets still checked out are freed when checked in."""
+        with self._available:
+            self._closed = True
+            idle: list[PooledContext] = self._idle
+            self._idle = []
+            self._available.notify_all()
+        for item in idle:
+            item._close()
+
+    def __enter__(self) -> "ContextPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class HandlePool(ABC, Generic[T]):
+    """
+    Thread-safe free list of native wrappers, recycled across jobs instead of being created and freed for each one.
+
+    Released objects are reset to their defaults and kept, up to `max_idle` (defaults to the CPU count);
+    extra or unrecyclable ones are closed right away, so native memory is freed deterministically.
+    """
+
+    def __init__(self, max_idle: int | None = None):
+        self._max_idle: int = max_idle or os.cpu_count() or 1
+        self._idle: list[T] = []
+        self._lock = threading.Lock()
+        self._created: int = 0
+        self._closed: bool = False
+
+    @property
+    def idle(self) -> int:
+        """Returns the number of objects waiting to be reused."""
+        return len(self._idle)
+
+    @property
+    def created(self) -> int:
+        """Returns the number of objects created so far."""
+        return self._created
+
+    @abstractmethod
+    def _create(self) -> T:
+        """Creates a new object."""
+
+    @abstractmethod
+    def _recycle(self, item: T) -> bool:
+        """Resets `item` to its defaults, returning False if it cannot be reused."""
+
+    def acquire(self) -> T:
+        """Takes an idle object, or creates one if none is idle."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Pool has already been closed.")
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+        return self._create()
+
+    def release(self, item: T) -> None:
+        """Returns an object taken with acquire(), the caller must not use it anymore."""
+        if item.closed:
+            return
+        try:
+            keep: bool = self._recycle(item)
+        except RuntimeError:
+            keep = False
+        if keep:
+            with self._lock:
+                if not self._closed and len(self._idle) < self._max_idle:
+                    self._idle.append(item)
+                    return
+        item.close()
+
+    @contextmanager
+    def borrow(self):
+        """Acquires an object for the duration of the block."""
+        item: T = self.acquire()
+        try:
+            yield item
+        finally:
+            self.release(item)
+
+    def close(self) -> None:
+        """Frees every idle object. Objects released afterwards are freed instead of being kept."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for item in idle:
+            item.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class SurfacePool(HandlePool[Surface]):
+    """
+    HandlePool of Surfaces. Released surfaces get the settings of a new one back and their pixels freed,
+    acquired ones are a 1x1 image until loaded or set.
+    """
+
+    def _create(self) -> Surface:
+        surface: Surface = Surface()
+        surface.set_image(1, 1, 1)
+        return surface
+
+    def _recycle(self, item: Surface) -> bool:
+        if not item.set_image(1, 1, 1):
+            return False
+        item.wrap_mode = WrapMode.MIRROR
+        item.alpha_mode = AlphaMode.NONE
+        item.normal_map = False
+        item.timing_context = None
+        item._has_alpha = None
+        return True
+
+
+class CompressionOptionsPool(HandlePool[CompressionOptions]):
+    """HandlePool of CompressionOptions, reset to their defaults when released."""
+
+    def _create(self) -> CompressionOptions:
+        return CompressionOptions()
+
+    def _recycle(self, item: CompressionOptions) -> bool:
+        item.reset()
+        return True
+
+
+class OutputOptionsPool(HandlePool[OutputOptions]):
+    """HandlePool of OutputOptions, reset to their defaults when released, which also flushes their file."""
+
+    def _create(self) -> OutputOptions:
+        return OutputOptions()
+
+    def _recycle(self, item: OutputOptions) -> bool:
+        item.reset()
+        return True
+
+
+class WorkerPool:
+    """
+    Threads converting images with warm native state: the library is bound and each thread's Context and
+    default options are created up front, surfaces are recycled through a SurfacePool.
+
+    Meant for long-running processes (servers, watchers) where per-conversion setup would dominate small textures.
+    """
+
+    def __init__(self, workers: int | None = None, preset: CompressionPreset | None = None, use_cuda: bool = False):
+        self._workers: int = workers or os.cpu_count() or 1
+        self._preset: CompressionPreset = preset or CompressionPreset(Format.DXT1, Quality.Normal)
+        self._use_cuda = use_cuda
+        self._local = threading.local()
+        self._surfaces = SurfacePool(self._workers)
+        self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="nvtt-worker")
+        self._converted: int = 0
+        self._lock = threading.Lock()
+        self._warm_up()
+
+    @property
+    def workers(self) -> int:
+        """Get the number of worker threads."""
+        return self._workers
+
+    @property
+    def preset(self) -> CompressionPreset:
+        """Get the preset used when none is given."""
+        return self._preset
+
+    @property
+    def converted(self) -> int:
+        """Returns the number of images converted so far."""
+        return self._converted
+
+    def _warm_up(self) -> None:
+        """Binds the library and creates every worker's Context and default options."""
+        nvtt.preload()
+        barrier = threading.Barrier(self._workers)
+
+        def warm() -> None:
+            self._context()
+            self._preset.options()
+            # Holds each thread until all have started, so every worker gets warmed.
+            barrier.wait()
+
+        for future in [self._executor.submit(warm) for _ in range(self._workers)]:
+            future.result()
+
+    def _context(self) -> Context:
+        """Returns the calling worker thread's Context, creating it on first use."""
+        ctx: Context | None = getattr(self._local, "ctx", None)
+        if ctx is None:
+            ctx = self._local.ctx = Context()
+            ctx.enable_cuda_acceleration(self._use_cuda)
+        return ctx
+
+    def _compress(self, source: str | bytes, preset: CompressionPreset, do_mips: bool) -> bytes:
+        """Loads `source`, a file path or image file bytes, and compresses it on the calling worker thread."""
+        with self._surfaces.borrow() as surface:
+            try:
+                loaded: bool = surface.load(source) if isinstance(source, str) else surface.load_from_memory(source)
+            except RuntimeError as e:
+                raise ValueError(str(e)) from e
+            if not loaded:
+                raise ValueError("Failed to load the source image.")
+            data: bytes = self._context().compress_to_bytes(surface, preset.options(), None, 0, 1, Filters.MITCHELL, do_mips)
+        with self._lock:
+            self._converted += 1
+        return data
+
+    def submit(self, source: Path | str | bytes, preset: CompressionPreset | None = None, do_mips: bool = True) -> Future:
+        """
+        Queues the conversion of an image file path or image file bytes, the future's result is the DDS bytes.
+
+        Sources that cannot be loaded fail with a ValueError.
+        """
+        if isinstance(source, Path):
+            source = str(source)
+        return self._executor.submit(self._compress, source, preset or self._preset, do_mips)
+
+    def convert_bytes(self, data: bytes, preset: CompressionPreset | None = None, do_mips: bool = True) -> bytes:
+        """Converts image file bytes and returns the DDS bytes."""
+        return self.submit(data, preset, do_mips).result()
+
+    def _convert_file(self, source: Path, output: Path, preset: CompressionPreset, do_mips: bool) -> Path:
+        """Converts `source` to `output` on the calling worker thread."""
+        write_atomic(output, self._compress(str(source), preset, do_mips))
+        return output
+
+    def submit_file(self, source: Path | str, output: Path | str | None = None, preset: CompressionPreset | None = None, do_mips: bool = True) -> Future:
+        """
+        Queues the conversion of the image file `source`, written atomically to `output` (next to it by default).
+        The future's result is the output path.
+        """
+        source_path = Path(source)
+        if not source_path.is_file():
+            raise FileNotFoundError(f"File {source} does not exist.")
+        output_path = Path(output) if output is not None else source_path.with_suffix(".dds")
+        return self._executor.submit(self._convert_file, source_path, output_path, preset or self._preset, do_mips)
+
+    def convert_file(self, source: Path | str, output: Path | str | None = None, preset: CompressionPreset | None = None, do_mips: bool = True) -> Path:
+        """Converts the image file `source`, writing the DDS atomically to `output` (next to it by default)."""
+        return self.submit_file(source, output, preset, do_mips).result()
+
+    def close(self) -> None:
+        """Waits for the queued conversions and stops the threads."""
+        self._executor.shutdown()
+        self._surfaces.close()
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,134 @@
+from dataclasses import dataclass, fields, replace
+from enum import IntEnum
+import json
+import threading
+from .compression import CompressionOptions
+from .enums import Format, Quality, PixelType
+
+# Per-thread registry of the CompressionOptions materialized from presets, by preset.
+_registry = threading.local()
+
+
+@dataclass(frozen=True)
+class CompressionPreset:
+    """
+    Immutable, hashable and picklable description of a CompressionOptions.
+
+    Options left to None are not set, like on a new CompressionOptions. The native options are only built by
+    options(), once per thread, so presets are cheap to create, compare, use as keys and send to other processes.
+    """
+    format: Format | None = None
+    quality: Quality | None = None
+    color_weights: tuple[float, float, float, float] | None = None
+    pixel_format: tuple[int, int, int, int, int] | None = None
+    pixel_type: PixelType | None = None
+    pitch_alignment: int | None = None
+    quantization: tuple[bool, bool, bool, int] | None = None
+
+    def __post_init__(self):
+        # Normalized so equal presets compare, hash and serialize equal however their values were given.
+        if self.format is not None:
+            object.__setattr__(self, "format", Format(self.format))
+        if self.quality is not None:
+            object.__setattr__(self, "quality", Quality(self.quality))
+        if self.pixel_type is not None:
+            object.__setattr__(self, "pixel_type", PixelType(self.pixel_type))
+        if self.color_weights is not None:
+            object.__setattr__(self, "color_weights", tuple(float(w) for w in self.color_weights))
+            if len(self.color_weights) != 4:
+                raise ValueError("color_weights must have 4 entries.")
+        if self.pixel_format is not None:
+            object.__setattr__(self, "pixel_format", tuple(int(v) for v in self.pixel_format))
+            if len(self.pixel_format) != 5:
+                raise ValueError("pixel_format must have 5 entries.")
+        if self.pitch_alignment is not None:
+            object.__setattr__(self, "pitch_alignment", int(self.pitch_alignment))
+        if self.quantization is not None:
+            color_dithering, alpha_dithering, binary_alpha, alpha_threshold = self.quantization
+            object.__setattr__(self, "quantization", (bool(color_dithering), bool(alpha_dithering), bool(binary_alpha), int(alpha_threshold)))
+
+    @classmethod
+    def from_options(cls, co: CompressionOptions) -> "CompressionPreset":
+        """Creates a preset from the settings of a CompressionOptions."""
+        return cls.from_settings(co.settings)
+
+    @classmethod
+    def from_settings(cls, settings: dict[str, object]) -> "CompressionPreset":
+        """Creates a preset from a dict shaped like CompressionOptions.settings."""
+        names: set[str] = {f.name for f in fields(cls)}
+        unknown: set[str] = set(settings) - names
+        if unknown:
+            raise ValueError(f"Unknown compression settings: {', '.join(sorted(unknown))}.")
+        return cls(**settings)
+
+    @classmethod
+    def from_key(cls, key: str) -> "CompressionPreset":
+        """Creates a preset from its key."""
+        return cls.from_settings(json.loads(key))
+
+    @property
+    def settings(self) -> dict[str, object]:
+        """Returns the options that are set, shaped like CompressionOptions.settings."""
+        settings: dict[str, object] = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if value is None:
+                continue
+            if isinstance(value, tuple):
+                value = list(value)
+            elif isinstance(value, IntEnum):
+                value = int(value)
+            settings[f.name] = value
+        return settings
+
+    @property
+    def key(self) -> str:
+        """Returns the canonical JSON key of the preset, equal for equal presets."""
+        return json.dumps(self.settings, sort_keys=True, separators=(",", ":"))
+
+    def replace(self, **changes) -> "CompressionPreset":
+        """Returns a copy of the preset with some options changed."""
+        return replace(self, **changes)
+
+    def apply(self, co: CompressionOptions) -> CompressionOptions:
+        """Sets the options of the preset on `co`, which is returned."""
+        if self.format is not None:
+            co.format(self.format)
+        if self.quality is not None:
+            co.quality(self.quality)
+        if self.color_weights is not None:
+            co.color_weights(*self.color_weights)
+        if self.pixel_format is not None:
+            co.pixel_format(*self.pixel_format)
+        if self.pixel_type is not None:
+            co.pixel_type(self.pixel_type)
+        if self.pitch_alignment is not None:
+            co.pitch_alignment(self.pitch_alignment)
+        if self.quantization is not None:
+            co.quantization(*self.quantization)
+        return co
+
+    def create_options(self) -> CompressionOptions:
+        """Returns a new CompressionOptions set to the preset, owned by the caller."""
+        return self.apply(CompressionOptions())
+
+    def options(self) -> CompressionOptions:
+        """
+        Returns the calling thread's CompressionOptions for this preset, built on first use and shared by every
+        equal preset afterwards. It must not be modified, use create_options() for options to change.
+        """
+        options: dict[CompressionPreset, CompressionOptions] | None = getattr(_registry, "options", None)
+        if options is None:
+            options = _registry.options = {}
+        co: CompressionOptions | None = options.get(self)
+        if co is None or co.closed:
+            co = options[self] = self.create_options()
+        return co
+
+
+def clear_presets() -> None:
+    """Frees the CompressionOptions built by CompressionPreset.options() on the calling thread."""
+    options: dict[CompressionPreset, CompressionOptions] = getattr(_registry, "options", None) or {}
+    _registry.options = {}
+    for co in options.values():
+        co.close()
@@ -0,0 +1,359 @@
+from http.client import HTTPConnection, HTTPResponse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import parse_qs, urlencode, urlsplit
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import time
+from .pool import WorkerPool
+from .preset import CompressionPreset
+from .enums import Format, Quality
+from .core import nvtt
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8737
+# Largest request bodies accepted: image file bytes, and the JSON body of a file conversion.
+DEFAULT_MAX_BODY: int = 256 * 1024 * 1024
+MAX_JSON_BODY: int = 64 * 1024
+
+
+class ConversionError(RuntimeError):
+    """A conversion request failed, `status` is its HTTP status code."""
+
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.status = status
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix socket."""
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    HTTP/1.1 handler, connections are kept alive so a client pays the connection setup once.
+
+    GET /health returns the server status. POST /convert takes the options as query parameters (`format`,
+    `quality`, `mipmaps`) and either a JSON body {"source": path, "output": path} to convert a file under the
+    server's roots, answered with {"output": path, "seconds": ...}, or the image file bytes, answered with the
+    DDS bytes. The request path, file mode and body size are checked before the body is read.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        # Headers and body are written separately, without TCP_NODELAY small responses would wait on delayed ACKs.
+        self.disable_nagle_algorithm = self.server.address_family != getattr(socket, "AF_UNIX", None)
+        super().setup()
+
+    def address_string(self) -> str:
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.service.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: dict[str, object]) -> None:
+        self._send(status, json.dumps(data).encode("utf-8"), "application/json")
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != "/health":
+            self._send_json(404, {"error": f"Unknown path {self.path}."})
+            return
+        self._send_json(200, self.server.service.health())
+
+    def _read_body(self, max_size: int) -> bytes:
+        """Reads the request body, refusing an invalid or larger than `max_size` Content-Length."""
+        try:
+            size: int = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            size = -1
+        if size < 0:
+            raise ConversionError("Invalid Content-Length.", 400)
+        if size > max_size:
+            raise ConversionError(f"The request body exceeds {max_size} bytes.", 413)
+        return self.rfile.read(size)
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        service: ConversionServer = self.server.service
+        body_read: bool = False
+        try:
+            if url.path != "/convert":
+                raise ConversionError(f"Unknown path {url.path}.", 404)
+            file_mode: bool = self.headers.get_content_type() == "application/json"
+            if file_mode and not service.roots:
+                raise ConversionError("File conversions are disabled, the server has no root directories.", 403)
+            body: bytes = self._read_body(MAX_JSON_BODY if file_mode else service.max_body)
+            body_read = True
+            preset, do_mips = service.parse_options(parse_qs(url.query))
+            if file_mode:
+                request: dict[str, object] = json.loads(body)
+                if not isinstance(request, dict) or "source" not in request:
+                    raise ConversionError("The request has no source path.", 400)
+                source: Path = service.check_path(str(request["source"]))
+                output: Path | None = service.check_path(str(request["output"])) if request.get("output") is not None else None
+                start: float = time.perf_counter()
+                output = service.convert_file(source, output, preset, do_mips)
+                self._send_json(200, {"output": str(output), "seconds": time.perf_counter() - start})
+            else:
+                self._send(200, service.convert_bytes(body, preset, do_mips), "application/octet-stream")
+        except ConversionError as e:
+            # An unread body would be parsed as the next request.
+            self.close_connection = self.close_connection or not body_read
+            self._send_json(e.status, {"error": str(e)})
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+
+class ConversionServer:
+    """
+    Long-running conversion service with a pool of warm workers, so each conversion skips the interpreter
+    startup, library loading and function binding, and reuses a Context, options and surfaces.
+
+    Listens over HTTP on `host`:`port`, or on the Unix socket `unix_socket` when given (only accessible to its
+    owner), see ConversionClient. Conversions run on `workers` threads (defaults to the CPU count), the native
+    compression releases the GIL.
+
+    File conversions read and write only paths resolving under one of the `roots` directories, and are refused
+    when none is given. In-memory conversions accept image files up to `max_body` bytes.
+    """
+
+    def __init__(self,
+                 host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT,
+                 unix_socket: Path | str | None = None,
+                 workers: int | None = None,
+                 format: Format = Format.DXT1,
+                 quality: Quality = Quality.Normal,
+                 use_cuda: bool = False,
+                 verbose: bool = False,
+                 roots: Iterable[Path | str] = (),
+                 max_body: int = DEFAULT_MAX_BODY,
+                 ):
+        self._preset = CompressionPreset(format, quality)
+        self.verbose = verbose
+        self.roots: tuple[Path, ...] = tuple(Path(root).resolve() for root in roots)
+        self.max_body: int = max_body
+        self._started: float = time.time()
+        self._pool = WorkerPool(workers, self._preset, use_cuda)
+        self._unix_socket: Path | None = Path(unix_socket) if unix_socket is not None else None
+        try:
+            if self._unix_socket is not None:
+                if self._unix_socket.is_socket():
+                    self._unix_socket.unlink()
+                self._server = _UnixHTTPServer(str(self._unix_socket), _Handler)
+                os.chmod(self._unix_socket, 0o600)
+            else:
+                self._server = ThreadingHTTPServer((host, port), _Handler)
+                self._server.daemon_threads = True
+        except BaseException:
+            self._pool.close()
+            raise
+        self._server.service = self
+
+    @property
+    def address(self) -> str:
+        """Returns the address to give ConversionClient."""
+        if self._unix_socket is not None:
+            return str(self._unix_socket)
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def workers(self) -> int:
+        """Get the number of worker threads."""
+        return self._pool.workers
+
+    def parse_options(self, query: dict[str, list[str]]) -> tuple[CompressionPreset, bool]:
+        """Returns the preset and whether to build mipmaps from the query parameters of a request."""
+        preset: CompressionPreset = self._preset
+        if "format" in query:
+            name: str = query["format"][-1]
+            if name not in Format.__members__:
+                raise ConversionError(f"Unknown format {name}.", 400)
+            preset = preset.replace(format=Format[name])
+        if "quality" in query:
+            name = query["quality"][-1]
+            if name not in Quality.__members__:
+                raise ConversionError(f"Unknown quality {name}.", 400)
+            preset = preset.replace(quality=Quality[name])
+        do_mips: bool = query.get("mipmaps", ["1"])[-1].lower() not in ("0", "false", "no")
+        return preset, do_mips
+
+    def check_path(self, path: Path | str) -> Path:
+        """Returns `path` resolved, raising a 403 ConversionError if it is not under one of the roots."""
+        resolved: Path = Path(path).resolve()
+        if not any(resolved.is_relative_to(root) for root in self.roots):
+            raise ConversionError(f"{path} is outside of the server's root directories.", 403)
+        return resolved
+
+    def convert_bytes(self, data: bytes, preset: CompressionPreset | None = None, do_mips: bool = True) -> bytes:
+        """Converts image file bytes on a worker and returns the DDS bytes."""
+        return self._pool.convert_bytes(data, preset, do_mips)
+
+    def convert_file(self, source: Path | str, output: Path | str | None = None, preset: CompressionPreset | None = None, do_mips: bool = True) -> Path:
+        """Converts the image file `source` on a worker, writing the DDS atomically to `output` (next to it by default)."""
+        try:
+            return self._pool.convert_file(source, output, preset, do_mips)
+        except FileNotFoundError as e:
+            raise ConversionError(str(e), 404) from e
+
+    def health(self) -> dict[str, object]:
+        """Returns the server status."""
+        return {
+            "status": "ok",
+            "version": nvtt.version,
+            "workers": self._pool.workers,
+            "converted": self._pool.converted,
+            "uptime": time.time() - self._started,
+        }
+
+    def serve_forever(self) -> None:
+        """Handles requests until shutdown() is called."""
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stops serve_forever(), from another thread."""
+        self._server.shutdown()
+
+    def close(self) -> None:
+        """Closes the socket and stops the workers."""
+        self._server.server_close()
+        if self._unix_socket is not None:
+            self._unix_socket.unlink(missing_ok=True)
+        self._pool.close()
+
+    def __enter__(self) -> "ConversionServer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class _UnixHTTPConnection(HTTPConnection):
+    """HTTPConnection over a Unix socket."""
+
+    def __init__(self, path: str, timeout: float | None = None):
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+class ConversionClient:
+    """
+    Client of a ConversionServer, keeping its connection open across requests.
+
+    `address` is "http://host:port" or the path of the server's Unix socket. Not thread-safe, use one per thread.
+    """
+
+    def __init__(self, address: str = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout: float | None = None):
+        if address.startswith("http://"):
+            url = urlsplit(address)
+            self._connection: HTTPConnection = HTTPConnection(url.hostname, url.port or DEFAULT_PORT, timeout=timeout)
+        else:
+            self._connection = _UnixHTTPConnection(address, timeout)
+
+    def _request(self, method: str, path: str, body: bytes | None = None, content_type: str | None = None) -> bytes:
+        """Sends a request, reconnecting once if the server closed the kept-alive connection, and returns the body."""
+        headers: dict[str, str] = {"Content-Type": content_type} if content_type else {}
+        for attempt in range(2):
+            try:
+                self._connection.request(method, path, body, headers)
+                response: HTTPResponse = self._connection.getresponse()
+                data: bytes = response.read()
+                break
+            except (ConnectionError, BrokenPipeError):
+                self._connection.close()
+                if attempt:
+                    raise
+        if response.status != 200:
+            raise ConversionError(json.loads(data).get("error", response.reason), response.status)
+        return data
+
+    @staticmethod
+    def _query(format: Format | None, quality: Quality | None, do_mips: bool) -> str:
+        params: dict[str, str] = {}
+        if format is not None:
+            params["format"] = Format(format).name
+        if quality is not None:
+            params["quality"] = Quality(quality).name
+        if not do_mips:
+            params["mipmaps"] = "0"
+        return "?" + urlencode(params) if params else ""
+
+    def health(self) -> dict[str, object]:
+        """Returns the server status."""
+        return json.loads(self._request("GET", "/health"))
+
+    def convert_file(self, source: Path | str, output: Path | str | None = None, format: Format | None = None, quality: Quality | None = None, do_mips: bool = True) -> Path:
+        """Converts an image file under one of the server's roots, returning the path of the DDS it wrote."""
+        request: dict[str, str] = {"source": str(Path(source).resolve())}
+        if output is not None:
+            request["output"] = str(Path(output).resolve())
+        data: bytes = self._request("POST", "/convert" + self._query(format, quality, do_mips), json.dumps(request).encode("utf-8"), "application/json")
+        return Path(json.loads(data)["output"])
+
+    def convert_bytes(self, data: bytes, format: Format | None = None, quality: Quality | None = None, do_mips: bool = True) -> bytes:
+        """Converts image file bytes, returning the DDS bytes."""
+        return self._request("POST", "/convert" + self._query(format, quality, do_mips), bytes(data), "application/octet-stream")
+
+    def close(self) -> None:
+        """Closes the connection."""
+        self._connection.close()
+
+    def __enter__(self) -> "ConversionClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m nvtt.server", description="pyNVTT conversion server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", help="Listen on this Unix socket instead of TCP.")
+    parser.add_argument("--workers", type=int, help="Number of worker threads, defaults to the CPU count.")
+    parser.add_argument("--format", default=Format.DXT1.name, choices=list(Format.__members__), help="Default format.")
+    parser.add_argument("--quality", default=Quality.Normal.name, choices=[q.name for q in Quality], help="Default quality.")
+    parser.add_argument("--cuda", action="store_true", help="Enable CUDA acceleration.")
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    parser.add_argument("--root", action="append", default=[],
+                        help="Directory file conversions may read and write under, can be repeated. File conversions are disabled without one.")
+    parser.add_argument("--max-body", type=int, default=DEFAULT_MAX_BODY, help="Largest image file accepted in bytes.")
+    args = parser.parse_args(argv)
+    # Stopping with SIGTERM closes the server like Ctrl+C, removing its Unix socket.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    with ConversionServer(args.host, args.port, args.socket, args.workers, Format[args.format], Quality[args.quality],
+                          args.cuda, args.verbose, args.root, args.max_body) as server:
+        print(f"Serving on {server.address} with {server.workers} workers.", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,69 @@
 import ctypes
+import mmap
+from contextlib import contextmanager
 from pathlib import Path
-from .enums import Filters, WrapMode, AlphaMode, TextureType, RoundMode, Channel
-from nvtt.utils.image_helper import get_bytes_from_image
+from .enums import Filters, WrapMode, AlphaMode, TextureType, RoundMode, Channel, InputFormat
+from nvtt.utils.image_helper import get_bytes_from_image, is_pillow_img, is_module_available
+from nvtt.utils.async_helper import run_blocking
+from .timing import TimingContext
 from .core import nvtt
 
+# Bytes per pixel of the interleaved InputFormats.
+INPUT_FORMAT_SIZES: dict[InputFormat, int] = {
+    InputFormat.BGRA_8UB: 4,
+    InputFormat.BGRA_8SB: 4,
+    InputFormat.RGBA_16F: 8,
+    InputFormat.RGBA_32F: 16,
+    InputFormat.R_32F: 4,
+}
+
+
+@contextmanager
+def pinned_buffer(data):
+    """
+    Yields a (pointer, size) pair over any contiguous buffer-protocol object, usable as a `c_void_p` argument.
+
+    bytes are passed as-is and writable buffers are pinned for the duration of the block (bytearrays cannot be
+    resized, mmaps cannot be closed), only other read-only buffers are copied.
+    """
+    with memoryview(data) as raw:
+        if not raw.c_contiguous:
+            raise ValueError("data must be a contiguous buffer.")
+        with raw.cast("B") as view:
+            size: int = len(view)
+            if isinstance(data, bytes):
+                buf = data
+            elif not view.readonly:
+                buf = (ctypes.c_ubyte * size).from_buffer(view)
+            else:
+                buf = (ctypes.c_ubyte * size).from_buffer_copy(view)
+            try:
+                yield buf, size
+            finally:
+                del buf
+
 
 class Surface:
     """High-level wrapper for nvttSurface."""
 
-    def __init__(self, image = None):
-        """Creates an empty surface."""
+    def __init__(self, image = None, timing_context: TimingContext | None = None):
+        """Creates an empty surface. Native calls are recorded into `timing_context` when given."""
         self._lib = nvtt._lib
         self._ptr = nvtt._lib.nvttCreateSurface()
         self._has_alpha = None
-        if not self._ptr:
+        self._timing: TimingContext | None = timing_context
+        if not self._handle:
             raise RuntimeError("Failed to create nvttSurface.")
         
         if image is not None:
             if(type(image) is str):
                 if not self.load(image):
                     raise RuntimeError(f"Failed to load image from file: {image}")
+            elif isinstance(image, (bytes, bytearray, memoryview, mmap.mmap)):
+                if not self.load_from_memory(image):
+                    raise RuntimeError("Failed to load image from memory.")
+            elif is_pillow_img(image):
+                self.load_pillow(image)
             else:
                 img_bytes: bytes = get_bytes_from_image(image)
                 if img_bytes is not None:
@@ -30,18 +74,67 @@ class Surface:
 
     def __del__(self):
         """Destructor."""
-        if getattr(self, "_ptr", None):
-            self._lib.nvttDestroySurface(self._ptr)
+        self.close()
+
+    def __enter__(self) -> "Surface":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Frees the native surface now instead of on garbage collection. The surface cannot be used afterwards."""
+        handle = getattr(self, "_handle", None)
+        if handle:
+            self._handle = None
+            self._lib.nvttDestroySurface(handle)
+
+    @property
+    def closed(self) -> bool:
+        """Returns whether the native surface has been freed."""
+        return not getattr(self, "_handle", None)
+
+    @property
+    def _ptr(self):
+        """Returns the native surface pointer, raising once the surface has been closed."""
+        if not self._handle:
+            raise RuntimeError("Surface has already been destroyed or not initialized.")
+        return self._handle
+
+    @_ptr.setter
+    def _ptr(self, value) -> None:
+        self._handle = value
 
     def clone(self) -> "Surface":
         "Creates a deep copy of this Surface, with its own internal data."
-        new_ptr = self._lib.nvttSurfaceClone(self._ptr)
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
         surf: Surface = Surface()
-        surf._ptr = new_ptr
+        self._lib.nvttDestroySurface(surf._ptr)
+        surf._ptr = self._lib.nvttSurfaceClone(self._ptr)
+        surf._has_alpha = self._has_alpha
+        surf._timing = self._timing
         return surf
 
+    @property
+    def timing_context(self) -> TimingContext | None:
+        """Returns the TimingContext native calls are recorded into, if any."""
+        return self._timing
+
+    @timing_context.setter
+    def timing_context(self, value: TimingContext | None) -> None:
+        """Attach a TimingContext recording every native call made by this surface, or None to detach it."""
+        self._timing = value
+
+    @property
+    def _tc(self):
+        """Returns the native timing context pointer passed to NVTT, or None."""
+        if self._timing is None:
+            return None
+        if self._timing.closed:
+            raise RuntimeError("Timing context has already been destroyed or not initialized.")
+        return self._timing._ptr
+
     @property
     def wrap_mode(self) -> WrapMode:
         """Returns the wrap mode of the surface."""
@@ -130,39 +223,197 @@ class Surface:
             file.encode("utf-8"),
             ctypes.byref(has_alpha),
             expect_signed,
-            None,
+            self._tc,
         )
         if not result:
             raise RuntimeError(f"Failed to load texture from {file}.")
         self._has_alpha = has_alpha.value
         return True
     
-    def load_from_memory(self, data: bytes, expect_signed: bool = False) -> bool:
-        """Variant of load() that reads from memory instead of a file."""
-        size: int = len(data)
+    async def load_async(self, file: str, expect_signed: bool = False) -> bool:
+        """Variant of load() running on the bounded executor of the async API."""
+        return await run_blocking(self.load, file, expect_signed)
+
+    def load_from_memory(self, data, expect_signed: bool = False) -> bool:
+        """
+        Variant of load() that reads from memory instead of a file.
+
+        `data` can be any buffer-protocol object (bytes, bytearray, memoryview, mmap, ...), its memory is handed
+        to NVTT directly and only copied when it is read-only and cannot be pinned.
+        """
         has_alpha = ctypes.c_bool(False)
-        ArrayType = ctypes.c_ubyte * size
-        buf = ArrayType.from_buffer_copy(data)
-        bytes_ptr = ctypes.cast(buf, ctypes.c_void_p)
-        result = self._lib.nvttSurfaceLoadFromMemory(
-            self._ptr,
-            bytes_ptr,
-            size,
-            ctypes.byref(has_alpha),
-            expect_signed,
-            None
-        )
+        with pinned_buffer(data) as (buf, size):
+            result = self._lib.nvttSurfaceLoadFromMemory(
+                self._ptr,
+                buf,
+                size,
+                ctypes.byref(has_alpha),
+                expect_signed,
+                self._tc
+            )
         if not result:
             raise RuntimeError("Failed to load texture from memory.")
         
         self._has_alpha = has_alpha.value
         return True
+
+    async def load_from_memory_async(self, data, expect_signed: bool = False) -> bool:
+        """Variant of load_from_memory() running on the bounded executor of the async API."""
+        return await run_blocking(self.load_from_memory, data, expect_signed)
+
+    def load_mmap(self, file: str, expect_signed: bool = False) -> bool:
+        """Variant of load() that memory-maps the file and hands the mapping to load_from_memory()."""
+        if not Path.exists(Path(file)):
+            raise FileNotFoundError(f"File {file} does not exist.")
+        with open(file, "rb") as f:
+            # Copy-on-write mapping: writable, so it can be pinned, but nothing is ever written back.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY) as mapped:
+                return self.load_from_memory(mapped, expect_signed)
     
+    def set_image(self, width: int, height: int, depth: int = 1) -> bool:
+        """Sets the surface to a (`width` x `height` x `depth`) image with every channel cleared to 0."""
+        if not self._lib.nvttSurfaceSetImage(self._ptr, width, height, depth, self._tc):
+            raise RuntimeError("Failed to set image.")
+        return True
+
+    def set_image_data(self, format: InputFormat, width: int, height: int, depth: int, data, unsigned_to_signed: bool = False) -> bool:
+        """Sets the surface from interleaved raw pixel data in the given InputFormat, without decoding any file."""
+        expected: int = width * height * depth * INPUT_FORMAT_SIZES[InputFormat(format)]
+        with pinned_buffer(data) as (buf, size):
+            if size < expected:
+                raise ValueError(f"data is too small for a {width}x{height}x{depth} image, expected {expected} bytes, got {size}.")
+            result = self._lib.nvttSurfaceSetImageData(
+                self._ptr, int(format), width, height, depth, buf, unsigned_to_signed, self._tc
+            )
+        if not result:
+            raise RuntimeError("Failed to set image data.")
+        return True
+
+    def set_image_rgba(self, format: InputFormat, width: int, height: int, depth: int, r, g, b, a) -> bool:
+        """
+        Sets the surface from one raw buffer per channel in the given InputFormat, each channel taking a quarter
+        of its pixel size. R_32F only reads `r`.
+        """
+        format = InputFormat(format)
+        pixels: int = width * height * depth
+        channels: dict[str, object] = {"r": r} if format == InputFormat.R_32F else {"r": r, "g": g, "b": b, "a": a}
+        expected: int = pixels * (INPUT_FORMAT_SIZES[format] if format == InputFormat.R_32F else INPUT_FORMAT_SIZES[format] // 4)
+        for name, channel in channels.items():
+            with memoryview(channel) as view:
+                if view.nbytes < expected:
+                    raise ValueError(f"{name} is too small for a {width}x{height}x{depth} image, expected {expected} bytes, got {view.nbytes}.")
+        with pinned_buffer(r) as (r_buf, _), pinned_buffer(g) as (g_buf, _), \
+             pinned_buffer(b) as (b_buf, _), pinned_buffer(a) as (a_buf, _):
+            result = self._lib.nvttSurfaceSetImageRGBA(
+                self._ptr, int(format), width, height, depth, r_buf, g_buf, b_buf, a_buf, self._tc
+            )
+        if not result:
+            raise RuntimeError("Failed to set image data.")
+        return True
+
+    def load_pillow(self, image) -> bool:
+        """Sets the surface from the raw pixels of a Pillow image, without re-encoding it."""
+        if not is_module_available("PIL") or not is_pillow_img(image):
+            raise TypeError("image must be a Pillow image.")
+        width, height = image.size
+        if image.mode == "F":
+            self.set_image_data(InputFormat.R_32F, width, height, 1, image.tobytes())
+            self._has_alpha = False
+            return True
+        has_alpha: bool = "A" in image.getbands() or "transparency" in image.info
+        if image.mode != "RGBA":
+            image = image.convert("RGBA")
+        self.set_image_data(InputFormat.BGRA_8UB, width, height, 1, image.tobytes("raw", "BGRA"))
+        self._has_alpha = has_alpha
+        return True
+
+    @classmethod
+    def from_pillow(cls, image) -> "Surface":
+        """Creates a Surface from the raw pixels of a Pillow image, without re-encoding it."""
+        surf: Surface = cls()
+        surf.load_pillow(image)
+        return surf
+
+    def as_array(self, channel: Channel | None = None):
+        """
+        Returns a NumPy float32 view (no copy) over the Surface's planar storage.
+
+        The view has shape (4, height, width), or (4, depth, height, width) for 3D surfaces; with `channel`
+        only that channel is returned. It is invalidated by any method that reallocates the surface
+        (load, resize, build_next_mipmap, ...), and keeps the Surface alive while it exists.
+        """
+        if not is_module_available("numpy"):
+            raise ImportError("NumPy is required to use Surface.as_array.")
+        import numpy as np
+
+        if self.is_null:
+            raise RuntimeError("Surface is null or has not been initialized.")
+        shape: tuple[int, ...] = (self.height, self.width) if self.depth == 1 else (self.depth, self.height, self.width)
+        if channel is None:
+            ptr = self._lib.nvttSurfaceData(self._ptr)
+            shape = (4, *shape)
+        else:
+            ptr = self._lib.nvttSurfaceChannel(self._ptr, int(channel))
+        count: int = 1
+        for extent in shape:
+            count *= extent
+        buf = (ctypes.c_float * count).from_address(ctypes.addressof(ptr.contents))
+        buf._surface = self
+        return np.ctypeslib.as_array(buf).reshape(shape)
+
+    def load_array(self, array) -> bool:
+        """
+        Sets the surface from a NumPy array of shape (height, width) or (height, width, channels).
+
+        Integer arrays are normalized to [0, 1] by their dtype's maximum; missing channels are filled
+        like a grayscale (1 channel) or opaque (3 channels) image.
+        """
+        if not is_module_available("numpy"):
+            raise ImportError("NumPy is required to use Surface.load_array.")
+        import numpy as np
+
+        array = np.asarray(array)
+        if array.ndim == 2:
+            array = array[:, :, np.newaxis]
+        if array.ndim != 3 or not 1 <= array.shape[2] <= 4:
+            raise ValueError("array must have shape (height, width) or (height, width, channels) with 1 to 4 channels.")
+        if np.issubdtype(array.dtype, np.integer):
+            array = array.astype(np.float32) / np.iinfo(array.dtype).max
+        height, width, channels = array.shape
+        self.set_image(width, height, 1)
+        view = self.as_array()
+        if channels <= 2:
+            view[0:3] = array[:, :, 0]
+        else:
+            view[0:3] = np.moveaxis(array[:, :, 0:3], 2, 0)
+        view[3] = array[:, :, channels - 1] if channels in (2, 4) else 1.0
+        self._has_alpha = channels in (2, 4)
+        return True
+
+    @classmethod
+    def from_array(cls, array) -> "Surface":
+        """Creates a Surface from a NumPy array of shape (height, width) or (height, width, channels)."""
+        surf: Surface = cls()
+        surf.load_array(array)
+        return surf
+
+    def rms_error(self, reference: "Surface") -> float:
+        """Returns the RMS error of the color channels against `reference`, which must have the same size."""
+        if self.is_null or reference.is_null:
+            raise RuntimeError("Surface is null or has not been initialized.")
+        return self._lib.nvttRmsError(reference._ptr, self._ptr, self._tc)
+
+    def rms_alpha_error(self, reference: "Surface") -> float:
+        """Returns the RMS error of the alpha channel against `reference`, which must have the same size."""
+        if self.is_null or reference.is_null:
+            raise RuntimeError("Surface is null or has not been initialized.")
+        return self._lib.nvttRmsAlphaError(reference._ptr, self._ptr, self._tc)
+
     def save(self, file_name: str, is_hdr: bool = False) -> bool:
         """Saves the surface to a file."""
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        result = self._lib.nvttSurfaceSave(self._ptr, file_name.encode("utf-8"), self.has_alpha, is_hdr, None)
+        result = self._lib.nvttSurfaceSave(self._ptr, file_name.encode("utf-8"), self.has_alpha, is_hdr, self._tc)
         if not result:
             raise RuntimeError(f"Failed to save texture to {file_name}.")
         return result
@@ -176,33 +427,33 @@ class Surface:
         """Resizes this surface to have size (`width` x `height` x `depth`) using a given filter."""
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        self._lib.nvttSurfaceResize(self._ptr, width, height, depth, int(filter), filter_width, None, None)
+        self._lib.nvttSurfaceResize(self._ptr, width, height, depth, int(filter), filter_width, None, self._tc)
         
     def resize_max(self, max_extent: int, mode: RoundMode = RoundMode.NONE, filter: Filters = Filters.KAISER) -> None:
         """Resizes this surface so that its largest side has length `max_extent`, subject to a rounding mode."""
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        self._lib.nvttSurfaceResizeMax(self._ptr, max_extent, int(mode), int(filter), None)
+        self._lib.nvttSurfaceResizeMax(self._ptr, max_extent, int(mode), int(filter), self._tc)
         
     def resize_make_square(self, max_extent: int, mode: RoundMode = RoundMode.NONE, filter: Filters = Filters.KAISER) -> None:
         """Resizes this surface so that its longest side has length `max_entent` and the result is square or cubical."""
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        self._lib.nvttSurfaceResizeMakeSquare(self._ptr, max_extent, int(mode), int(filter), None)
+        self._lib.nvttSurfaceResizeMakeSquare(self._ptr, max_extent, int(mode), int(filter), self._tc)
 
     def build_next_mipmap(self, filter: Filters, min_size: int = 1) -> bool:
         """Replaces this surface with a surface the size of the next mip in a mip chain (half the width and height), but with each channel cleared to a constant value."""
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
         return self._lib.nvttSurfaceBuildNextMipmapDefaults(
-            self._ptr, int(filter), min_size, None
+            self._ptr, int(filter), min_size, self._tc
         )
         
     def canvas_size(self, width: int, height: int, depth: int = 1) -> None:
         """Crops or expands this surface from the (0,0,0) corner, with any new values cleared to 0."""
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        self._lib.nvttSurfaceCanvasSize(self._ptr, width, height, depth, None)
+        self._lib.nvttSurfaceCanvasSize(self._ptr, width, height, depth, self._tc)
         
     def can_make_next_mipmap(self, min_size: int = 1) -> bool:
         """Returns whether a the surface would have a next mip in a mip chain with minimum size `min_size`."""
@@ -218,7 +469,7 @@ class Surface:
         """
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        self._lib.nvttSurfaceToLinear(self._ptr, gamma, None)
+        self._lib.nvttSurfaceToLinear(self._ptr, gamma, self._tc)
         
     def to_gamma(self, gamma: float = 2.2) -> None:
         """
@@ -228,7 +479,7 @@ class Surface:
         """
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        self._lib.nvttSurfaceToLinear(self._ptr, gamma, None)
+        self._lib.nvttSurfaceToLinear(self._ptr, gamma, self._tc)
         
     def to_linear_channel(self, channel: Channel, gamma: float = 2.2) -> None:
         """
@@ -239,7 +490,7 @@ class Surface:
         if channel == Channel.ALPHA:
             print("Warning: Converting the alpha channel to linear is not supported. The alpha channel will be left unchanged.")
             return 
-        self._lib.nvttSurfaceToLinearChannel(self._ptr, int(channel), gamma, None)
+        self._lib.nvttSurfaceToLinearChannel(self._ptr, int(channel), gamma, self._tc)
         
     def to_gamma_channel(self, channel: Channel, gamma: float = 2.2) -> None:
         """
@@ -250,43 +501,43 @@ class Surface:
         if channel == Channel.ALPHA:
             print("Warning: Converting the alpha channel to gamma is not supported. The alpha channel will be left unchanged.")
             return 
-        self._lib.nvttSurfaceToGammaChannel(self._ptr, int(channel), gamma, None)
+        self._lib.nvttSurfaceToGammaChannel(self._ptr, int(channel), gamma, self._tc)
         
     def to_srgb(self) -> None:
         """Applies the linear-to-sRGB transfer function to RGB channels."""
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        self._lib.nvttSurfaceToSrgb(self._ptr, None)
+        self._lib.nvttSurfaceToSrgb(self._ptr, self._tc)
         
     def to_srgb_unclamped(self) -> None:
         """Applies the linear-to-sRGB transfer function to RGB channels, but does not clamp output to [0,1]."""
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        self._lib.nvttSurfaceToSrgbUnclamped(self._ptr, None)
+        self._lib.nvttSurfaceToSrgbUnclamped(self._ptr, self._tc)
         
     def to_linear_from_srgb(self) -> None:
         """Applies the sRGB-to-linear transfer function to RGB channels."""
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        self._lib.nvttSurfaceToLinearFromSrgb(self._ptr, None)
+        self._lib.nvttSurfaceToLinearFromSrgb(self._ptr, self._tc)
     
     def to_linear_from_srgb_unclamped(self) -> None:
         """Applies the sRGB-to-linear transfer function to RGB channels, but does not clamp output to [0,1]."""
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        self._lib.nvttSurfaceToLinearFromSrgbUnclamped(self._ptr, None)
+        self._lib.nvttSurfaceToLinearFromSrgbUnclamped(self._ptr, self._tc)
         
     def to_xenon_srgb(self) -> None:
         """Converts colors in RGB channels from linear to a piecewise linear sRGB approximation."""
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        self._lib.nvttSurfaceToXenonSrgb(self._ptr, None)
+        self._lib.nvttSurfaceToXenonSrgb(self._ptr, self._tc)
         
     def to_linear_from_xenon_srgb(self) -> None:
         """Converts colors in RGB channels from the Xenon sRGB piecewise linear sRGB approximation to linear."""
         if self.is_null:
             raise RuntimeError("Surface is null or has not been initialized.")
-        self._lib.nvttSurfaceToLinearFromXenonSrgb(self._ptr, None)
+        self._lib.nvttSurfaceToLinearFromXenonSrgb(self._ptr, self._tc)
 
     @property
     def has_alpha(self) -> bool:
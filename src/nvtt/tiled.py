@@ -0,0 +1,196 @@
+from abc import ABC, abstractmethod
+import ctypes
+import math
+import mmap
+import tempfile
+from pathlib import Path
+from .surface import Surface, INPUT_FORMAT_SIZES
+from .compression import CompressionOptions
+from .output import OutputOptions, OutputBuffer
+from .enums import Filters, Format, InputFormat, TextureType
+from .utils.dds import MAX_HEADER_SIZE, block_info, count_mipmaps, mip_extent
+
+# Rough peak cost of one tile pixel: the float32 RGBA tile, its downsampled mipmap, the source pixels and
+# NVTT's own working copies while compressing.
+BYTES_PER_TILE_PIXEL: int = 48
+DEFAULT_MEMORY_BUDGET: int = 256 << 20
+
+
+class TileSource(ABC):
+    """Source image of a tiled compression, read one rectangle at a time."""
+
+    width: int
+    height: int
+
+    @abstractmethod
+    def read(self, surface: Surface, x: int, y: int, width: int, height: int) -> None:
+        """Sets `surface` to the (`width` x `height`) rectangle at (`x`, `y`)."""
+
+    def close(self) -> None:
+        """Releases the source."""
+
+
+class PillowTileSource(TileSource):
+    """Tiles cropped from a Pillow image, which only keeps 8-bit pixels in memory instead of float32 ones."""
+
+    def __init__(self, image):
+        self._image = image
+        self.width, self.height = image.size
+
+    def read(self, surface: Surface, x: int, y: int, width: int, height: int) -> None:
+        surface.load_pillow(self._image.crop((x, y, x + width, y + height)))
+
+
+class RawTileSource(TileSource):
+    """Tiles read from a memory-mapped file of raw, interleaved pixels in an InputFormat, e.g. a dumped RGBA8 image."""
+
+    def __init__(self, file: str | Path, width: int, height: int, format: InputFormat = InputFormat.BGRA_8UB, offset: int = 0):
+        self.width = width
+        self.height = height
+        self._format = InputFormat(format)
+        self._pixel_size: int = INPUT_FORMAT_SIZES[self._format]
+        self._offset = offset
+        with open(file, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < offset + width * height * self._pixel_size:
+            self._map.close()
+            raise ValueError(f"{file} is too small for a {width}x{height} {self._format.name} image.")
+
+    def read(self, surface: Surface, x: int, y: int, width: int, height: int) -> None:
+        row_size: int = width * self._pixel_size
+        tile = bytearray(row_size * height)
+        for row in range(height):
+            start: int = self._offset + ((y + row) * self.width + x) * self._pixel_size
+            tile[row * row_size:(row + 1) * row_size] = self._map[start:start + row_size]
+        surface.set_image_data(self._format, width, height, 1, tile)
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class _LevelStore(TileSource):
+    """Planar float32 RGBA image in an anonymous memory-mapped temporary file, holding a mipmap level between passes."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self._plane: int = width * height * 4
+        self._file = tempfile.TemporaryFile()
+        self._file.truncate(self._plane * 4)
+        self._map = mmap.mmap(self._file.fileno(), self._plane * 4)
+        self._buf = (ctypes.c_char * (self._plane * 4)).from_buffer(self._map)
+        self._address: int = ctypes.addressof(self._buf)
+
+    def _copy_rows(self, surface: Surface, x: int, y: int, width: int, height: int, to_surface: bool) -> None:
+        """Copies a rectangle between the store and `surface`, whose rows are `surface.width` wide."""
+        stride: int = surface.width * 4
+        for channel in range(4):
+            surface_address: int = ctypes.addressof(surface._lib.nvttSurfaceChannel(surface._ptr, channel).contents)
+            store_address: int = self._address + channel * self._plane + (y * self.width + x) * 4
+            for row in range(height):
+                src, dst = store_address + row * self.width * 4, surface_address + row * stride
+                if not to_surface:
+                    src, dst = dst, src
+                ctypes.memmove(dst, src, width * 4)
+
+    def read(self, surface: Surface, x: int, y: int, width: int, height: int) -> None:
+        surface.set_image(width, height, 1)
+        self._copy_rows(surface, x, y, width, height, True)
+
+    def write(self, surface: Surface, x: int, y: int) -> None:
+        """Stores the part of `surface` that fits at (`x`, `y`)."""
+        width: int = min(surface.width, self.width - x)
+        height: int = min(surface.height, self.height - y)
+        if width > 0 and height > 0:
+            self._copy_rows(surface, x, y, width, height, False)
+
+    def close(self) -> None:
+        del self._buf
+        self._map.close()
+        self._file.close()
+
+
+def tile_size_for_budget(format: Format, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> int:
+    """Returns the largest square tile side fitting `memory_budget`, aligned to the format's blocks and to 2 for mipmaps."""
+    block_width, block_height, _ = block_info(format)
+    align: int = math.lcm(block_width, block_height, 2)
+    side: int = math.isqrt(memory_budget // BYTES_PER_TILE_PIXEL) // align * align
+    if side < align:
+        raise ValueError(f"A memory budget of {memory_budget} bytes is too small for a single tile.")
+    return side
+
+
+def compress_tiled(ctx, source: TileSource, co: CompressionOptions, output: str | Path,
+                   oo: OutputOptions | None = None,
+                   memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                   min_level: int = 1,
+                   do_mips: bool = True,
+                   ) -> int:
+    """
+    Compresses `source` to the DDS file `output` one block-aligned tile at a time, see Context.compress_tiled.
+
+    Returns the number of tiles compressed.
+    """
+    format: Format = Format(co.settings.get("format", Format.DXT1))
+    block_width, block_height, block_bytes = block_info(format)
+    tile_side: int = tile_size_for_budget(format, memory_budget)
+    mipmap_count: int = count_mipmaps(source.width, source.height, 1, min_level) if do_mips else 1
+
+    # Only the container of `oo` is read, the header and tiles go through options of our own.
+    container: int | None = oo.settings.get("container") if oo is not None else None
+    oo = OutputOptions()
+    if container is not None:
+        oo.container(container)
+    header: OutputBuffer = oo.output_to_buffer(bytearray(MAX_HEADER_SIZE))
+    if not ctx.output_header_data(TextureType.TEXTURE_2D, source.width, source.height, 1, mipmap_count, False, co, oo):
+        raise RuntimeError(f"Failed to write the header for {output}.")
+
+    tiles: int = 0
+    tile: Surface = Surface()
+    tile_buffer = bytearray(-(-tile_side // block_width) * -(-tile_side // block_height) * block_bytes)
+    level_source: TileSource = source
+    with open(output, "wb") as f:
+        f.write(header.getvalue())
+        for level in range(mipmap_count):
+            width: int = mip_extent(source.width, level)
+            height: int = mip_extent(source.height, level)
+            next_level: _LevelStore | None = None
+            if level + 1 < mipmap_count:
+                next_level = _LevelStore(mip_extent(source.width, level + 1), mip_extent(source.height, level + 1))
+            try:
+                blocks_x: int = -(-width // block_width)
+                for y in range(0, height, tile_side):
+                    tile_height: int = min(tile_side, height - y)
+                    band_rows: int = -(-tile_height // block_height)
+                    band = bytearray(blocks_x * band_rows * block_bytes)
+                    for x in range(0, width, tile_side):
+                        tile_width: int = min(tile_side, width - x)
+                        level_source.read(tile, x, y, tile_width, tile_height)
+                        data: OutputBuffer = oo.output_to_buffer(tile_buffer)
+                        if not ctx.compress(tile, 0, level, co, oo):
+                            raise RuntimeError(f"Failed to compress the tile at ({x}, {y}) of level {level}.")
+                        tiles += 1
+                        # Scatter the tile's block rows into the band, block rows of a level are contiguous.
+                        row_size: int = -(-tile_width // block_width) * block_bytes
+                        start: int = x // block_width * block_bytes
+                        blocks = data.getvalue()
+                        for row in range(band_rows):
+                            offset: int = row * blocks_x * block_bytes + start
+                            band[offset:offset + row_size] = blocks[row * row_size:(row + 1) * row_size]
+                        if next_level is not None:
+                            # The box filter only reads the 2x2 footprint of each texel, so even-aligned tiles give
+                            # the same mipmaps as the whole image.
+                            if tile.can_make_next_mipmap() and not tile.build_next_mipmap(Filters.BOX):
+                                raise RuntimeError(f"Failed to build a mipmap of the tile at ({x}, {y}) of level {level}.")
+                            next_level.write(tile, x // 2, y // 2)
+                    f.write(band)
+            except BaseException:
+                if next_level is not None:
+                    next_level.close()
+                raise
+            finally:
+                if level_source is not source:
+                    level_source.close()
+            level_source = next_level
+    return tiles
+
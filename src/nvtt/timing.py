@@ -0,0 +1,106 @@
+import ctypes
+from .core import nvtt
+
+# Size of the buffer receiving each record's description.
+DESCRIPTION_SIZE: int = 256
+
+# Detail levels: NVTT records nothing below 2. Level 2 records Surface operations (loading, mipmap building,
+# conversions), level 3 adds the Context stages (size estimate, header, per-mipmap conversion and encoding).
+DETAIL_SURFACE: int = 2
+DETAIL_CONTEXT: int = 3
+DEFAULT_DETAIL_LEVEL: int = DETAIL_CONTEXT
+
+
+class TimingContext:
+    """High-level wrapper for nvttTimingContext."""
+
+    def __init__(self, detail_level: int = DEFAULT_DETAIL_LEVEL):
+        """Creates a timing context recording stages up to `detail_level` levels deep, see DEFAULT_DETAIL_LEVEL."""
+        self._lib = nvtt._lib
+        self._ptr = nvtt._lib.nvttCreateTimingContext(detail_level)
+        self._owner = None
+        if not self._ptr:
+            raise RuntimeError("Failed to create nvttTimingContext.")
+
+    @classmethod
+    def _borrow(cls, ptr, owner) -> "TimingContext":
+        """Wraps a timing context owned by another object (e.g. a Context), without taking ownership."""
+        tc: TimingContext = cls.__new__(cls)
+        tc._lib = nvtt._lib
+        tc._ptr = ptr
+        tc._owner = owner
+        return tc
+
+    def __del__(self):
+        """Destructor."""
+        self.close()
+
+    def __enter__(self) -> "TimingContext":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Frees the native timing context now instead of on garbage collection. A borrowed one is only released."""
+        handle = getattr(self, "_handle", None)
+        if handle:
+            self._handle = None
+            if getattr(self, "_owner", None) is None:
+                self._lib.nvttDestroyTimingContext(handle)
+
+    @property
+    def closed(self) -> bool:
+        """Returns whether the timing context, or the Context owning it, has been freed."""
+        return not self._ptr
+
+    @property
+    def _ptr(self):
+        """Returns the native timing context pointer, or None once it or the Context owning it has been freed."""
+        owner = getattr(self, "_owner", None)
+        if owner is not None and owner.closed:
+            return None
+        return getattr(self, "_handle", None)
+
+    @_ptr.setter
+    def _ptr(self, value) -> None:
+        self._handle = value
+
+    def __len__(self) -> int:
+        """Returns the number of records."""
+        if not self._ptr:
+            raise RuntimeError("Timing context has already been destroyed or not initialized.")
+        return self._lib.nvttTimingContextGetRecordCount(self._ptr)
+
+    def set_detail_level(self, detail_level: int) -> None:
+        """Set the number of nested stages to record, see DEFAULT_DETAIL_LEVEL."""
+        if not self._ptr:
+            raise RuntimeError("Timing context has already been destroyed or not initialized.")
+        self._lib.nvttTimingContextSetDetailLevel(self._ptr, detail_level)
+
+    def record(self, i: int) -> tuple[str, float]:
+        """Returns the (stage, seconds) pair of the i-th record."""
+        if not self._ptr:
+            raise RuntimeError("Timing context has already been destroyed or not initialized.")
+        description = ctypes.create_string_buffer(DESCRIPTION_SIZE)
+        seconds = ctypes.c_double(0.0)
+        self._lib.nvttTimingContextGetRecordSafe(self._ptr, i, description, DESCRIPTION_SIZE, ctypes.byref(seconds))
+        return description.value.decode("utf-8", errors="replace").strip(), seconds.value
+
+    @property
+    def records(self) -> list[tuple[str, float]]:
+        """Returns every (stage, seconds) record, in the order they were recorded."""
+        return [self.record(i) for i in range(len(self))]
+
+    def as_dict(self) -> dict[str, float]:
+        """Returns the total seconds spent per stage."""
+        totals: dict[str, float] = {}
+        for stage, seconds in self.records:
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def print_records(self) -> None:
+        """Prints every record to stdout."""
+        if not self._ptr:
+            raise RuntimeError("Timing context has already been destroyed or not initialized.")
+        self._lib.nvttTimingContextPrintRecords(self._ptr)
@@ -0,0 +1,211 @@
+from ..surface import Surface
+from ..compression import CompressionOptions
+from ..output import OutputOptions
+from ..context import Context
+from ..enums import Filters, Format, Quality
+from ..core import nvtt
+from .cache import write_atomic
+from .manifest import file_hash
+from dataclasses import dataclass
+from pathlib import Path
+import ctypes
+import hashlib
+import json
+import math
+import threading
+
+QUALITY_LADDER: tuple[Quality, ...] = (Quality.Fastest, Quality.Normal, Quality.Production, Quality.Highest)
+DEFAULT_MIN_PSNR: float = 40.0
+DECISIONS_VERSION: int = 1
+
+# Channels each format stores, the others are ignored when measuring the error. Formats not listed store RGBA.
+FORMAT_CHANNELS: dict[Format, tuple[int, ...]] = {
+    Format.BC1: (0, 1, 2),
+    Format.DXT1n: (0, 1, 2),
+    Format.CTX1: (0, 1),
+    Format.BC4: (0,),
+    Format.BC4S: (0,),
+    Format.ATI2: (0, 1),
+    Format.BC5: (0, 1),
+    Format.BC5S: (0, 1),
+    Format.BC6U: (0, 1, 2),
+    Format.BC6S: (0, 1, 2),
+}
+
+
+def psnr(rmse: float) -> float:
+    """Returns the PSNR in dB of an RMS error over [0, 1] values."""
+    return math.inf if rmse <= 0.0 else -20.0 * math.log10(rmse)
+
+
+def measure_error(reference: Surface, data, format: Format) -> float:
+    """
+    Decodes the DDS `data` and returns its RMS error against `reference`, the surface it was compressed from.
+
+    Only the channels `format` stores are compared. The result is the larger of the alpha error and of NVTT's
+    alpha-weighted color error, averaged over the stored color channels.
+    """
+    decoded: Surface = Surface()
+    if not decoded.load_from_memory(data):
+        raise RuntimeError("Failed to decode the compressed data.")
+    if (decoded.width, decoded.height, decoded.depth) != (reference.width, reference.height, reference.depth):
+        raise ValueError("The compressed data does not have the size of the reference surface.")
+    channels: tuple[int, ...] = FORMAT_CHANNELS.get(Format(format), (0, 1, 2, 3))
+    size: int = reference.width * reference.height * reference.depth * 4
+    for channel in range(4):
+        if channel not in channels:
+            # Channels the format does not store are made equal, so they do not count.
+            ctypes.memmove(nvtt._lib.nvttSurfaceChannel(decoded._ptr, channel),
+                           nvtt._lib.nvttSurfaceChannel(reference._ptr, channel), size)
+    # nvttRmsError sums the squared errors of R, G and B.
+    color_channels: int = len([channel for channel in channels if channel < 3])
+    return max(decoded.rms_error(reference) / math.sqrt(color_channels), decoded.rms_alpha_error(reference))
+
+
+@dataclass
+class QualityDecision:
+    """Quality picked for one texture, and the error measured with it."""
+    quality: Quality
+    rmse: float | None = None
+    trials: int = 0
+
+    @property
+    def psnr(self) -> float | None:
+        """Returns the PSNR in dB, None if the decision was reused without measuring."""
+        return None if self.rmse is None else psnr(self.rmse)
+
+    @property
+    def reused(self) -> bool:
+        """Returns whether the decision came from a QualityDecisions file instead of trial encodes."""
+        return self.trials == 0
+
+
+class QualityDecisions:
+    """Records the quality picked per texture, so later builds can skip the trial encodes."""
+
+    def __init__(self, path: Path | str):
+        """Loads the decisions at `path`, or starts with none if it does not exist."""
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, object]] = {}
+        if self._path.exists():
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            if data.get("decisions_version") == DECISIONS_VERSION:
+                self._entries = data.get("decisions", {})
+
+    @property
+    def path(self) -> Path:
+        """Get the decisions file path."""
+        return self._path
+
+    def __len__(self) -> int:
+        """Returns the number of recorded decisions."""
+        return len(self._entries)
+
+    def get(self, key: str) -> Quality | None:
+        """Returns the quality recorded for `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return None if entry is None else Quality[str(entry["quality"])]
+
+    def record(self, key: str, decision: QualityDecision) -> None:
+        """Records the quality picked for `key`."""
+        with self._lock:
+            self._entries[key] = {"quality": decision.quality.name, "rmse": decision.rmse}
+
+    def save(self) -> None:
+        """Writes the decisions atomically."""
+        with self._lock:
+            data = {"decisions_version": DECISIONS_VERSION, "decisions": self._entries}
+            text: str = json.dumps(data, indent=1, sort_keys=True)
+        write_atomic(self._path, text.encode("utf-8"))
+
+
+class AdaptiveQuality:
+    """
+    Picks the cheapest quality meeting an error threshold, per texture.
+
+    Each texture is encoded with the qualities of `qualities` in order, starting with Quality.Fastest, until its
+    error against the source meets `min_psnr` (dB) and/or `max_rmse`; the last quality is used if none does.
+    With `decisions`, the picked quality is recorded per source and options, and reused without trial encodes.
+    Instances hold no per-texture state and can be shared by threads.
+    """
+
+    def __init__(self,
+                 min_psnr: float | None = DEFAULT_MIN_PSNR,
+                 max_rmse: float | None = None,
+                 qualities: tuple[Quality, ...] = QUALITY_LADDER,
+                 decisions: QualityDecisions | Path | str | None = None,
+                 ):
+        if min_psnr is None and max_rmse is None:
+            raise ValueError("At least one of min_psnr and max_rmse is required.")
+        if not qualities:
+            raise ValueError("qualities must not be empty.")
+        self._min_psnr = min_psnr
+        self._max_rmse = max_rmse
+        self._qualities: tuple[Quality, ...] = tuple(Quality(q) for q in qualities)
+        if decisions is not None and not isinstance(decisions, QualityDecisions):
+            decisions = QualityDecisions(decisions)
+        self._decisions: QualityDecisions | None = decisions
+
+    @property
+    def decisions(self) -> QualityDecisions | None:
+        """Get the recorded decisions."""
+        return self._decisions
+
+    @property
+    def params(self) -> dict[str, object]:
+        """Returns the thresholds and qualities, to be included in cache or manifest keys."""
+        return {"min_psnr": self._min_psnr, "max_rmse": self._max_rmse, "qualities": [q.name for q in self._qualities]}
+
+    def accepts(self, rmse: float) -> bool:
+        """Returns whether an RMS error meets the thresholds."""
+        if self._max_rmse is not None and rmse > self._max_rmse:
+            return False
+        return self._min_psnr is None or psnr(rmse) >= self._min_psnr
+
+    def key(self, source: str, co: CompressionOptions, oo: OutputOptions | None = None, **params) -> str:
+        """Returns the decision key of a source identifier (e.g. a content hash) with every option but the quality."""
+        settings: dict[str, object] = {
+            "version": nvtt.version,
+            "source": source,
+            "compression": {k: v for k, v in co.settings.items() if k != "quality"},
+            "output": oo.settings if oo is not None else {},
+            "adaptive": self.params,
+            "params": {k: int(v) if isinstance(v, (bool, int)) else v for k, v in params.items()},
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+    def compress_to_bytes(self, ctx: Context, surface: Surface, co: CompressionOptions, oo: OutputOptions | None = None, source: str | None = None, min_level: int = 1, mipmap_filter: Filters = Filters.MITCHELL, do_mips: bool = True) -> tuple[bytes, QualityDecision]:
+        """
+        Variant of Context.compress_to_bytes() picking the quality, which is left set on `co`.
+
+        `source` identifies the texture in the recorded decisions (e.g. a content hash), nothing is recorded without it.
+        `surface` is left untouched.
+        """
+        key: str | None = None
+        if self._decisions is not None and source is not None:
+            key = self.key(source, co, oo, min_level=min_level, mipmap_filter=mipmap_filter, do_mips=do_mips)
+            quality: Quality | None = self._decisions.get(key)
+            if quality is not None:
+                co.quality(quality)
+                return ctx.compress_to_bytes(surface.clone(), co, oo, 0, min_level, mipmap_filter, do_mips), QualityDecision(quality)
+        format: Format = Format(co.settings.get("format", Format.DXT1))
+        decision: QualityDecision | None = None
+        data: bytes = b""
+        for quality in self._qualities:
+            co.quality(quality)
+            # The trial encodes the whole chain, so the first acceptable one is kept as the output.
+            data = ctx.compress_to_bytes(surface.clone(), co, oo, 0, min_level, mipmap_filter, do_mips)
+            decision = QualityDecision(quality, measure_error(surface, data, format), (decision.trials if decision else 0) + 1)
+            if self.accepts(decision.rmse):
+                break
+        if key is not None:
+            self._decisions.record(key, decision)
+        return data, decision
+
+    def convert_file(self, ctx: Context, source: Path | str, output: Path | str, co: CompressionOptions, oo: OutputOptions | None = None, min_level: int = 1, mipmap_filter: Filters = Filters.MITCHELL, do_mips: bool = True) -> QualityDecision:
+        """Converts the `source` image file to a DDS `output`, recording the decision by the source's content hash."""
+        data, decision = self.compress_to_bytes(ctx, Surface(str(source)), co, oo, file_hash(source), min_level, mipmap_filter, do_mips)
+        write_atomic(output, data)
+        return decision
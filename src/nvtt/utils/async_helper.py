@@ -0,0 +1,60 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+import functools
+import os
+import threading
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_max_workers: int = os.cpu_count() or 1
+
+
+def set_max_workers(max_workers: int) -> None:
+    """
+    Set how many native calls the async API runs at once.
+
+    Calls already running keep their thread, new calls go to a new executor.
+    """
+    global _executor, _max_workers
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+    with _lock:
+        _max_workers = max_workers
+        old, _executor = _executor, None
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def get_max_workers() -> int:
+    """Get how many native calls the async API runs at once."""
+    return _max_workers
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Returns the bounded executor native calls of the async API run on, creating it if needed."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="nvtt")
+        return _executor
+
+
+async def run_blocking(func: Callable, *args, cancel_event: threading.Event | None = None, on_submit: Callable[[Future], None] | None = None, **kwargs):
+    """
+    Runs `func(*args, **kwargs)` on the bounded executor and awaits its result.
+
+    Cancelling the awaiting task drops the call if it has not started yet; otherwise the native call cannot
+    be interrupted, `cancel_event` is set so `func` can stop at its next checkpoint, and its result is discarded.
+    `on_submit` receives the executor's Future, which completes only once `func` has returned, even when cancelled.
+    """
+    # Imported here, asyncio takes longer to import than the rest of the package.
+    import asyncio
+    future: Future = get_executor().submit(functools.partial(func, *args, **kwargs))
+    if on_submit is not None:
+        on_submit(future)
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        if cancel_event is not None:
+            cancel_event.set()
+        raise
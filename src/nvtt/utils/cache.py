@@ -0,0 +1,209 @@
+from ..surface import Surface
+from ..compression import CompressionOptions
+from ..output import OutputOptions
+from ..context import Context
+from ..enums import Filters
+from ..core import nvtt
+from contextlib import contextmanager
+from pathlib import Path
+import ctypes
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+if sys.platform.startswith("win"):
+    import msvcrt
+else:
+    import fcntl
+
+CACHE_EXT: str = ".dds"
+
+
+class ConversionCache:
+    """
+    Content-addressed on-disk cache of compressed DDS data with size-bounded LRU eviction.
+
+    Entries are keyed by a hash of the source (file bytes or surface data), the canonical
+    CompressionOptions/OutputOptions settings and NVTT's version. Several processes can share the
+    same directory: entries are written atomically and eviction runs under a file lock.
+    """
+
+    def __init__(self, directory: Path | str, max_bytes: int = 1 << 30):
+        """Opens (or creates) a cache in `directory`, evicting the least recently used entries above `max_bytes`."""
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_bytes: int = max_bytes
+        # Approximate size, only this process' writes are counted between two full scans.
+        self._size: int = self.size
+
+    @property
+    def directory(self) -> Path:
+        """Get the cache directory."""
+        return self._dir
+
+    @property
+    def max_bytes(self) -> int:
+        """Get the maximum size of the cache in bytes."""
+        return self._max_bytes
+
+    @property
+    def size(self) -> int:
+        """Returns the current size of every cached entry in bytes."""
+        return sum(size for _, _, size in self._entries())
+
+    def key(self, source: bytes | Surface, co: CompressionOptions, oo: OutputOptions | None = None, **params) -> str:
+        """
+        Returns the cache key of converting `source` (encoded image bytes or a Surface) with the given options.
+
+        Extra keyword arguments (mipmap filter, minimum level...) are part of the key as well.
+        """
+        h = hashlib.sha256()
+        if isinstance(source, Surface):
+            _hash_surface(h, source)
+        else:
+            h.update(b"bytes")
+            h.update(memoryview(source))
+        h.update(options_key(co, oo, **params).encode("utf-8"))
+        return h.hexdigest()
+
+    def path(self, key: str) -> Path:
+        """Returns the path of an entry."""
+        return self._dir / key[:2] / (key + CACHE_EXT)
+
+    def get(self, key: str) -> bytes | None:
+        """Returns the cached data for `key`, or None on a miss."""
+        path: Path = self.path(key)
+        try:
+            data: bytes = path.read_bytes()
+            # The modification time doubles as the last access time for LRU eviction.
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def put(self, key: str, data) -> None:
+        """Stores `data` for `key`, evicting old entries if the cache grows above its maximum size."""
+        path: Path = self.path(key)
+        path.parent.mkdir(exist_ok=True)
+        write_atomic(path, data)
+        self._size += len(data)
+        if self._size > self._max_bytes:
+            self.evict()
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Removes the least recently used entries until the cache fits in `max_bytes`. Returns the freed bytes."""
+        limit: int = self._max_bytes if max_bytes is None else max_bytes
+        freed: int = 0
+        with self._lock():
+            entries = sorted(self._entries(), key=lambda entry: entry[1])
+            total: int = sum(size for _, _, size in entries)
+            for path, _, size in entries:
+                if total <= limit:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                freed += size
+            self._size = total
+        return freed
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        self.evict(0)
+
+    def compress_all(self, ctx: Context, surface: Surface, co: CompressionOptions, oo: OutputOptions | None = None, min_level: int = 1, mipmap_filter: Filters = Filters.MITCHELL, do_mips: bool = True) -> bytes:
+        """Cached variant of Context.compress_to_bytes(), keyed by the surface data."""
+        key: str = self.key(surface, co, oo, min_level=min_level, mipmap_filter=mipmap_filter, do_mips=do_mips)
+        data: bytes | None = self.get(key)
+        if data is None:
+            data = ctx.compress_to_bytes(surface, co, oo, 0, min_level, mipmap_filter, do_mips)
+            self.put(key, data)
+        return data
+
+    def convert_file(self, ctx: Context, source: Path | str, output: Path | str, co: CompressionOptions, oo: OutputOptions | None = None, min_level: int = 1, mipmap_filter: Filters = Filters.MITCHELL, do_mips: bool = True) -> bool:
+        """
+        Converts the `source` image file to a DDS `output`, keyed by the source file bytes.
+
+        Returns whether the output came from the cache.
+        """
+        source_bytes: bytes = Path(source).read_bytes()
+        key: str = self.key(source_bytes, co, oo, min_level=min_level, mipmap_filter=mipmap_filter, do_mips=do_mips)
+        data: bytes | None = self.get(key)
+        hit: bool = data is not None
+        if not hit:
+            data = ctx.compress_to_bytes(Surface(source_bytes), co, oo, 0, min_level, mipmap_filter, do_mips)
+            self.put(key, data)
+        write_atomic(output, data)
+        return hit
+
+    def _entries(self) -> list[tuple[Path, float, int]]:
+        """Lists every entry as (path, last access time, size)."""
+        entries: list[tuple[Path, float, int]] = []
+        for path in self._dir.glob("*/*" + CACHE_EXT):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, st.st_mtime, st.st_size))
+        return entries
+
+    @contextmanager
+    def _lock(self):
+        """Holds an exclusive lock on the cache directory, shared with other processes."""
+        with open(self._dir / ".lock", "a+b") as f:
+            if sys.platform.startswith("win"):
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def options_key(co: CompressionOptions, oo: OutputOptions | None = None, **params) -> str:
+    """Returns a canonical string of the effective conversion options, NVTT's version included."""
+    settings: dict[str, object] = {
+        "version": nvtt.version,
+        "compression": co.settings,
+        "output": oo.settings if oo is not None else {},
+        "params": {k: int(v) if isinstance(v, (bool, int)) else v for k, v in params.items()},
+    }
+    return json.dumps(settings, sort_keys=True, separators=(",", ":"))
+
+
+def write_atomic(path: Path | str, data) -> None:
+    """Writes `data` to `path` through a temporary file, so readers never see a partial file."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _hash_surface(h, surface: Surface) -> None:
+    """Feeds the surface's dimensions, flags and planar data into the hash `h`, without copying it."""
+    if surface.is_null:
+        raise RuntimeError("Surface is null or has not been initialized.")
+    lib = surface._lib
+    header = (surface.width, surface.height, surface.depth, int(surface.type), lib.nvttSurfaceWrapMode(surface._ptr),
+              lib.nvttSurfaceAlphaMode(surface._ptr), bool(lib.nvttSurfaceIsNormalMap(surface._ptr)))
+    h.update(b"surface")
+    h.update(repr(header).encode("utf-8"))
+    count: int = 4 * surface.width * surface.height * surface.depth
+    ptr = lib.nvttSurfaceData(surface._ptr)
+    h.update(memoryview((ctypes.c_float * count).from_address(ctypes.addressof(ptr.contents))).cast("B"))
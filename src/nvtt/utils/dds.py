@@ -0,0 +1,409 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+import mmap
+import struct
+from ..enums import Format
+
+DDS_MAGIC: bytes = b"DDS "
+# DDS header (128 bytes) plus the optional DX10 extension (20 bytes).
+HEADER_SIZE: int = 128
+MAX_HEADER_SIZE: int = 148
+
+# Magic, size, flags, height, width, pitchOrLinearSize, depth, mipMapCount, 11 reserved, then the pixel format
+# (size, flags, fourCC, rgbBitCount, 4 masks), caps, caps2, caps3, caps4 and a reserved field.
+_HEADER = struct.Struct("<4s7I44x2I4s5I4I4x")
+# dxgiFormat, resourceDimension, miscFlag, arraySize, miscFlags2.
+_DX10_HEADER = struct.Struct("<5I")
+
+DDSD_PITCH: int = 0x8
+DDSD_MIPMAPCOUNT: int = 0x20000
+DDSD_LINEARSIZE: int = 0x80000
+DDSCAPS_COMPLEX: int = 0x8
+DDSCAPS_MIPMAP: int = 0x400000
+DDPF_FOURCC: int = 0x4
+DDSCAPS2_CUBEMAP: int = 0x200
+DDSCAPS2_VOLUME: int = 0x200000
+D3D10_RESOURCE_DIMENSION_TEXTURE3D: int = 4
+D3D10_RESOURCE_MISC_TEXTURECUBE: int = 0x4
+
+FOURCC_FORMATS: dict[bytes, Format] = {
+    b"DXT1": Format.BC1,
+    b"DXT2": Format.BC2,
+    b"DXT3": Format.BC2,
+    b"DXT4": Format.BC3,
+    b"DXT5": Format.BC3,
+    b"ATI1": Format.BC4,
+    b"BC4U": Format.BC4,
+    b"BC4S": Format.BC4S,
+    b"ATI2": Format.ATI2,
+    b"BC5U": Format.BC5,
+    b"BC5S": Format.BC5S,
+}
+
+# Bits per pixel of the legacy D3DFMT codes stored as a numeric FourCC.
+D3DFMT_BITS: dict[int, int] = {
+    36: 64,  # A16B16G16R16
+    110: 64,  # Q16W16V16U16
+    111: 16,  # R16F
+    112: 32,  # G16R16F
+    113: 64,  # A16B16G16R16F
+    114: 32,  # R32F
+    115: 64,  # G32R32F
+    116: 128,  # A32B32G32R32F
+}
+
+DXGI_FORMATS: dict[int, Format] = {
+    **dict.fromkeys((70, 71, 72), Format.BC1),
+    **dict.fromkeys((73, 74, 75), Format.BC2),
+    **dict.fromkeys((76, 77, 78), Format.BC3),
+    **dict.fromkeys((79, 80), Format.BC4),
+    81: Format.BC4S,
+    **dict.fromkeys((82, 83), Format.BC5),
+    84: Format.BC5S,
+    **dict.fromkeys((94, 95), Format.BC6U),
+    96: Format.BC6S,
+    **dict.fromkeys((97, 98, 99), Format.BC7),
+    # ASTC formats come in (typeless, unorm, srgb) triples, 4 codes apart.
+    **{133 + i * 4 + j: format
+       for i, format in enumerate(f for f in Format if f.name.startswith("ASTC_")) for j in range(3)},
+}
+
+# Bits per pixel of the uncompressed DXGI formats.
+DXGI_BITS: dict[int, int] = {
+    **dict.fromkeys(range(1, 5), 128),
+    **dict.fromkeys(range(5, 9), 96),
+    **dict.fromkeys(range(9, 23), 64),
+    **dict.fromkeys(range(23, 48), 32),
+    **dict.fromkeys(range(48, 60), 16),
+    **dict.fromkeys(range(60, 66), 8),
+    66: 1,
+    67: 32,
+    **dict.fromkeys((68, 69), 16),
+    **dict.fromkeys((85, 86), 16),
+    **dict.fromkeys(range(87, 94), 32),
+    115: 16,
+}
+
+DXGI_SRGB: frozenset[int] = frozenset({29, 72, 75, 78, 91, 93, 99, *range(135, 189, 4)})
+
+# (block width, block height, bytes per block) of every block-compressed format.
+BLOCK_INFO: dict[Format, tuple[int, int, int]] = {
+    Format.BC1: (4, 4, 8),
+    Format.BC1a: (4, 4, 8),
+    Format.DXT1n: (4, 4, 8),
+    Format.CTX1: (4, 4, 8),
+    Format.BC4: (4, 4, 8),
+    Format.BC4S: (4, 4, 8),
+    Format.BC2: (4, 4, 16),
+    Format.BC3: (4, 4, 16),
+    Format.BC3n: (4, 4, 16),
+    Format.BC3_RGBM: (4, 4, 16),
+    Format.ATI2: (4, 4, 16),
+    Format.BC5: (4, 4, 16),
+    Format.BC5S: (4, 4, 16),
+    Format.BC6U: (4, 4, 16),
+    Format.BC6S: (4, 4, 16),
+    Format.BC7: (4, 4, 16),
+    **{
+        format: (int(format.name.split("_")[-1].split("x")[0]), int(format.name.split("x")[-1]), 16)
+        for format in Format if format.name.startswith("ASTC_")
+    },
+}
+
+
+def block_info(format: Format) -> tuple[int, int, int]:
+    """Returns the (block width, block height, bytes per block) of a block-compressed format."""
+    try:
+        return BLOCK_INFO[Format(format)]
+    except KeyError:
+        raise ValueError(f"{Format(format).name} is not a block-compressed format.") from None
+
+
+def mip_extent(extent: int, level: int) -> int:
+    """Returns the size of a texture dimension at a mipmap level."""
+    return max(1, extent >> level)
+
+
+def count_mipmaps(width: int, height: int, depth: int = 1, min_size: int = 1) -> int:
+    """Returns the number of mipmap levels of a full chain, like Surface.count_mipmaps."""
+    count: int = 1
+    while (width > 1 or height > 1 or depth > 1) if min_size == 1 else \
+            ((width > min_size and height > min_size) or depth > min_size):
+        width, height, depth = max(1, width // 2), max(1, height // 2), max(1, depth // 2)
+        count += 1
+    return count
+
+
+def level_size(format: Format, width: int, height: int, depth: int = 1) -> int:
+    """Returns the size in bytes of one mipmap level of a block-compressed format."""
+    block_width, block_height, block_bytes = block_info(format)
+    return -(-width // block_width) * -(-height // block_height) * depth * block_bytes
+
+
+@dataclass
+class DDSInfo:
+    """Description of a DDS file, read from its header only."""
+    width: int
+    height: int
+    depth: int
+    mipmap_count: int
+    format: Format | None
+    fourcc: str | None = None
+    dxgi_format: int | None = None
+    bits_per_pixel: int = 0
+    srgb: bool = False
+    is_cube: bool = False
+    is_volume: bool = False
+    array_size: int = 1
+    header_size: int = HEADER_SIZE
+    level_sizes: list[int] = field(default_factory=list)
+
+    @property
+    def face_count(self) -> int:
+        """Returns the number of faces of each array slice, 6 for cube maps."""
+        return 6 if self.is_cube else 1
+
+    @property
+    def image_size(self) -> int:
+        """Returns the size in bytes of the mipmap chain of one face or array slice."""
+        return sum(self.level_sizes)
+
+    @property
+    def data_size(self) -> int:
+        """Returns the size in bytes of the data following the header."""
+        return self.image_size * self.face_count * self.array_size
+
+    @property
+    def mip_offsets(self) -> list[int]:
+        """Returns the file offset of every mipmap level of the first face."""
+        return [self.mip_offset(level) for level in range(self.mipmap_count)]
+
+    def mip_offset(self, level: int, face: int = 0, index: int = 0) -> int:
+        """Returns the file offset of a mipmap level of a face of an array slice (faces are stored face-major, mips inside)."""
+        if not self.level_sizes:
+            raise ValueError("Mipmap offsets are unknown for this format.")
+        if not 0 <= level < self.mipmap_count or not 0 <= face < self.face_count or not 0 <= index < self.array_size:
+            raise IndexError(f"No mipmap level {level} of face {face} of array slice {index}.")
+        return (self.header_size + (index * self.face_count + face) * self.image_size
+                + sum(self.level_sizes[:level]))
+
+    def mip_size(self, level: int) -> int:
+        """Returns the size in bytes of a mipmap level of one face or array slice."""
+        if not self.level_sizes:
+            raise ValueError("Mipmap sizes are unknown for this format.")
+        return self.level_sizes[level]
+
+
+def parse_header(data) -> DDSInfo:
+    """Parses the header at the start of `data`, which needs at most MAX_HEADER_SIZE bytes."""
+    data = bytes(memoryview(data)[:MAX_HEADER_SIZE])
+    if len(data) < HEADER_SIZE or data[:4] != DDS_MAGIC:
+        raise ValueError("Not a DDS file.")
+    (_, size, _, height, width, _, depth, mipmap_count,
+     pf_size, pf_flags, fourcc, bit_count, _, _, _, _, _, caps2, _, _) = _HEADER.unpack_from(data)
+    if size != 124 or pf_size != 32:
+        raise ValueError("Invalid DDS header.")
+    info: DDSInfo = DDSInfo(width, height, max(1, depth), max(1, mipmap_count), None)
+    info.is_cube = bool(caps2 & DDSCAPS2_CUBEMAP)
+    info.is_volume = bool(caps2 & DDSCAPS2_VOLUME)
+    if not info.is_volume:
+        info.depth = 1
+    if pf_flags & DDPF_FOURCC:
+        info.fourcc = fourcc.decode("latin-1")
+        if fourcc == b"DX10":
+            if len(data) < MAX_HEADER_SIZE:
+                raise ValueError("Truncated DX10 header.")
+            dxgi_format, dimension, misc_flag, array_size, _ = _DX10_HEADER.unpack_from(data, HEADER_SIZE)
+            info.header_size = MAX_HEADER_SIZE
+            info.dxgi_format = dxgi_format
+            info.format = DXGI_FORMATS.get(dxgi_format)
+            info.bits_per_pixel = DXGI_BITS.get(dxgi_format, 0)
+            info.srgb = dxgi_format in DXGI_SRGB
+            info.is_cube = bool(misc_flag & D3D10_RESOURCE_MISC_TEXTURECUBE)
+            info.is_volume = dimension == D3D10_RESOURCE_DIMENSION_TEXTURE3D
+            info.depth = max(1, depth) if info.is_volume else 1
+            info.array_size = max(1, array_size)
+        else:
+            info.format = FOURCC_FORMATS.get(fourcc)
+            info.bits_per_pixel = D3DFMT_BITS.get(int.from_bytes(fourcc, "little"), 0)
+            if info.bits_per_pixel:
+                info.format = Format.RGB
+    else:
+        info.format = Format.RGB
+        info.bits_per_pixel = bit_count
+    if info.format is None and info.bits_per_pixel:
+        info.format = Format.RGB
+    info.level_sizes = _level_sizes(info)
+    return info
+
+
+def _level_sizes(info: DDSInfo) -> list[int]:
+    """Returns the size of every mipmap level of one face or array slice, or an empty list if the format is unknown."""
+    sizes: list[int] = []
+    for level in range(info.mipmap_count):
+        width, height = mip_extent(info.width, level), mip_extent(info.height, level)
+        depth: int = mip_extent(info.depth, level)
+        if info.format in BLOCK_INFO:
+            sizes.append(level_size(info.format, width, height, depth))
+        elif info.bits_per_pixel:
+            sizes.append((width * info.bits_per_pixel + 7) // 8 * height * depth)
+        else:
+            return []
+    return sizes
+
+
+def set_array_size(header: bytearray, array_size: int) -> None:
+    """Sets the array size of a DX10 `header`, which NVTT's C API always writes as 1."""
+    if len(header) < MAX_HEADER_SIZE or header[84:88] != b"DX10":
+        raise ValueError("Texture arrays require the DX10 container.")
+    struct.pack_into("<I", header, HEADER_SIZE + 12, array_size)
+
+
+def read_header(file: str | Path) -> DDSInfo:
+    """Reads the DDS header of a file, without reading its data."""
+    with open(file, "rb") as f:
+        return parse_header(f.read(MAX_HEADER_SIZE))
+
+
+class MappedDDS:
+    """
+    DDS file mapped in memory, giving zero-copy views over its mipmap levels, faces and array slices.
+
+    Views returned by mip() and image() must be released before close().
+    """
+
+    def __init__(self, file: str | Path):
+        self._path = Path(file)
+        with open(file, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._info: DDSInfo = parse_header(self._map[:MAX_HEADER_SIZE])
+            if not self._info.level_sizes:
+                raise ValueError(f"{file} has an unsupported format.")
+            if len(self._map) < self._info.header_size + self._info.data_size:
+                raise ValueError(f"{file} is truncated.")
+        except BaseException:
+            self._map.close()
+            raise
+        self._view = memoryview(self._map)
+
+    def __enter__(self) -> "MappedDDS":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def info(self) -> DDSInfo:
+        """Returns the parsed header."""
+        return self._info
+
+    @property
+    def header(self) -> memoryview:
+        """Returns a view over the header bytes."""
+        return self._view[:self._info.header_size]
+
+    def mip(self, level: int, face: int = 0, index: int = 0) -> memoryview:
+        """Returns a view over a mipmap level of a face of an array slice."""
+        if self._view is None:
+            raise RuntimeError("DDS file has already been closed.")
+        offset: int = self._info.mip_offset(level, face, index)
+        return self._view[offset:offset + self._info.mip_size(level)]
+
+    def image(self, face: int = 0, index: int = 0) -> memoryview:
+        """Returns a view over the whole mipmap chain of a face of an array slice."""
+        if self._view is None:
+            raise RuntimeError("DDS file has already been closed.")
+        offset: int = self._info.mip_offset(0, face, index)
+        return self._view[offset:offset + self._info.image_size]
+
+    def write_truncated(self, output: str | Path, first_level: int = 0, mipmap_count: int | None = None) -> DDSInfo:
+        """
+        Writes a DDS keeping only `mipmap_count` levels from `first_level` on (e.g. first_level=2 drops the top two mips).
+
+        Only the header is rewritten, the level data is copied as-is. Returns the description of the new file.
+        """
+        info: DDSInfo = self._info
+        if not 0 <= first_level < info.mipmap_count:
+            raise ValueError(f"first_level must be between 0 and {info.mipmap_count - 1}.")
+        last_level: int = info.mipmap_count if mipmap_count is None else min(info.mipmap_count, first_level + mipmap_count)
+        if last_level <= first_level:
+            raise ValueError("mipmap_count must be at least 1.")
+        header = bytearray(self.header)
+        _patch_header(header, info, first_level, last_level - first_level)
+        with open(output, "wb") as f:
+            f.write(header)
+            for index in range(info.array_size):
+                for face in range(info.face_count):
+                    start: int = info.mip_offset(first_level, face, index)
+                    end: int = info.mip_offset(last_level - 1, face, index) + info.mip_size(last_level - 1)
+                    f.write(self._view[start:end])
+        return parse_header(header)
+
+    def close(self) -> None:
+        """Unmaps the file."""
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+            self._map.close()
+
+
+def _patch_header(header: bytearray, info: DDSInfo, first_level: int, mipmap_count: int) -> None:
+    """Rewrites the dimensions, pitch and mipmap fields of `header` for a chain starting at `first_level`."""
+    width, height = mip_extent(info.width, first_level), mip_extent(info.height, first_level)
+    depth: int = mip_extent(info.depth, first_level)
+    flags: int = struct.unpack_from("<I", header, 8)[0] & ~(DDSD_PITCH | DDSD_LINEARSIZE | DDSD_MIPMAPCOUNT)
+    if info.format in BLOCK_INFO:
+        flags |= DDSD_LINEARSIZE
+        pitch: int = level_size(info.format, width, height)
+    else:
+        flags |= DDSD_PITCH
+        pitch = (width * info.bits_per_pixel + 7) // 8
+    caps: int = struct.unpack_from("<I", header, 108)[0]
+    if mipmap_count > 1:
+        flags |= DDSD_MIPMAPCOUNT
+        caps |= DDSCAPS_COMPLEX | DDSCAPS_MIPMAP
+    else:
+        caps &= ~DDSCAPS_MIPMAP
+    struct.pack_into("<4I", header, 8, flags, height, width, pitch)
+    if info.is_volume:
+        struct.pack_into("<I", header, 24, depth)
+    struct.pack_into("<I", header, 28, mipmap_count)
+    struct.pack_into("<I", header, 108, caps)
+
+
+@dataclass
+class IndexEntry:
+    """Header of one file found by index_directory()."""
+    path: Path
+    info: DDSInfo | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Returns whether the header could be read."""
+        return self.error is None
+
+
+def _index_file(path: Path) -> IndexEntry:
+    """Reads the header of a single file for index_directory()."""
+    try:
+        return IndexEntry(path, read_header(path))
+    except (OSError, ValueError) as e:
+        return IndexEntry(path, error=str(e))
+
+
+def index_directory(root: Path | str, pattern: str = "*.dds", recursive: bool = True, workers: int | None = None) -> list[IndexEntry]:
+    """
+    Reads the header of every DDS file matching `pattern` under `root`, sorted by path.
+
+    Only the first MAX_HEADER_SIZE bytes of each file are read. With `workers` other than 1 the reads run on
+    a thread pool (`None` uses the ThreadPoolExecutor default), which mostly helps on network and cold disks.
+    """
+    root = Path(root)
+    paths: list[Path] = sorted(p for p in (root.rglob(pattern) if recursive else root.glob(pattern)) if p.is_file())
+    if workers == 1:
+        return [_index_file(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_index_file, paths))
@@ -1,9 +1,79 @@
 from ..surface import Surface
+from ..pool import SurfacePool
 from ..compression import CompressionOptions
 from ..output import OutputOptions
 from ..enums import Format, Quality
 from ..context import Context
+from .cache import ConversionCache, options_key
+from .manifest import BuildManifest
+from .adaptive import AdaptiveQuality
+from .scheduler import MemoryBudgetScheduler, estimate_file_peak_bytes
+from .async_helper import run_blocking
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+import os
+import threading
+import time
+
+
+@dataclass
+class ConversionResult:
+    """Outcome of a single file conversion."""
+    source: Path
+    output: Path
+    seconds: float
+    error: str | None = None
+    skipped: bool = False
+    quality: Quality | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Returns whether the conversion succeeded."""
+        return self.error is None
+
+
+class _Worker:
+    """Long-lived Context and options set used by a single conversion thread."""
+    def __init__(self, format: Format, quality: Quality, use_cuda: bool, cache: ConversionCache | None = None, adaptive: AdaptiveQuality | None = None, surfaces: SurfacePool | None = None):
+        self.cache: ConversionCache | None = cache
+        self.surfaces: SurfacePool = surfaces or SurfacePool(1)
+        self.adaptive: AdaptiveQuality | None = adaptive
+        self.co: CompressionOptions = CompressionOptions()
+        self.co.format(format)
+        self.co.quality(quality)
+        self.oo: OutputOptions = OutputOptions()
+        self.ctx: Context = Context()
+        self.ctx.enable_cuda_acceleration(use_cuda)
+
+    def convert(self, source: Path, output: Path) -> ConversionResult:
+        """Convert `source` to `output`, returning the timing and error if any."""
+        start: float = time.perf_counter()
+        try:
+            if self.adaptive is not None:
+                decision = self.adaptive.convert_file(self.ctx, source, output, self.co)
+                return ConversionResult(source, output, time.perf_counter() - start, quality=decision.quality)
+            if self.cache is not None:
+                self.cache.convert_file(self.ctx, source, output, self.co)
+            else:
+                with self.surfaces.borrow() as surf:
+                    if not surf.load(str(source)):
+                        raise RuntimeError(f"Failed to load image from file: {source}")
+                    self.oo.filename(str(output))
+                    try:
+                        self.ctx.compress_all(surf, self.co, self.oo)
+                    finally:
+                        self.oo.close_file()
+        except Exception as e:
+            return ConversionResult(source, output, time.perf_counter() - start, str(e))
+        return ConversionResult(source, output, time.perf_counter() - start)
+
+    def close(self) -> None:
+        """Frees the native objects."""
+        self.ctx.close()
+        self.co.close()
+        self.oo.close()
+
 
 class EasyDDS:
     """A class to quickly convert an image to a DDS format."""
@@ -13,27 +83,117 @@ class EasyDDS:
             raise FileNotFoundError(f"Path '{p}' does not exist.")
         self._img_path = str(p.resolve())
         self._img_ext = p.suffix.lower()
-        
+
     @property
     def img_path(self) -> str:
         """Get the image path."""
         return self._img_path
-    
+
     @property
     def img_ext(self) -> str:
         """Get the image extension."""
         return self._img_ext
-    
+
     @staticmethod
-    def convert_img(path: Path | str, use_cuda: bool = False) -> None:
-        """Static method to convert an image to DDS format."""
+    def convert_img(path: Path | str, use_cuda: bool = False, cache: ConversionCache | None = None) -> None:
+        """Static method to convert an image to DDS format. With a `cache`, unchanged images are not re-encoded."""
         inst = EasyDDS(path)
-        surf: Surface = Surface(inst.img_path)
         co: CompressionOptions = CompressionOptions()
         co.format(Format.DXT1)
         co.quality(Quality.Normal)
-        oo: OutputOptions = OutputOptions()
-        oo.filename(inst.img_path.replace(inst.img_ext, ".dds"))
         ctx: Context = Context()
         ctx.enable_cuda_acceleration(use_cuda)
-        ctx.compress_all(surf, co, oo)
\ No newline at end of file
+        if cache is not None:
+            cache.convert_file(ctx, inst.img_path, inst.img_path.replace(inst.img_ext, ".dds"), co)
+            return
+        surf: Surface = Surface(inst.img_path)
+        oo: OutputOptions = OutputOptions()
+        oo.filename(inst.img_path.replace(inst.img_ext, ".dds"))
+        ctx.compress_all(surf, co, oo)
+
+    @staticmethod
+    async def convert_img_async(path: Path | str, use_cuda: bool = False, cache: ConversionCache | None = None) -> None:
+        """Variant of convert_img() running on the bounded executor of the async API."""
+        await run_blocking(EasyDDS.convert_img, path, use_cuda, cache)
+
+    @staticmethod
+    def convert_tree(root: Path | str,
+                     pattern: str = "*.png",
+                     workers: int | None = None,
+                     format: Format = Format.DXT1,
+                     quality: Quality = Quality.Normal,
+                     use_cuda: bool = False,
+                     recursive: bool = True,
+                     cache: ConversionCache | None = None,
+                     manifest: BuildManifest | Path | str | None = None,
+                     adaptive: AdaptiveQuality | None = None,
+                     memory_budget: int | MemoryBudgetScheduler | None = None,
+                     ) -> list[ConversionResult]:
+        """
+        Convert every image under `root` matching `pattern` to DDS, next to its source.
+
+        Files are spread across a pool of `workers` threads (defaults to the CPU count), each one keeping
+        its own long-lived Context and options, since the native compression releases the GIL.
+        With a `cache`, unchanged images are not re-encoded.
+
+        With a `manifest` (a BuildManifest or the path of its file), the build is incremental: outputs built from
+        the same source and options are skipped, and outputs whose source was deleted are removed.
+
+        With `adaptive`, `quality` is ignored: each image gets the cheapest quality meeting its error threshold,
+        reported in the results' `quality`. `cache` is not used in that mode.
+
+        With a `memory_budget` in bytes (or a MemoryBudgetScheduler shared by several calls), images are started
+        largest first and only while the sum of their estimated peak memory, from the dimensions in their headers,
+        fits the budget.
+        """
+        root_path = Path(root)
+        if not root_path.is_dir():
+            raise NotADirectoryError(f"Path '{root_path}' is not a directory.")
+        sources: list[Path] = sorted(root_path.rglob(pattern) if recursive else root_path.glob(pattern))
+        sources = [s for s in sources if s.is_file() and s.suffix.lower() != ".dds"]
+        workers = workers or os.cpu_count() or 1
+        if manifest is not None and not isinstance(manifest, BuildManifest):
+            manifest = BuildManifest(manifest, root_path)
+        options: str = ""
+        if manifest is not None:
+            co: CompressionOptions = CompressionOptions()
+            co.format(format)
+            co.quality(quality)
+            options = options_key(co, **adaptive.params) if adaptive is not None else options_key(co)
+
+        local = threading.local()
+        # Native objects are recycled across files and freed when done, so memory stays flat over long runs.
+        surfaces: SurfacePool = SurfacePool(workers)
+        created: list[_Worker] = []
+
+        def run(source: Path) -> ConversionResult:
+            output: Path = source.with_suffix(".dds")
+            if manifest is not None and manifest.is_up_to_date(source, output, options):
+                return ConversionResult(source, output, 0.0, skipped=True)
+            worker: _Worker | None = getattr(local, "worker", None)
+            if worker is None:
+                worker = local.worker = _Worker(format, quality, use_cuda, cache, adaptive, surfaces)
+                created.append(worker)
+            result: ConversionResult = worker.convert(source, output)
+            if manifest is not None and result.ok:
+                manifest.record(source, output, options)
+            return result
+
+        try:
+            if memory_budget is not None:
+                if not isinstance(memory_budget, MemoryBudgetScheduler):
+                    memory_budget = MemoryBudgetScheduler(memory_budget, workers)
+                results: list[ConversionResult] = memory_budget.map(run, sources, lambda s: estimate_file_peak_bytes(s, format))
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(run, sources))
+        finally:
+            for worker in created:
+                worker.close()
+            surfaces.close()
+        if manifest is not None:
+            manifest.prune()
+            manifest.save()
+        if adaptive is not None and adaptive.decisions is not None:
+            adaptive.decisions.save()
+        return results
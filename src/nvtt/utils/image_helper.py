@@ -20,10 +20,59 @@ def get_bytes_from_image(image) -> bytes | None:
     buf: BytesIO = BytesIO()
     if is_pillow_img(image):
         if is_module_available("PIL"):
-            image.save(buf, format=image.format)
+            image.save(buf, format=image.format or "PNG")
     return buf.getvalue()
 
 
 def get_img_ext(image_path: str) -> str:
     """Get the file extension of the image."""
     return Path(image_path).suffix.lower() if image_path else ""
+
+
+def get_img_dimensions(image_path: Path | str) -> tuple[int, int] | None:
+    """
+    Get the (width, height) of an image file from its header, without decoding it.
+
+    PNG, JPEG, BMP, TGA and DDS headers are read directly, other formats need Pillow. Returns None if unknown.
+    """
+    with open(image_path, "rb") as f:
+        head: bytes = f.read(32)
+        if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+            return int.from_bytes(head[16:20], "big"), int.from_bytes(head[20:24], "big")
+        if head[:4] == b"DDS ":
+            return int.from_bytes(head[16:20], "little"), int.from_bytes(head[12:16], "little")
+        if head[:2] == b"BM" and len(head) >= 26:
+            return int.from_bytes(head[18:22], "little", signed=True), abs(int.from_bytes(head[22:26], "little", signed=True))
+        if head[:2] == b"\xff\xd8":
+            f.seek(2)
+            return _jpeg_dimensions(f)
+    if get_img_ext(str(image_path)) == ".tga" and len(head) >= 16:
+        return int.from_bytes(head[12:14], "little"), int.from_bytes(head[14:16], "little")
+    if is_module_available("PIL"):
+        from PIL import Image
+        try:
+            with Image.open(image_path) as img:
+                return img.size
+        except OSError:
+            return None
+    return None
+
+
+def _jpeg_dimensions(f) -> tuple[int, int] | None:
+    """Walks the JPEG segments from the current position up to the first SOF one, which holds the dimensions."""
+    while True:
+        marker: bytes = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        if marker[1] in (0x01, *range(0xD0, 0xD8)):
+            continue
+        length: bytes = f.read(2)
+        if len(length) < 2:
+            return None
+        # SOF0-SOF15, except DHT (C4), JPG (C8) and DAC (CC).
+        if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+            sof: bytes = f.read(5)
+            if len(sof) < 5:
+                return None
+            return int.from_bytes(sof[3:5], "big"), int.from_bytes(sof[1:3], "big")
+        f.seek(int.from_bytes(length, "big") - 2, 1)
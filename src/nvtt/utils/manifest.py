@@ -0,0 +1,115 @@
+from .cache import write_atomic
+from pathlib import Path
+import hashlib
+import json
+import threading
+
+MANIFEST_VERSION: int = 1
+
+
+def file_hash(path: Path | str) -> str:
+    """Returns the SHA-256 of a file."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class BuildManifest:
+    """
+    Records, per output, the source mtime/size/hash and the options it was built with.
+
+    Used for incremental rebuilds: up to date outputs are skipped and outputs whose source is gone are removed.
+    Paths are stored relative to `root`, so the tree can be moved along with its manifest.
+    """
+
+    def __init__(self, path: Path | str, root: Path | str):
+        """Loads the manifest at `path`, or starts an empty one if it does not exist."""
+        self._path = Path(path)
+        self._root = Path(root).resolve()
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, object]] = {}
+        if self._path.exists():
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            if data.get("manifest_version") == MANIFEST_VERSION:
+                self._entries = data.get("outputs", {})
+
+    @property
+    def path(self) -> Path:
+        """Get the manifest path."""
+        return self._path
+
+    @property
+    def root(self) -> Path:
+        """Get the root the recorded paths are relative to."""
+        return self._root
+
+    def __len__(self) -> int:
+        """Returns the number of recorded outputs."""
+        return len(self._entries)
+
+    def is_up_to_date(self, source: Path, output: Path, options: str) -> bool:
+        """
+        Returns whether `output` was built from the current `source` with the same `options`.
+
+        The source is only hashed when its mtime or size changed, a matching hash refreshes the entry.
+        """
+        with self._lock:
+            entry = self._entries.get(self._rel(output))
+        if entry is None or entry["source"] != self._rel(source) or entry["options"] != options:
+            return False
+        if not output.exists():
+            return False
+        st = source.stat()
+        if entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return True
+        if entry["size"] != st.st_size or entry["hash"] != file_hash(source):
+            return False
+        with self._lock:
+            entry["mtime_ns"] = st.st_mtime_ns
+        return True
+
+    def record(self, source: Path, output: Path, options: str) -> None:
+        """Records that `output` has just been built from `source` with `options`."""
+        st = source.stat()
+        entry: dict[str, object] = {
+            "source": self._rel(source),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "hash": file_hash(source),
+            "options": options,
+        }
+        with self._lock:
+            self._entries[self._rel(output)] = entry
+
+    def prune(self, outputs: set[Path] | None = None) -> list[Path]:
+        """
+        Removes the outputs whose source no longer exists, or that are not in `outputs` when given.
+
+        Returns the removed output paths.
+        """
+        keep: set[str] | None = {self._rel(o) for o in outputs} if outputs is not None else None
+        removed: list[Path] = []
+        with self._lock:
+            for rel_output, entry in list(self._entries.items()):
+                stale: bool = not (self._root / str(entry["source"])).exists()
+                if keep is not None and rel_output not in keep:
+                    stale = True
+                if stale:
+                    output: Path = self._root / rel_output
+                    output.unlink(missing_ok=True)
+                    del self._entries[rel_output]
+                    removed.append(output)
+        return removed
+
+    def save(self) -> None:
+        """Writes the manifest atomically."""
+        with self._lock:
+            data = {"manifest_version": MANIFEST_VERSION, "outputs": self._entries}
+            text: str = json.dumps(data, indent=1, sort_keys=True)
+        write_atomic(self._path, text.encode("utf-8"))
+
+    def _rel(self, path: Path) -> str:
+        """Returns `path` relative to the root, with forward slashes."""
+        return Path(path).resolve().relative_to(self._root).as_posix()
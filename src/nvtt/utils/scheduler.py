@@ -0,0 +1,119 @@
+from ..enums import Format
+from .dds import BLOCK_INFO, count_mipmaps, level_size, mip_extent
+from .image_helper import get_img_dimensions
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, TypeVar
+import bisect
+import math
+import os
+import threading
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Bytes per pixel of a Surface (planar float32 RGBA), and of the 8-bit image NVTT decodes the file into.
+SURFACE_PIXEL_SIZE: int = 16
+DECODED_PIXEL_SIZE: int = 4
+
+
+def estimate_peak_bytes(width: int, height: int, format: Format, do_mips: bool = True) -> int:
+    """
+    Estimates the peak memory of converting a `width` x `height` image to `format`.
+
+    Counts the decoded 8-bit image, the float32 Surface at its largest level (each mipmap replaces the previous
+    one in place) and the compressed output of every level, like Context.estimate_size() (4 bytes per pixel for
+    uncompressed formats).
+    """
+    levels: int = count_mipmaps(width, height) if do_mips else 1
+    peak: int = width * height * (DECODED_PIXEL_SIZE + SURFACE_PIXEL_SIZE)
+    for level in range(levels):
+        level_width, level_height = mip_extent(width, level), mip_extent(height, level)
+        if format in BLOCK_INFO:
+            peak += level_size(format, level_width, level_height)
+        else:
+            peak += level_width * level_height * 4
+    return peak
+
+
+def estimate_file_peak_bytes(path: Path | str, format: Format, do_mips: bool = True) -> int | None:
+    """Variant of estimate_peak_bytes() reading the dimensions from the image file's header. None if they are unknown."""
+    dimensions: tuple[int, int] | None = get_img_dimensions(path)
+    if dimensions is None:
+        return None
+    return estimate_peak_bytes(*dimensions, format, do_mips)
+
+
+class MemoryBudgetScheduler:
+    """
+    Runs jobs on a thread pool while the sum of their estimated peak memory stays under a byte budget.
+
+    Jobs are started largest first (longest-processing-time order, since time grows with size too), and a job
+    that does not fit waits for running ones to finish, while smaller jobs that fit keep the other workers busy.
+    A job larger than the whole budget runs alone.
+    """
+
+    def __init__(self, budget: int, workers: int | None = None):
+        if budget <= 0:
+            raise ValueError("budget must be positive.")
+        self._budget: int = budget
+        self._workers: int = workers or os.cpu_count() or 1
+        self._cond = threading.Condition()
+        self._in_use: int = 0
+        self._running: int = 0
+
+    @property
+    def budget(self) -> int:
+        """Get the memory budget in bytes."""
+        return self._budget
+
+    @property
+    def in_use(self) -> int:
+        """Returns the estimated memory of the running jobs."""
+        return self._in_use
+
+    def map(self, func: Callable[[T], R], jobs: Iterable[T], estimate: Callable[[T], int | None]) -> list[R]:
+        """
+        Runs `func(job)` for every job and returns the results in the order of `jobs`.
+
+        `estimate(job)` returns the job's peak memory in bytes, None when unknown (the job then runs alone). An
+        estimate that raises counts as unknown, the error is left for `func` to report when it runs the job.
+        If `func` raises, the exception of the first failed job in `jobs` order is re-raised once every job has run.
+        """
+        items: list[T] = list(jobs)
+        sizes: list[int] = []
+        for job in items:
+            try:
+                size: int | None = estimate(job)
+            except Exception:
+                size = None
+            sizes.append(self._budget if size is None else size)
+        # Sorted by size, then by reverse input order, so the best fit is found by bisection and popped from the end.
+        pending: list[tuple[int, int]] = sorted((size, -i) for i, size in enumerate(sizes))
+        futures: list[Future | None] = [None] * len(items)
+
+        def done(size: int) -> None:
+            with self._cond:
+                self._in_use -= size
+                self._running -= 1
+                self._cond.notify_all()
+
+        with ThreadPoolExecutor(max_workers=self._workers) as pool:
+            while pending:
+                with self._cond:
+                    index: int | None = None
+                    while index is None:
+                        if self._running == 0:
+                            index = -pending.pop()[1]
+                        elif self._running < self._workers:
+                            fits: int = bisect.bisect_right(pending, (self._budget - self._in_use, math.inf))
+                            if fits:
+                                index = -pending.pop(fits - 1)[1]
+                        if index is None:
+                            self._cond.wait()
+                    self._in_use += sizes[index]
+                    self._running += 1
+                future: Future = pool.submit(func, items[index])
+                future.add_done_callback(lambda _, size=sizes[index]: done(size))
+                futures[index] = future
+        return [future.result() for future in futures]
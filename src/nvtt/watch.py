@@ -0,0 +1,323 @@
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import signal
+import struct
+import sys
+import threading
+import time
+from .pool import WorkerPool
+from .preset import CompressionPreset
+from .enums import Format, Quality
+
+# Source extensions converted by default, the image formats NVTT loads.
+DEFAULT_EXTENSIONS: tuple[str, ...] = (".png", ".tga", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".psd", ".hdr", ".gif", ".webp")
+DEFAULT_DEBOUNCE: float = 0.1
+DEFAULT_POLL_INTERVAL: float = 0.25
+
+# inotify(7) event masks.
+IN_CLOSE_WRITE: int = 0x00000008
+IN_MOVED_TO: int = 0x00000080
+IN_CREATE: int = 0x00000100
+IN_Q_OVERFLOW: int = 0x00004000
+IN_ISDIR: int = 0x40000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class _PollingWatcher:
+    """Finds changed files by comparing modification times and sizes between directory scans."""
+
+    def __init__(self, roots: list[Path], match: Callable[[Path], bool], interval: float = DEFAULT_POLL_INTERVAL):
+        self._roots = roots
+        self._match = match
+        self._interval = interval
+        self._snapshot: dict[Path, tuple[int, int]] = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for root in self._roots:
+            for dirpath, _, filenames in os.walk(root):
+                for name in filenames:
+                    path = Path(dirpath, name)
+                    if not self._match(path):
+                        continue
+                    try:
+                        st = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def poll(self, timeout: float) -> set[Path]:
+        """Waits up to `timeout` seconds and returns the files created or modified since the last call."""
+        time.sleep(min(timeout, self._interval))
+        snapshot: dict[Path, tuple[int, int]] = self._scan()
+        changed: set[Path] = {path for path, stat in snapshot.items() if self._snapshot.get(path) != stat}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyWatcher:
+    """Linux inotify watcher of directory trees, new subdirectories are watched as they appear."""
+
+    MASK: int = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self, roots: list[Path], match: Callable[[Path], bool]):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._match = match
+        self._roots = roots
+        self._fd: int = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed.")
+        self._dirs: dict[int, Path] = {}
+        for root in roots:
+            self._watch_tree(root)
+
+    @staticmethod
+    def is_available() -> bool:
+        """Returns whether inotify can be used on this system."""
+        if not sys.platform.startswith("linux"):
+            return False
+        name: str | None = ctypes.util.find_library("c")
+        return name is not None and hasattr(ctypes.CDLL(name), "inotify_init1")
+
+    def _watch_tree(self, root: Path) -> set[Path]:
+        """Watches `root` and its subdirectories, returning the matching files already in them."""
+        found: set[Path] = set()
+        for dirpath, _, filenames in os.walk(root):
+            wd: int = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), self.MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"Failed to watch {dirpath}.")
+            self._dirs[wd] = Path(dirpath)
+            found.update(path for path in (Path(dirpath, name) for name in filenames) if self._match(path))
+        return found
+
+    def _rescan(self) -> set[Path]:
+        """Returns every matching file, used when the kernel queue overflowed and events were lost."""
+        found: set[Path] = set()
+        for root in self._roots:
+            found |= self._watch_tree(root)
+        return found
+
+    def poll(self, timeout: float) -> set[Path]:
+        """Waits up to `timeout` seconds for events and returns the files written or moved in."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed: set[Path] = set()
+        while True:
+            try:
+                data: bytes = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset: int = 0
+            while offset < len(data):
+                wd, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                name: bytes = data[offset + _INOTIFY_EVENT.size:offset + _INOTIFY_EVENT.size + length].rstrip(b"\0")
+                offset += _INOTIFY_EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    changed |= self._rescan()
+                    continue
+                directory: Path | None = self._dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = directory / os.fsdecode(name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        # Files may be written before the new directory's watch is added.
+                        changed |= self._watch_tree(path)
+                elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and self._match(path):
+                    changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+@dataclass
+class WatchEvent:
+    """Outcome of the reconversion of a changed file."""
+    source: Path
+    output: Path
+    seconds: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Returns whether the conversion succeeded."""
+        return self.error is None
+
+
+class TextureWatcher:
+    """
+    Reconverts textures to DDS as they are saved, on a warm WorkerPool.
+
+    Watches `roots` with inotify where available (`use_inotify=None`), or by polling. Changes to a file are
+    debounced: it is converted once no change was seen for `debounce` seconds, and again if it changes during
+    its conversion. Outputs are written atomically next to their source, or under `output_dir` with the same
+    relative path, so a hot-reloading reader never sees a partial DDS. `on_event(event)` gets every result.
+    """
+
+    def __init__(self,
+                 roots: Iterable[Path | str],
+                 preset: CompressionPreset | None = None,
+                 workers: int | None = None,
+                 extensions: Iterable[str] = DEFAULT_EXTENSIONS,
+                 output_dir: Path | str | None = None,
+                 debounce: float = DEFAULT_DEBOUNCE,
+                 use_inotify: bool | None = None,
+                 use_cuda: bool = False,
+                 on_event: Callable[[WatchEvent], None] | None = None,
+                 ):
+        self._roots: list[Path] = [Path(root).resolve() for root in roots]
+        for root in self._roots:
+            if not root.is_dir():
+                raise NotADirectoryError(f"Path '{root}' is not a directory.")
+        if output_dir is not None and len(self._roots) != 1:
+            raise ValueError("output_dir requires a single root.")
+        self._extensions: set[str] = {ext.lower() for ext in extensions}
+        self._output_dir: Path | None = Path(output_dir).resolve() if output_dir is not None else None
+        self._debounce = debounce
+        self._on_event = on_event
+        if use_inotify is None:
+            use_inotify = _InotifyWatcher.is_available()
+        self._watcher = _InotifyWatcher(self._roots, self.matches) if use_inotify else _PollingWatcher(self._roots, self.matches)
+        self._pool = WorkerPool(workers, preset, use_cuda)
+        self._pending: dict[Path, float] = {}
+        self._running: dict[Path, Future] = {}
+        self._stop = threading.Event()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Returns whether changes are detected with inotify rather than polling."""
+        return isinstance(self._watcher, _InotifyWatcher)
+
+    def matches(self, path: Path) -> bool:
+        """Returns whether `path` is a source to convert."""
+        if path.suffix.lower() not in self._extensions:
+            return False
+        return self._output_dir is None or not path.is_relative_to(self._output_dir)
+
+    def output_for(self, source: Path) -> Path:
+        """Returns the DDS path of `source`."""
+        if self._output_dir is None:
+            return source.with_suffix(".dds")
+        return (self._output_dir / source.relative_to(self._roots[0])).with_suffix(".dds")
+
+    def stale(self) -> list[Path]:
+        """Returns the sources whose DDS is missing or older than them."""
+        sources: list[Path] = []
+        for root in self._roots:
+            for dirpath, _, filenames in os.walk(root):
+                for name in filenames:
+                    source = Path(dirpath, name)
+                    if not self.matches(source):
+                        continue
+                    output: Path = self.output_for(source)
+                    if not output.exists() or output.stat().st_mtime_ns < source.stat().st_mtime_ns:
+                        sources.append(source)
+        return sorted(sources)
+
+    def _convert(self, source: Path) -> Future:
+        """Queues the conversion of `source`, reporting its result when done."""
+        start: float = time.perf_counter()
+        output: Path = self.output_for(source)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        future: Future = self._pool.submit_file(source, output)
+
+        def done(f: Future) -> None:
+            error: BaseException | None = f.exception()
+            if self._on_event is not None:
+                self._on_event(WatchEvent(source, output, time.perf_counter() - start, None if error is None else str(error)))
+
+        future.add_done_callback(done)
+        return future
+
+    def run(self, convert_stale: bool = False) -> None:
+        """
+        Watches and converts until stop() is called. With `convert_stale`, sources whose DDS is missing or
+        older are converted first.
+        """
+        if convert_stale:
+            now: float = time.monotonic()
+            for source in self.stale():
+                self._pending[source] = now
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for path in [path for path, future in self._running.items() if future.done()]:
+                del self._running[path]
+            for path, deadline in list(self._pending.items()):
+                if deadline <= now and path not in self._running:
+                    del self._pending[path]
+                    try:
+                        self._running[path] = self._convert(path)
+                    except FileNotFoundError:
+                        pass
+            # Files still being converted wait for the next round, at most `debounce` away.
+            timeout: float = self._debounce
+            waiting: list[float] = [deadline for path, deadline in self._pending.items() if path not in self._running]
+            if waiting:
+                timeout = max(0.0, min(min(waiting) - now, timeout))
+            for path in self._watcher.poll(timeout):
+                self._pending[path] = time.monotonic() + self._debounce
+
+    def stop(self) -> None:
+        """Makes run() return, from another thread or a callback."""
+        self._stop.set()
+
+    def close(self) -> None:
+        """Stops watching and waits for the running conversions."""
+        self._watcher.close()
+        self._pool.close()
+
+    def __enter__(self) -> "TextureWatcher":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m nvtt.watch", description="Reconvert textures to DDS as they are saved.")
+    parser.add_argument("roots", nargs="+", help="Directories to watch.")
+    parser.add_argument("--format", default=Format.DXT1.name, choices=list(Format.__members__))
+    parser.add_argument("--quality", default=Quality.Normal.name, choices=[q.name for q in Quality])
+    parser.add_argument("--workers", type=int, help="Number of worker threads, defaults to the CPU count.")
+    parser.add_argument("--output-dir", help="Write the DDS files under this directory instead of next to their source.")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE, help="Seconds without changes before converting.")
+    parser.add_argument("--poll", action="store_true", help="Poll instead of using inotify.")
+    parser.add_argument("--initial", action="store_true", help="First convert the sources whose DDS is missing or outdated.")
+    parser.add_argument("--cuda", action="store_true", help="Enable CUDA acceleration.")
+    args = parser.parse_args(argv)
+
+    def report(event: WatchEvent) -> None:
+        if event.ok:
+            print(f"{event.source} -> {event.output} ({event.seconds * 1000:.0f} ms)", flush=True)
+        else:
+            print(f"{event.source}: {event.error}", file=sys.stderr, flush=True)
+
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    preset = CompressionPreset(Format[args.format], Quality[args.quality])
+    with TextureWatcher(args.roots, preset, args.workers, output_dir=args.output_dir, debounce=args.debounce,
+                        use_inotify=False if args.poll else None, use_cuda=args.cuda, on_event=report) as watcher:
+        print(f"Watching {', '.join(args.roots)} ({'inotify' if watcher.uses_inotify else 'polling'}).", flush=True)
+        try:
+            watcher.run(args.initial)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import struct
+import sys
+from pathlib import Path
+from typing import Callable
+import pytest
+from nvtt.core import LIBRARY_PATH, LINUX_NVTT, WINDOWS_NVTT
+
+NVTT_PATH: Path = LIBRARY_PATH / (WINDOWS_NVTT if sys.platform.startswith("win") else LINUX_NVTT)
+NVTT_AVAILABLE: bool = NVTT_PATH.exists()
+
+
+def pytest_collection_modifyitems(config, items) -> None:
+    if NVTT_AVAILABLE:
+        return
+    skip = pytest.mark.skip(reason=f"The NVTT shared library is not in {LIBRARY_PATH}.")
+    for item in items:
+        item.add_marker(skip)
+
+
+def gradient(width: int, height: int, seed: int = 0) -> bytes:
+    """Returns BGRA_8UB pixels of a gradient with a varying alpha, different for each `seed`."""
+    return bytes(v & 0xFF for y in range(height) for x in range(width)
+                 for v in (x * 4 + seed, y * 4, (x + y) * 2 + seed * 7, 255 - x - seed))
+
+
+def gradient_tga(width: int, height: int, seed: int = 0) -> bytes:
+    """Returns `gradient` as an uncompressed 32-bit TGA, stored top to bottom."""
+    return struct.pack("<3B2HB4H2B", 0, 0, 2, 0, 0, 0, 0, 0, width, height, 32, 0x28) + gradient(width, height, seed)
+
+
+@pytest.fixture
+def make_surface() -> Callable:
+    """Returns a factory of gradient Surfaces."""
+    from nvtt.surface import Surface
+    from nvtt.enums import AlphaMode
+
+    def make(width: int = 64, height: int = 64, seed: int = 0) -> Surface:
+        surface = Surface()
+        assert surface.load_from_memory(gradient_tga(width, height, seed))
+        # Loading sets AlphaMode.TRANSPARENCY, keep the default of raw pixels.
+        surface.alpha_mode = AlphaMode.NONE
+        return surface
+    return make
+
+
+@pytest.fixture
+def make_options() -> Callable:
+    """Returns a factory of CompressionOptions, BC1 at the default quality unless given."""
+    from nvtt.compression import CompressionOptions
+    from nvtt.enums import Format, Quality
+
+    def make(format: Format = Format.BC1, quality: Quality | None = None) -> CompressionOptions:
+        co = CompressionOptions()
+        co.format(format)
+        if quality is not None:
+            co.quality(quality)
+        return co
+    return make
+
+
+@pytest.fixture
+def co(make_options: Callable):
+    """BC1 CompressionOptions."""
+    return make_options()
+
+
+@pytest.fixture
+def make_image(tmp_path: Path, make_surface: Callable) -> Callable:
+    """Returns a factory writing gradient PNGs, in tmp_path by default."""
+    def make(path: Path | str | None = None, width: int = 64, height: int = 64, seed: int = 0) -> Path:
+        path = Path(path) if path is not None else tmp_path / f"image_{width}x{height}_{seed}.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        make_surface(width, height, seed).save(str(path))
+        return path
+    return make
+
+
+@pytest.fixture
+def image_file(make_image: Callable) -> Path:
+    """A 64x64 RGBA PNG."""
+    return make_image()
@@ -0,0 +1,66 @@
+import math
+import pytest
+from nvtt.context import Context
+from nvtt.utils.adaptive import AdaptiveQuality, QualityDecisions, measure_error, psnr
+from nvtt.utils.easy_dds import EasyDDS
+from nvtt.enums import Format, Quality
+
+
+def test_psnr():
+    assert psnr(0.0) == math.inf
+    assert psnr(0.01) == pytest.approx(40.0)
+
+
+def test_measure_error(make_surface, make_options):
+    surface = make_surface()
+    co = make_options(Format.RGBA)
+    assert measure_error(surface, Context().compress_to_bytes(surface.clone(), co), Format.RGBA) == pytest.approx(0.0, abs=1e-3)
+    assert measure_error(surface, Context().compress_to_bytes(surface.clone(), make_options()), Format.BC1) > 0
+    with pytest.raises(ValueError):
+        measure_error(make_surface(32, 32), Context().compress_to_bytes(surface.clone(), co), Format.RGBA)
+
+
+def test_first_acceptable_quality_is_kept(make_surface, make_options):
+    co = make_options()
+    data, decision = AdaptiveQuality(min_psnr=10).compress_to_bytes(Context(), make_surface(), co)
+    assert (decision.quality, decision.trials) == (Quality.Fastest, 1)
+    assert decision.psnr >= 10 and not decision.reused
+    assert data == Context().compress_to_bytes(make_surface(), co)
+
+
+def test_escalates_until_the_last_quality(make_surface, make_options):
+    adaptive = AdaptiveQuality(min_psnr=None, max_rmse=0.0, qualities=(Quality.Fastest, Quality.Normal))
+    data, decision = adaptive.compress_to_bytes(Context(), make_surface(), make_options())
+    assert (decision.quality, decision.trials) == (Quality.Normal, 2)
+    assert not adaptive.accepts(decision.rmse)
+    co = make_options()
+    co.quality(Quality.Normal)
+    assert data == Context().compress_to_bytes(make_surface(), co)
+
+
+def test_decisions_are_reused(image_file, tmp_path, make_options):
+    path = tmp_path / "decisions.json"
+    adaptive = AdaptiveQuality(min_psnr=None, max_rmse=0.0, qualities=(Quality.Fastest, Quality.Normal), decisions=path)
+    first = adaptive.convert_file(Context(), image_file, tmp_path / "first.dds", make_options())
+    adaptive.decisions.save()
+    reloaded = AdaptiveQuality(min_psnr=None, max_rmse=0.0, qualities=(Quality.Fastest, Quality.Normal), decisions=QualityDecisions(path))
+    second = reloaded.convert_file(Context(), image_file, tmp_path / "second.dds", make_options())
+    assert second.reused and second.quality == first.quality == Quality.Normal
+    assert (tmp_path / "first.dds").read_bytes() == (tmp_path / "second.dds").read_bytes()
+    # Other thresholds do not reuse the decision.
+    other = AdaptiveQuality(min_psnr=10, decisions=path)
+    assert not other.convert_file(Context(), image_file, tmp_path / "third.dds", make_options()).reused
+
+
+def test_convert_tree_adaptive(tmp_path, make_image):
+    make_image(tmp_path / "a.png")
+    results = EasyDDS.convert_tree(tmp_path, adaptive=AdaptiveQuality(min_psnr=10, decisions=tmp_path / "decisions.json"))
+    assert [r.quality for r in results] == [Quality.Fastest]
+    assert len(QualityDecisions(tmp_path / "decisions.json")) == 1
+
+
+def test_requires_a_threshold():
+    with pytest.raises(ValueError):
+        AdaptiveQuality(min_psnr=None, max_rmse=None)
+    with pytest.raises(ValueError):
+        AdaptiveQuality(qualities=())
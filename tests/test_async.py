@@ -0,0 +1,90 @@
+import asyncio
+from concurrent.futures import Future
+import threading
+import pytest
+from nvtt.context import Context
+from nvtt.surface import Surface
+from nvtt.utils import async_helper
+from nvtt.utils.easy_dds import EasyDDS
+from nvtt.enums import Format, Quality
+
+
+def test_compress_to_bytes_async(make_surface, make_options):
+    ctx = Context()
+    data = asyncio.run(ctx.compress_to_bytes_async(make_surface(), make_options()))
+    assert data == Context().compress_to_bytes(make_surface(), make_options())
+    assert ctx.wait(0)
+
+
+def test_compress_all_async(make_surface, make_options):
+    from nvtt.output import OutputOptions
+    oo = OutputOptions()
+    buffer = oo.output_to_buffer(bytearray(1 << 16))
+    asyncio.run(Context().compress_all_async(make_surface(), make_options(), oo))
+    assert bytes(buffer.getvalue()) == Context().compress_to_bytes(make_surface(), make_options())
+
+
+def test_load_async(image_file):
+    surface = Surface()
+    assert asyncio.run(surface.load_async(str(image_file)))
+    assert surface.width == 64
+    data = image_file.read_bytes()
+    assert asyncio.run(surface.load_from_memory_async(data))
+
+
+def test_convert_img_async(image_file):
+    asyncio.run(EasyDDS.convert_img_async(image_file))
+    assert image_file.with_suffix(".dds").read_bytes()[:4] == b"DDS "
+
+
+def test_cancel_then_wait(make_surface, make_options):
+    ctx = Context()
+    co = make_options(Format.BC7, Quality.Fastest)
+
+    async def main() -> None:
+        task = asyncio.create_task(ctx.compress_to_bytes_async(make_surface(256, 256), co))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    # The native call may still be running, wait() blocks until it has stopped.
+    assert ctx.wait(60)
+    assert ctx._cancel_event is None
+    assert ctx.compress_to_bytes(make_surface(), make_options()) == Context().compress_to_bytes(make_surface(), make_options())
+
+
+def test_run_blocking_on_submit():
+    submitted: list[Future] = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def job() -> int:
+        started.set()
+        release.wait(10)
+        return 42
+
+    async def main() -> None:
+        task = asyncio.create_task(async_helper.run_blocking(job, on_submit=submitted.append))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 10)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert not submitted[0].done()
+    release.set()
+    assert submitted[0].result(10) == 42
+
+
+def test_set_max_workers():
+    previous: int = async_helper.get_max_workers()
+    try:
+        async_helper.set_max_workers(2)
+        assert async_helper.get_max_workers() == 2
+        assert async_helper.get_executor()._max_workers == 2
+        with pytest.raises(ValueError):
+            async_helper.set_max_workers(0)
+    finally:
+        async_helper.set_max_workers(previous)
@@ -0,0 +1,49 @@
+from nvtt.batch_list import BatchList
+from nvtt.context import Context
+from nvtt.output import OutputOptions
+
+
+def _file_options(path) -> OutputOptions:
+    oo = OutputOptions()
+    oo.output_header(False)
+    oo.filename(str(path))
+    return oo
+
+
+def test_batch_list_size_and_clear(make_surface, tmp_path):
+    batch = BatchList()
+    oo = _file_options(tmp_path / "out.bin")
+    batch.append(make_surface(), 0, 0, oo)
+    batch.append(make_surface(seed=1), 0, 0, oo)
+    assert len(batch) == 2
+    batch.clear()
+    assert len(batch) == 0
+
+
+def test_compress_batch_matches_compress(make_surface, co, tmp_path):
+    ctx = Context()
+    surfaces = [make_surface(seed=i) for i in range(3)]
+    outputs = [_file_options(tmp_path / f"batch_{i}.bin") for i in range(3)]
+    batch = BatchList()
+    for surface, oo in zip(surfaces, outputs):
+        batch.append(surface, 0, 0, oo)
+    assert ctx.compress_batch(batch, co)
+    # Destroying the options closes their files.
+    del batch, outputs
+
+    for i, surface in enumerate(surfaces):
+        oo = _file_options(tmp_path / f"single_{i}.bin")
+        assert ctx.compress(surface, 0, 0, co, oo)
+        del oo
+        data = (tmp_path / f"batch_{i}.bin").read_bytes()
+        assert data == (tmp_path / f"single_{i}.bin").read_bytes()
+        assert len(data) == 64 * 64 // 2
+
+
+def test_compress_batch_accepts_entries(make_surface, co, tmp_path):
+    ctx = Context()
+    surfaces = [make_surface(seed=i) for i in range(2)]
+    outputs = [_file_options(tmp_path / f"batch_{i}.bin") for i in range(2)]
+    assert ctx.compress_batch([(s, 0, 0, oo) for s, oo in zip(surfaces, outputs)], co)
+    del outputs
+    assert (tmp_path / "batch_0.bin").read_bytes() != (tmp_path / "batch_1.bin").read_bytes()
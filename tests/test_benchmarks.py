@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+import pytest
+
+BENCHMARKS = Path(__file__).resolve().parents[1] / "benchmarks"
+
+
+@pytest.fixture
+def bench(monkeypatch):
+    # Imported by name, so the spawned benchmark processes can import it as well.
+    monkeypatch.syspath_prepend(str(BENCHMARKS))
+    import bench_compression
+    return bench_compression
+
+
+def _baseline(path: Path, results: dict) -> Path:
+    path.write_text(json.dumps({"meta": {}, "results": results}), encoding="utf-8")
+    return path
+
+
+def test_run_writes_baseline(bench, tmp_path, capsys):
+    out = tmp_path / "baseline.json"
+    assert bench.main(["run", "--formats", "BC1", "--qualities", "Fastest", "--sizes", "64", "--mips", "off",
+                       "--repeat", "1", "--out", str(out)]) == 0
+    baseline = json.loads(out.read_text(encoding="utf-8"))
+    assert set(baseline["results"]) == {"compress/BC1/Fastest/64/nomips", "easy_dds/64"}
+    result = baseline["results"]["compress/BC1/Fastest/64/nomips"]
+    assert result["output_bytes"] == 128 + 64 * 64 // 2
+    assert result["mpix_per_s"] > 0 and result["peak_rss_kb"] > 0
+    assert baseline["meta"]["nvtt_version"]
+
+
+def test_compare(bench, tmp_path, capsys):
+    case = {"mpix_per_s": 100.0, "peak_rss_kb": 1000, "output_bytes": 2048}
+    old = _baseline(tmp_path / "old.json", {"a": case, "b": case})
+    same = _baseline(tmp_path / "same.json", {"a": dict(case, mpix_per_s=95.0), "b": case})
+    slower = _baseline(tmp_path / "slower.json", {"a": dict(case, mpix_per_s=80.0), "b": dict(case, output_bytes=1024)})
+    assert bench.main(["compare", str(old), str(same)]) == 0
+    assert bench.main(["compare", str(old), str(slower)]) == 1
+    output: str = capsys.readouterr().out
+    assert "SLOWER" in output and "SIZE CHANGED" in output
+    assert "2 regression(s)" in output
@@ -0,0 +1,75 @@
+import os
+from nvtt.context import Context
+from nvtt.utils.cache import ConversionCache, options_key, write_atomic
+from nvtt.utils.easy_dds import EasyDDS
+from nvtt.enums import Filters, Format
+
+
+def test_key(make_surface, tmp_path, make_options):
+    cache = ConversionCache(tmp_path)
+    co = make_options()
+    key = cache.key(make_surface(), co)
+    assert key == cache.key(make_surface(), make_options())
+    assert key != cache.key(make_surface(seed=1), co)
+    assert key != cache.key(make_surface(), make_options(Format.BC3))
+    assert key != cache.key(make_surface(), co, do_mips=False)
+    assert cache.key(b"abc", co) != cache.key(b"abd", co)
+    assert options_key(co) == options_key(make_options())
+
+
+def test_compress_all_hit(make_surface, tmp_path, make_options):
+    cache = ConversionCache(tmp_path)
+    ctx = Context()
+    co = make_options()
+    data = cache.compress_all(ctx, make_surface(), co)
+    assert data == ctx.compress_to_bytes(make_surface(), co)
+    assert cache.size == len(data)
+    # A hit returns the stored entry without compressing again.
+    key = cache.key(make_surface(), co, min_level=1, mipmap_filter=Filters.MITCHELL, do_mips=True)
+    cache.path(key).write_bytes(b"cached")
+    assert cache.compress_all(ctx, make_surface(), co) == b"cached"
+
+
+def test_convert_file(image_file, tmp_path, make_options):
+    cache = ConversionCache(tmp_path / "cache")
+    ctx = Context()
+    co = make_options()
+    first, second = tmp_path / "first.dds", tmp_path / "second.dds"
+    assert not cache.convert_file(ctx, image_file, first, co)
+    assert cache.convert_file(ctx, image_file, second, co)
+    assert first.read_bytes() == second.read_bytes()
+    assert first.read_bytes()[:4] == b"DDS "
+
+
+def test_eviction_is_lru(tmp_path):
+    cache = ConversionCache(tmp_path, max_bytes=250)
+    for i, key in enumerate(["aa1", "bb2", "cc3"]):
+        cache.put(key, bytes(100))
+        os.utime(cache.path(key), (1000 + i, 1000 + i))
+    # Eviction ran when the third entry went above the budget, removing the oldest one.
+    assert cache.get("aa1") is None
+    assert cache.get("bb2") is not None
+    os.utime(cache.path("bb2"), (2000, 2000))
+    assert cache.evict(100) == 100
+    assert cache.get("cc3") is None and cache.get("bb2") is not None
+    cache.clear()
+    assert cache.size == 0
+
+
+def test_convert_tree_with_cache(tmp_path, make_image):
+    make_image(tmp_path / "src" / "a.png")
+    cache = ConversionCache(tmp_path / "cache")
+    EasyDDS.convert_tree(tmp_path / "src", cache=cache)
+    assert cache.size > 0
+    dds = tmp_path / "src" / "a.dds"
+    expected = dds.read_bytes()
+    dds.unlink()
+    EasyDDS.convert_tree(tmp_path / "src", cache=cache)
+    assert dds.read_bytes() == expected
+
+
+def test_write_atomic(tmp_path):
+    path = tmp_path / "out.bin"
+    write_atomic(path, b"data")
+    assert path.read_bytes() == b"data"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.bin"]
@@ -0,0 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import pytest
+from nvtt.context import Context
+from nvtt.pool import ContextPool
+from nvtt.preset import CompressionPreset
+from nvtt.enums import Container, Format, Quality
+
+
+@pytest.fixture
+def expected(make_options):
+    """Returns a factory of what a pool with the default Quality.Normal writes for a surface."""
+    def compress(surface, format: Format = Format.BC1) -> bytes:
+        return Context().compress_to_bytes(surface, make_options(format, Quality.Normal))
+    return compress
+
+
+def test_compress_to_bytes(make_surface, expected):
+    with ContextPool(2, Format.BC3) as pool, pool.context() as pooled:
+        assert pooled.compress_to_bytes(make_surface()) == expected(make_surface(), Format.BC3)
+
+
+def test_compress_all_flushes_output(make_surface, tmp_path, expected):
+    output = tmp_path / "out.dds"
+    with ContextPool(1) as pool, pool.context() as pooled:
+        pooled.compress_all(make_surface(), str(output))
+        assert output.read_bytes() == expected(make_surface())
+
+
+def test_compress_to_bytes_uses_output_settings(make_surface):
+    with ContextPool(1, setup=lambda co, oo: oo.container(Container.DDS10)) as pool, pool.context() as pooled:
+        assert pooled.compress_to_bytes(make_surface())[84:88] == b"DX10"
+
+
+def test_explicit_output_keeps_pooled_output(make_surface, tmp_path, expected):
+    pooled_output = tmp_path / "pooled.dds"
+    with ContextPool(1, setup=lambda co, oo: oo.filename(str(pooled_output))) as pool:
+        with pool.context() as pooled:
+            pooled.compress_all(make_surface(seed=1), str(tmp_path / "explicit.dds"))
+            pooled.compress_all(make_surface())
+    assert (tmp_path / "explicit.dds").read_bytes() == expected(make_surface(seed=1))
+    assert pooled_output.read_bytes() == expected(make_surface())
+
+
+def test_concurrent_checkouts(make_surface, expected):
+    results = {seed: expected(make_surface(seed=seed)) for seed in range(6)}
+    with ContextPool(2) as pool:
+        def job(seed: int) -> bytes:
+            with pool.context() as pooled:
+                return pooled.compress_to_bytes(make_surface(seed=seed))
+        with ThreadPoolExecutor(4) as executor:
+            assert dict(zip(results, executor.map(job, results))) == results
+        assert pool.created <= 2
+
+
+def test_ownership(make_surface):
+    with ContextPool(1) as pool:
+        pooled = pool.checkout()
+        errors: list[Exception] = []
+
+        def other_thread() -> None:
+            try:
+                pooled.ctx
+            except RuntimeError as e:
+                errors.append(e)
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+        assert len(errors) == 1
+        with pytest.raises(TimeoutError):
+            pool.checkout(timeout=0.01)
+        pool.checkin(pooled)
+        with pytest.raises(RuntimeError):
+            pooled.compress_to_bytes(make_surface())
+
+
+def test_setup_and_preset(make_surface, expected):
+    configured: list[bool] = []
+    with ContextPool(1, setup=lambda co, oo: configured.append(True), preset=CompressionPreset(Format.BC4, Quality.Normal)) as pool:
+        with pool.context() as pooled:
+            assert pooled.compress_to_bytes(make_surface()) == expected(make_surface(), Format.BC4)
+    assert configured == [True]
+
+
+def test_close(make_surface):
+    pool = ContextPool(2)
+    busy = pool.checkout()
+    with pool.context() as idle:
+        pass
+    pool.close()
+    assert idle._ctx.closed
+    with pytest.raises(RuntimeError):
+        pool.checkout()
+    # A set checked out during close() is freed when it comes back.
+    busy.compress_to_bytes(make_surface())
+    pool.checkin(busy)
+    assert busy._ctx.closed and busy._co.closed and busy._oo.closed
+
+
+def test_close_wakes_blocked_checkout():
+    pool = ContextPool(1)
+    busy = pool.checkout()
+    errors: list[Exception] = []
+
+    def waiter() -> None:
+        try:
+            pool.checkout()
+        except RuntimeError as e:
+            errors.append(e)
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.05)
+    pool.close()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert len(errors) == 1
+    pool.checkin(busy)
@@ -0,0 +1,66 @@
+import pytest
+from nvtt.context import Context
+from nvtt.output import OutputOptions
+from nvtt.utils.dds import DDSInfo, index_directory, level_size, parse_header, read_header, count_mipmaps, mip_extent
+from nvtt.enums import Container, Format
+
+
+def compress(surface, co, container: Container | None = None, do_mips: bool = True) -> bytes:
+    oo = OutputOptions()
+    if container is not None:
+        oo.container(container)
+    return Context().compress_to_bytes(surface, co, oo, do_mips=do_mips)
+
+
+@pytest.mark.parametrize("format, container, dxgi_format", [
+    (Format.BC1, None, None),
+    (Format.BC3, None, None),
+    (Format.BC1, Container.DDS10, 71),
+    (Format.BC7, Container.DDS10, 98),
+])
+def test_parse_block_compressed(make_surface, format, container, dxgi_format, make_options):
+    data = compress(make_surface(64, 32), make_options(format), container)
+    info = parse_header(data)
+    assert (info.width, info.height, info.depth) == (64, 32, 1)
+    assert info.mipmap_count == count_mipmaps(64, 32) == 7
+    assert info.format == format
+    assert info.dxgi_format == dxgi_format
+    assert info.header_size == (148 if container == Container.DDS10 else 128)
+    assert not info.is_cube and info.array_size == 1
+    assert info.level_sizes == [level_size(format, mip_extent(64, i), mip_extent(32, i)) for i in range(7)]
+    assert info.header_size + info.data_size == len(data)
+    assert info.mip_offsets[0] == info.header_size
+    assert info.mip_offset(6) + info.mip_size(6) == len(data)
+
+
+def test_parse_uncompressed(make_surface, make_options):
+    data = compress(make_surface(), make_options(Format.RGBA), do_mips=False)
+    info = parse_header(data)
+    assert info.format == Format.RGB and info.bits_per_pixel == 32
+    assert info.mipmap_count == 1
+    assert info.header_size + info.data_size == len(data)
+
+
+def test_parse_errors():
+    with pytest.raises(ValueError):
+        parse_header(b"PNG " + bytes(124))
+    with pytest.raises(ValueError):
+        parse_header(b"DDS " + bytes(10))
+    info = DDSInfo(4, 4, 1, 1, None)
+    with pytest.raises(ValueError):
+        info.mip_offset(0)
+
+
+def test_read_header_and_index(make_surface, tmp_path, make_options):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.dds").write_bytes(compress(make_surface(), make_options()))
+    (tmp_path / "sub" / "b.dds").write_bytes(compress(make_surface(32, 32), make_options(Format.BC7), Container.DDS10))
+    (tmp_path / "broken.dds").write_bytes(b"not a dds")
+    assert read_header(tmp_path / "a.dds").width == 64
+
+    for workers in (1, 2):
+        entries = index_directory(tmp_path, workers=workers)
+        assert [e.path.name for e in entries] == ["a.dds", "broken.dds", "b.dds"]
+        assert [e.ok for e in entries] == [True, False, True]
+        assert entries[2].info.format == Format.BC7
+    assert [e.path.name for e in index_directory(tmp_path, recursive=False)] == ["a.dds", "broken.dds"]
@@ -0,0 +1,46 @@
+import shutil
+import pytest
+from nvtt.utils.easy_dds import EasyDDS
+
+
+@pytest.fixture
+def tree(tmp_path, make_image):
+    """A directory of PNGs, one of them in a subdirectory and one that is not a valid image."""
+    root = tmp_path / "textures"
+    make_image(root / "a.png", seed=1)
+    make_image(root / "b.png", 32, 32, seed=2)
+    make_image(root / "sub" / "c.png", seed=3)
+    (root / "broken.png").write_bytes(b"not an image")
+    return root
+
+
+def test_convert_tree(tree):
+    results = EasyDDS.convert_tree(tree, workers=2)
+    by_name = {r.source.name: r for r in results}
+    assert sorted(by_name) == ["a.png", "b.png", "broken.png", "c.png"]
+    assert not by_name["broken.png"].ok
+    for name in ("a.png", "b.png", "c.png"):
+        result = by_name[name]
+        assert result.ok and not result.skipped
+        assert result.output == result.source.with_suffix(".dds")
+        assert result.output.read_bytes()[:4] == b"DDS "
+        assert result.seconds >= 0
+
+
+def test_convert_tree_matches_convert_img(tree, tmp_path):
+    EasyDDS.convert_tree(tree)
+    single = tmp_path / "single.png"
+    shutil.copy(tree / "a.png", single)
+    EasyDDS.convert_img(single)
+    assert (tree / "a.dds").read_bytes() == single.with_suffix(".dds").read_bytes()
+
+
+def test_convert_tree_not_recursive(tree):
+    results = EasyDDS.convert_tree(tree, recursive=False)
+    assert "c.png" not in {r.source.name for r in results}
+    assert not (tree / "sub" / "c.dds").exists()
+
+
+def test_convert_tree_requires_directory(tmp_path):
+    with pytest.raises(NotADirectoryError):
+        EasyDDS.convert_tree(tmp_path / "missing")
@@ -0,0 +1,47 @@
+import pytest
+from nvtt.context import Context
+from nvtt.output import OutputOptions
+from nvtt.encode import BGRA, CPUInputBuffer, encode
+from nvtt.enums import EncodeFlags, Format, Quality
+from tests.conftest import gradient
+
+
+def _surface_path(surface, co) -> bytes:
+    """The top level compressed through Surface and Context, without header."""
+    oo = OutputOptions()
+    oo.output_header(False)
+    return Context().compress_to_bytes(surface, co, oo, do_mips=False)
+
+
+@pytest.mark.parametrize("format", [Format.BC1, Format.BC3, Format.BC4, Format.BC7])
+def test_encode_matches_surface_path(make_surface, format, make_options):
+    data = encode(gradient(64, 32), 64, 32, format, Quality.Normal, BGRA)
+    assert data == _surface_path(make_surface(64, 32), make_options(format, Quality.Normal))
+
+
+def test_cpu_input_buffer(make_surface):
+    buffer = CPUInputBuffer(gradient(64, 32), 64, 32, Format.BC1, channel_order=BGRA)
+    assert buffer.format == Format.BC1
+    assert buffer.num_tiles == 16 * 8
+    assert buffer.encoded_size == 16 * 8 * 8
+    output = bytearray(buffer.encoded_size + 16)
+    assert buffer.encode_into(output) == buffer.encoded_size
+    assert bytes(output[:buffer.encoded_size]) == buffer.encode()
+    with pytest.raises(ValueError):
+        buffer.encode_into(bytearray(buffer.encoded_size - 1))
+    with pytest.raises(ValueError):
+        buffer.encode(flags=EncodeFlags.USE_GPU)
+
+
+def test_cpu_input_buffer_checks_arguments():
+    with pytest.raises(ValueError):
+        CPUInputBuffer(bytes(64 * 32 * 4 - 1), 64, 32, Format.BC1)
+    with pytest.raises(ValueError):
+        CPUInputBuffer(bytes(64 * 32 * 4), 64, 32, Format.BC1, channel_order=BGRA[:3])
+
+
+def test_opaque_flag_ignores_alpha():
+    pixels = bytearray(gradient(16, 16))
+    opaque = bytearray(pixels)
+    opaque[3::4] = b"\xff" * (16 * 16)
+    assert encode(pixels, 16, 16, Format.BC1, flags=EncodeFlags.OPAQUE) == encode(opaque, 16, 16, Format.BC1)
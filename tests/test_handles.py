@@ -0,0 +1,111 @@
+import pytest
+from nvtt.context import Context
+from nvtt.compression import CompressionOptions
+from nvtt.output import OutputOptions
+from nvtt.surface import Surface
+from nvtt.pool import CompressionOptionsPool, HandlePool, OutputOptionsPool, SurfacePool
+from nvtt.enums import AlphaMode, Format, WrapMode
+
+
+@pytest.mark.parametrize("cls", [Surface, Context, CompressionOptions, OutputOptions])
+def test_close(cls):
+    with cls() as item:
+        assert not item.closed
+    assert item.closed
+    item.close()
+
+
+def test_closed_surface_raises():
+    surface = Surface()
+    surface.close()
+    with pytest.raises(RuntimeError):
+        surface.width
+    with pytest.raises(RuntimeError):
+        surface.set_image(1, 1)
+
+
+def test_closed_options_raise():
+    co = CompressionOptions()
+    co.close()
+    with pytest.raises(RuntimeError):
+        co.format(Format.BC1)
+
+
+def test_output_options_close_flushes(make_surface, co, tmp_path):
+    output = tmp_path / "out.dds"
+    with OutputOptions() as oo:
+        oo.filename(str(output))
+        Context().compress_all(make_surface(), co, oo)
+    assert output.read_bytes() == Context().compress_to_bytes(make_surface(), co)
+
+
+def test_output_options_close_file(make_surface, co, tmp_path):
+    output = tmp_path / "out.dds"
+    oo = OutputOptions()
+    oo.output_header(False)
+    oo.filename(str(output))
+    Context().compress_all(make_surface(), co, oo)
+    oo.close_file()
+    without_header = OutputOptions()
+    without_header.output_header(False)
+    assert output.read_bytes() == Context().compress_to_bytes(make_surface(), co, without_header)
+    # The settings are kept, but nothing is written until a new output is set.
+    assert oo.settings == {"output_header": False} and not oo.has_output
+    with pytest.raises(RuntimeError):
+        Context().compress_all(make_surface(), co, oo)
+    oo.filename(str(output))
+    assert oo.has_output
+
+
+def test_surface_pool_recycles(image_file):
+    with SurfacePool(max_idle=1) as pool:
+        with pool.borrow() as surface:
+            surface.load(str(image_file))
+            surface.wrap_mode = WrapMode.CLAMP
+            surface.alpha_mode = AlphaMode.PREMULTIPLIED
+            surface.normal_map = True
+        with pool.borrow() as again:
+            assert again is surface
+            assert (again.width, again.height) == (1, 1)
+            assert again.wrap_mode == WrapMode.MIRROR
+            assert again.alpha_mode == AlphaMode.NONE
+            assert not again.normal_map
+        assert (pool.idle, pool.created) == (1, 1)
+
+
+def test_surface_pool_max_idle_and_close():
+    pool = SurfacePool(max_idle=1)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    assert pool.idle == 1 and second.closed and not first.closed
+    pool.close()
+    assert first.closed
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_options_pools_reset(make_surface, tmp_path):
+    with CompressionOptionsPool() as pool:
+        with pool.borrow() as co:
+            co.format(Format.BC7)
+        with pool.borrow() as co:
+            assert co.settings == {}
+    output = tmp_path / "out.dds"
+    with OutputOptionsPool() as pool:
+        with pool.borrow() as oo:
+            oo.filename(str(output))
+            Context().compress_all(make_surface(), CompressionOptions(), oo)
+        # Releasing the options flushed their file.
+        assert output.read_bytes()[:4] == b"DDS "
+        assert len(output.read_bytes()) == len(Context().compress_to_bytes(make_surface(), CompressionOptions()))
+        with pool.borrow() as oo:
+            assert oo.settings == {} and oo._filename is None
+
+
+def test_handle_pool_is_abstract():
+    class Incomplete(HandlePool[Surface]):
+        def _create(self) -> Surface:
+            return Surface()
+    with pytest.raises(TypeError):
+        Incomplete()
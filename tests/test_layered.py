@@ -0,0 +1,91 @@
+import pytest
+from nvtt.context import Context
+from nvtt.compression import CompressionOptions
+from nvtt.output import OutputOptions
+from nvtt.utils.dds import MappedDDS, parse_header
+from nvtt.enums import Container
+
+
+def _chain(surface, co: CompressionOptions, container: Container | None = None) -> bytes:
+    """The mip chain of a single surface, without header."""
+    oo = OutputOptions()
+    oo.output_header(False)
+    if container is not None:
+        oo.container(container)
+    return Context().compress_to_bytes(surface, co, oo)
+
+
+@pytest.mark.parametrize("container", [None, Container.DDS10])
+def test_cube(make_surface, tmp_path, container, make_options):
+    oo = None
+    if container is not None:
+        oo = OutputOptions()
+        oo.container(container)
+    output = tmp_path / "cube.dds"
+    data = Context().compress_cube([make_surface(seed=i) for i in range(6)], make_options(), output, oo, workers=3)
+    assert output.read_bytes() == data
+    info = parse_header(data)
+    assert info.is_cube and info.face_count == 6 and info.array_size == 1
+    assert (info.width, info.height, info.mipmap_count) == (64, 64, 7)
+    assert info.header_size + info.data_size == len(data)
+    # Faces are stored in the given order, each with its whole mip chain.
+    with MappedDDS(output) as dds:
+        for face in range(6):
+            image = dds.image(face)
+            assert bytes(image) == _chain(make_surface(seed=face), make_options(), container)
+            image.release()
+
+
+def test_array(make_surface, image_file, tmp_path, make_options):
+    oo = OutputOptions()
+    oo.container(Container.DDS10)
+    layers = [make_surface(seed=1), str(image_file), make_surface(seed=2)]
+    data = Context().compress_array(layers, make_options(), oo=oo)
+    info = parse_header(data)
+    assert info.array_size == 3 and not info.is_cube
+    assert info.header_size + info.data_size == len(data)
+    offset = info.header_size
+    for layer in [make_surface(seed=1), make_surface(), make_surface(seed=2)]:
+        chain = _chain(layer, make_options(), Container.DDS10)
+        assert data[offset:offset + len(chain)] == chain
+        offset += len(chain)
+
+
+def test_single_layer_array_matches_compress_all(make_surface, make_options):
+    assert Context().compress_array([make_surface()], make_options(), do_mips=False) == \
+        Context().compress_to_bytes(make_surface(), make_options(), do_mips=False)
+
+
+def test_same_surface_twice(make_surface, make_options):
+    surface = make_surface()
+    data = Context().compress_cube([surface] * 6, make_options())
+    info = parse_header(data)
+    assert data[info.header_size:] == _chain(make_surface(), make_options()) * 6
+
+
+def test_caller_output_options_untouched(make_surface, tmp_path, make_options):
+    oo = OutputOptions()
+    oo.container(Container.DDS10)
+    oo.filename(str(tmp_path / "caller.dds"))
+    Context().compress_array([make_surface(), make_surface(seed=1)], make_options(), oo=oo)
+    assert oo._filename == str(tmp_path / "caller.dds")
+    # The caller's file output still works afterwards.
+    Context().compress_all(make_surface(), make_options(), oo)
+    oo.close_file()
+    expected = OutputOptions()
+    expected.container(Container.DDS10)
+    assert (tmp_path / "caller.dds").read_bytes() == Context().compress_to_bytes(make_surface(), make_options(), expected)
+
+
+def test_errors(make_surface, make_options):
+    ctx = Context()
+    with pytest.raises(ValueError):
+        ctx.compress_cube([make_surface()] * 5, make_options())
+    with pytest.raises(ValueError):
+        ctx.compress_cube([make_surface(64, 32)] * 6, make_options())
+    with pytest.raises(ValueError):
+        ctx.compress_array([make_surface(), make_surface(32, 32)], make_options())
+    with pytest.raises(ValueError):
+        ctx.compress_array([make_surface(), make_surface()], make_options())
+    with pytest.raises(ValueError):
+        ctx.compress_array([], make_options())
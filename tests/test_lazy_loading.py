@@ -0,0 +1,49 @@
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def _run(code: str) -> dict:
+    """Runs `code` in a fresh interpreter and returns the JSON object it prints last."""
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    out: str = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def test_import_does_not_load_library():
+    result = _run(
+        "import json, sys\n"
+        "import nvtt.context, nvtt.surface, nvtt.utils.easy_dds\n"
+        "from nvtt.core import nvtt as lib\n"
+        "print(json.dumps({'loaded': lib.is_loaded, 'mapped': sorted(lib._mapped), 'asyncio': 'asyncio' in sys.modules}))\n"
+    )
+    assert result == {"loaded": False, "mapped": [], "asyncio": False}
+
+
+def test_groups_are_bound_on_first_use():
+    result = _run(
+        "import json\n"
+        "from nvtt.core import nvtt\n"
+        "from nvtt.surface import Surface\n"
+        "Surface()\n"
+        "print(json.dumps({'loaded': nvtt.is_loaded, 'mapped': sorted(nvtt._mapped)}))\n"
+    )
+    assert result["loaded"]
+    assert "map_surface_funcs" in result["mapped"]
+    assert "map_context_funcs" not in result["mapped"]
+
+
+def test_preload_binds_everything():
+    result = _run(
+        "import json\n"
+        "from nvtt.core import nvtt, FUNCTION_GROUPS\n"
+        "nvtt.preload()\n"
+        "print(json.dumps({'mapped': sorted(nvtt._mapped), 'groups': sorted(set(FUNCTION_GROUPS.values()) | {'map_nvtt_funcs'}),\n"
+        "                  'version': nvtt.version}))\n"
+    )
+    assert result["mapped"] == result["groups"]
+    assert result["version"]
@@ -0,0 +1,64 @@
+import mmap
+from typing import Callable
+import pytest
+from nvtt.surface import Surface, pinned_buffer
+
+
+@pytest.fixture
+def pixels(tmp_path) -> Callable:
+    """Returns a reader of the pixels of a Surface, saved as a TGA."""
+    def read(surface: Surface) -> bytes:
+        path = tmp_path / "pixels.tga"
+        assert surface.save(str(path))
+        return path.read_bytes()
+    return read
+
+
+@pytest.fixture
+def reference(image_file, pixels) -> bytes:
+    return pixels(Surface(str(image_file)))
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview, lambda data: memoryview(bytearray(data))])
+def test_load_from_memory_buffers(image_file, reference, wrap, pixels):
+    surface = Surface()
+    assert surface.load_from_memory(wrap(image_file.read_bytes()))
+    assert (surface.width, surface.height) == (64, 64)
+    assert surface.has_alpha
+    assert pixels(surface) == reference
+
+
+def test_load_from_mmap(image_file, reference, pixels):
+    with open(image_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert pixels(Surface(mapped)) == reference
+
+
+def test_load_mmap(image_file, reference, pixels):
+    surface = Surface()
+    assert surface.load_mmap(str(image_file))
+    assert pixels(surface) == reference
+    with pytest.raises(FileNotFoundError):
+        surface.load_mmap(str(image_file.with_name("missing.png")))
+
+
+def test_constructor_accepts_buffers(image_file, reference, pixels):
+    assert pixels(Surface(bytearray(image_file.read_bytes()))) == reference
+
+
+def test_load_from_memory_invalid_data():
+    with pytest.raises(RuntimeError):
+        Surface().load_from_memory(b"not an image")
+
+
+def test_pinned_buffer():
+    data = bytearray(b"abcd")
+    with pinned_buffer(data) as (buf, size):
+        assert size == 4
+        # Pinned, not copied: the buffer cannot be resized while NVTT may read it.
+        with pytest.raises(BufferError):
+            data.extend(b"e")
+    del buf
+    data.extend(b"e")
+    with pytest.raises(ValueError):
+        with pinned_buffer(memoryview(b"abcdef")[::2]):
+            pass
@@ -0,0 +1,66 @@
+import hashlib
+import os
+import pytest
+from nvtt.utils.manifest import BuildManifest, file_hash
+from nvtt.utils.easy_dds import EasyDDS
+from nvtt.enums import Format
+
+
+@pytest.fixture
+def tree(tmp_path, make_image):
+    root = tmp_path / "textures"
+    make_image(root / "a.png", seed=1)
+    make_image(root / "sub" / "b.png", seed=2)
+    return root
+
+
+def _skipped(results) -> dict[str, bool]:
+    return {r.source.name: r.skipped for r in results}
+
+
+def test_convert_tree_skips_up_to_date(tree, tmp_path):
+    manifest = tmp_path / "manifest.json"
+    assert _skipped(EasyDDS.convert_tree(tree, manifest=manifest)) == {"a.png": False, "b.png": False}
+    assert len(BuildManifest(manifest, tree)) == 2
+    assert _skipped(EasyDDS.convert_tree(tree, manifest=manifest)) == {"a.png": True, "b.png": True}
+    # Other options rebuild everything.
+    assert _skipped(EasyDDS.convert_tree(tree, format=Format.BC3, manifest=manifest)) == {"a.png": False, "b.png": False}
+
+
+def test_convert_tree_rebuilds_changed(tree, tmp_path, make_image):
+    manifest = tmp_path / "manifest.json"
+    EasyDDS.convert_tree(tree, manifest=manifest)
+    make_image(tree / "a.png", seed=5)
+    (tree / "sub" / "b.dds").unlink()
+    assert _skipped(EasyDDS.convert_tree(tree, manifest=manifest)) == {"a.png": False, "b.png": False}
+
+
+def test_touched_source_is_hashed(tree, tmp_path):
+    manifest = tmp_path / "manifest.json"
+    EasyDDS.convert_tree(tree, manifest=manifest)
+    os.utime(tree / "a.png", (1, 1))
+    assert _skipped(EasyDDS.convert_tree(tree, manifest=manifest))["a.png"]
+
+
+def test_convert_tree_prunes_deleted_sources(tree, tmp_path):
+    manifest = tmp_path / "manifest.json"
+    EasyDDS.convert_tree(tree, manifest=manifest)
+    (tree / "sub" / "b.png").unlink()
+    results = EasyDDS.convert_tree(tree, manifest=manifest)
+    assert [r.source.name for r in results] == ["a.png"]
+    assert not (tree / "sub" / "b.dds").exists()
+    assert len(BuildManifest(manifest, tree)) == 1
+
+
+def test_manifest_round_trip(tree, tmp_path):
+    source, output = tree / "a.png", tree / "a.dds"
+    output.write_bytes(b"DDS ")
+    manifest = BuildManifest(tmp_path / "manifest.json", tree)
+    manifest.record(source, output, "options")
+    manifest.save()
+    loaded = BuildManifest(tmp_path / "manifest.json", tree)
+    assert loaded.is_up_to_date(source, output, "options")
+    assert not loaded.is_up_to_date(source, output, "other options")
+    assert loaded.prune({tree / "other.dds"}) == [output]
+    assert not output.exists()
+    assert file_hash(source) == hashlib.sha256(source.read_bytes()).hexdigest()
@@ -0,0 +1,68 @@
+import pytest
+from nvtt.surface import Surface
+from nvtt.utils.dds import MappedDDS, parse_header
+from nvtt.enums import Container, Format
+from tests.test_dds import compress
+
+
+@pytest.fixture(params=[None, Container.DDS10])
+def dds_file(request, make_surface, make_options, tmp_path):
+    path = tmp_path / "texture.dds"
+    path.write_bytes(compress(make_surface(64, 32), make_options(Format.BC3), request.param))
+    return path
+
+
+def test_mip_views(dds_file):
+    data = dds_file.read_bytes()
+    with MappedDDS(dds_file) as dds:
+        info = dds.info
+        assert bytes(dds.header) == data[:info.header_size]
+        offset = info.header_size
+        for level in range(info.mipmap_count):
+            mip = dds.mip(level)
+            assert bytes(mip) == data[offset:offset + info.mip_size(level)]
+            offset += len(mip)
+            mip.release()
+        image = dds.image()
+        assert bytes(image) == data[info.header_size:]
+        image.release()
+        with pytest.raises(IndexError):
+            dds.mip(info.mipmap_count)
+    with pytest.raises(RuntimeError):
+        dds.mip(0)
+
+
+def test_write_truncated_round_trip(dds_file, tmp_path):
+    output = tmp_path / "truncated.dds"
+    with MappedDDS(dds_file) as dds:
+        info = dds.write_truncated(output, first_level=2)
+        assert (info.width, info.height, info.mipmap_count) == (16, 8, dds.info.mipmap_count - 2)
+        assert info.header_size == dds.info.header_size
+        expected = [bytes(dds.mip(level)) for level in range(2, dds.info.mipmap_count)]
+    data = output.read_bytes()
+    assert parse_header(data) == info
+    with MappedDDS(output) as truncated:
+        assert [bytes(truncated.mip(level)) for level in range(info.mipmap_count)] == expected
+    # NVTT reads the rewritten header as well.
+    surface = Surface(str(output))
+    assert (surface.width, surface.height) == (16, 8)
+
+
+def test_write_truncated_single_level(dds_file, tmp_path):
+    output = tmp_path / "top.dds"
+    with MappedDDS(dds_file) as dds:
+        info = dds.write_truncated(output, mipmap_count=1)
+        top = bytes(dds.mip(0))
+        with pytest.raises(ValueError):
+            dds.write_truncated(output, first_level=dds.info.mipmap_count)
+        with pytest.raises(ValueError):
+            dds.write_truncated(output, mipmap_count=0)
+    assert info.mipmap_count == 1 and (info.width, info.height) == (64, 32)
+    assert output.read_bytes()[info.header_size:] == top
+
+
+def test_truncated_file_is_rejected(dds_file, tmp_path):
+    short = tmp_path / "short.dds"
+    short.write_bytes(dds_file.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        MappedDDS(short)
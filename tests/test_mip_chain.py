@@ -0,0 +1,38 @@
+import pytest
+from nvtt.context import Context
+from nvtt.output import OutputOptions
+from nvtt.mip_chain import MipChain
+from nvtt.enums import Filters, Format
+
+
+def test_build(make_surface):
+    surface = make_surface(64, 16)
+    chain = MipChain.build(surface)
+    assert len(chain) == 7
+    assert [(level.width, level.height) for level in chain][:3] == [(64, 16), (32, 8), (16, 4)]
+    assert chain.top.width == 64 and chain[-1].width == 1
+    # The source is left at its top level.
+    assert (surface.width, surface.height) == (64, 16)
+    assert len(MipChain.build(surface, min_level=8)) == surface.count_mipmaps(8) < 7
+    assert len(MipChain.build(surface, do_mips=False)) == 1
+    with pytest.raises(ValueError):
+        MipChain([])
+
+
+def test_compress_variants_matches_compress_all(make_surface, make_options):
+    ctx = Context()
+    chain = MipChain.build(make_surface(), Filters.BOX)
+    formats = [Format.BC1, Format.BC3, Format.RGBA]
+    targets = []
+    buffers = []
+    for format in formats:
+        oo = OutputOptions()
+        buffers.append(oo.output_to_buffer(bytearray(1 << 16)))
+        targets.append((make_options(format), oo))
+    ctx.compress_variants(chain, targets)
+
+    for format, buffer in zip(formats, buffers):
+        expected = ctx.compress_to_bytes(make_surface(), make_options(format), mipmap_filter=Filters.BOX)
+        assert bytes(buffer.getvalue()) == expected
+    # The chain is not modified, it can be compressed again.
+    assert chain.top.width == 64 and len(chain) == 7
@@ -0,0 +1,44 @@
+import pytest
+from nvtt.surface import Surface
+from nvtt.enums import Channel, InputFormat
+
+np = pytest.importorskip("numpy")
+
+
+def test_as_array_is_a_view(make_surface):
+    surface = make_surface(8, 4)
+    array = surface.as_array()
+    assert array.shape == (4, 4, 8) and array.dtype == np.float32
+    array[0] = 0.5
+    assert np.all(surface.as_array(Channel.RED) == 0.5)
+    assert surface.as_array(Channel.GREEN).shape == (4, 8)
+
+
+def test_as_array_matches_pixels():
+    surface = Surface()
+    surface.set_image_data(InputFormat.BGRA_8UB, 2, 1, 1, bytes([0, 51, 255, 255, 255, 0, 0, 0]))
+    np.testing.assert_allclose(surface.as_array()[:, 0, :], [[1, 0], [0.2, 0], [0, 1], [1, 0]], atol=1e-6)
+
+
+def test_as_array_keeps_surface_alive(make_surface):
+    array = make_surface().as_array(Channel.ALPHA)
+    expected = array.copy()
+    np.testing.assert_array_equal(array, expected)
+
+
+def test_from_array_round_trip():
+    rgba = np.random.default_rng(0).random((3, 5, 4), dtype=np.float32)
+    surface = Surface.from_array(rgba)
+    assert (surface.width, surface.height) == (5, 3)
+    assert surface.has_alpha
+    np.testing.assert_array_equal(np.moveaxis(surface.as_array(), 0, 2), rgba)
+
+
+def test_from_array_fills_missing_channels():
+    gray = Surface.from_array(np.full((2, 2), 255, dtype=np.uint8))
+    np.testing.assert_array_equal(gray.as_array(), np.ones((4, 2, 2), np.float32))
+    assert not gray.has_alpha
+    rgb = Surface.from_array(np.zeros((2, 2, 3), dtype=np.uint16))
+    np.testing.assert_array_equal(rgb.as_array(Channel.ALPHA), np.ones((2, 2), np.float32))
+    with pytest.raises(ValueError):
+        Surface.from_array(np.zeros((2, 2, 5)))
@@ -0,0 +1,78 @@
+import ctypes
+import pytest
+from nvtt.context import Context
+from nvtt.output import OutputOptions, OutputBuffer
+from nvtt.enums import Container
+
+
+def _compress_file(surface, co, path) -> bytes:
+    oo = OutputOptions()
+    oo.filename(str(path))
+    Context().compress_all(surface, co, oo)
+    # Destroying the options closes the file.
+    del oo
+    return path.read_bytes()
+
+
+def test_compress_to_bytes_matches_file(make_surface, co, tmp_path):
+    expected: bytes = _compress_file(make_surface(), co, tmp_path / "out.dds")
+    data = Context().compress_to_bytes(make_surface(), co)
+    assert isinstance(data, bytes)
+    assert data == expected
+
+
+def test_compress_all_to_buffer(make_surface, co, tmp_path):
+    expected: bytes = _compress_file(make_surface(), co, tmp_path / "out.dds")
+    buffer = bytearray(len(expected) + 100)
+    view = Context().compress_all_to_buffer(make_surface(), co, buffer)
+    assert bytes(view) == expected
+    assert buffer[:len(expected)] == expected
+
+
+def test_compress_all_to_buffer_too_small(make_surface, co):
+    with pytest.raises(RuntimeError):
+        Context().compress_all_to_buffer(make_surface(), co, bytearray(64))
+
+
+def test_caller_output_options_untouched(make_surface, co, tmp_path):
+    path = tmp_path / "caller.dds"
+    oo = OutputOptions()
+    oo.container(Container.DDS10)
+    oo.filename(str(path))
+    data = Context().compress_to_bytes(make_surface(), co, oo)
+    assert data[84:88] == b"DX10"
+    # The caller's file output still works afterwards.
+    Context().compress_all(make_surface(), co, oo)
+    oo.close()
+    assert path.read_bytes() == data
+
+
+def test_copy():
+    oo = OutputOptions()
+    oo.output_header(False)
+    oo.container(Container.DDS10)
+    assert oo.copy().settings == oo.settings == {"output_header": False, "container": int(Container.DDS10)}
+
+
+def test_output_buffer():
+    out = OutputBuffer(bytearray(4))
+    data = ctypes.create_string_buffer(b"abc", 3)
+    assert out.write(ctypes.addressof(data), 3)
+    assert not out.write(ctypes.addressof(data), 3)
+    assert (out.size, out.capacity) == (3, 4)
+    assert bytes(out.getvalue()) == b"abc"
+    with pytest.raises(TypeError):
+        OutputBuffer(b"read-only")
+
+
+def test_output_handler_callbacks(make_surface, co):
+    chunks: list[bytes] = []
+    images: list[tuple[int, ...]] = []
+    oo = OutputOptions()
+    oo.output_header(False)
+    oo.output_handler(lambda data, size: chunks.append(ctypes.string_at(data, size)) is None,
+                      lambda *args: images.append(args))
+    Context().compress_all(make_surface(), co, oo)
+    # (size, width, height, depth, face, miplevel) of each mip, 64x64 down to 1x1.
+    assert [image[1:] for image in images] == [(64 >> i, 64 >> i, 1, 0, i) for i in range(7)]
+    assert len(b"".join(chunks)) == sum(image[0] for image in images)
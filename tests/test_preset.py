@@ -0,0 +1,62 @@
+import dataclasses
+import pickle
+import threading
+import pytest
+from nvtt.context import Context
+from nvtt.compression import CompressionOptions
+from nvtt.preset import CompressionPreset, clear_presets
+from nvtt.enums import Format, Quality
+
+
+def test_normalized_equality_and_hash():
+    preset = CompressionPreset(Format.BC7, Quality.Production, color_weights=(1, 1, 1, 1))
+    same = CompressionPreset(int(Format.BC7), int(Quality.Production), color_weights=[1.0, 1.0, 1.0, 1.0])
+    assert preset == same and hash(preset) == hash(same)
+    assert isinstance(same.format, Format) and same.color_weights == (1.0, 1.0, 1.0, 1.0)
+    assert preset != CompressionPreset(Format.BC7)
+    assert len({preset, same, CompressionPreset(Format.BC1)}) == 2
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        preset.format = Format.BC1
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        CompressionPreset(color_weights=(1, 1, 1))
+    with pytest.raises(ValueError):
+        CompressionPreset(pixel_format=(8, 0, 0, 0))
+    with pytest.raises(ValueError):
+        CompressionPreset.from_settings({"format": 1, "unknown": 2})
+
+
+def test_key_and_pickle():
+    preset = CompressionPreset(Format.BC3, Quality.Fastest, quantization=(1, 0, 0, 127))
+    assert CompressionPreset.from_key(preset.key) == preset
+    assert CompressionPreset(Format.BC3, Quality.Fastest, quantization=(True, False, False, 127)).key == preset.key
+    assert pickle.loads(pickle.dumps(preset)) == preset
+    assert preset.replace(quality=Quality.Highest).quality == Quality.Highest
+    assert preset.quality == Quality.Fastest
+
+
+def test_options_round_trip(make_surface):
+    preset = CompressionPreset(Format.BC1, Quality.Normal, color_weights=(2, 1, 1, 1))
+    co = preset.create_options()
+    assert CompressionPreset.from_options(co) == preset
+    expected = CompressionOptions()
+    expected.format(Format.BC1)
+    expected.quality(Quality.Normal)
+    expected.color_weights(2, 1, 1, 1)
+    assert Context().compress_to_bytes(make_surface(), co) == Context().compress_to_bytes(make_surface(), expected)
+
+
+def test_options_are_shared_per_thread():
+    preset = CompressionPreset(Format.BC1)
+    co = preset.options()
+    assert CompressionPreset(Format.BC1).options() is co
+    other: list[CompressionOptions] = []
+    thread = threading.Thread(target=lambda: other.append(preset.options()))
+    thread.start()
+    thread.join()
+    assert other[0] is not co
+    clear_presets()
+    assert co.closed
+    assert preset.options() is not co
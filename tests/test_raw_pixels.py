@@ -0,0 +1,81 @@
+import ctypes
+import struct
+import pytest
+from nvtt.surface import Surface
+from nvtt.enums import InputFormat
+from tests.conftest import NVTT_PATH
+
+
+def _planes(surface: Surface) -> tuple[float, ...]:
+    """Returns the planar float32 data of a surface: every R, then every G, B and A."""
+    # A separate handle, so this prototype does not touch the wrapper's bindings.
+    data = ctypes.CDLL(str(NVTT_PATH)).nvttSurfaceData
+    data.restype = ctypes.POINTER(ctypes.c_float)
+    data.argtypes = [ctypes.c_void_p]
+    return tuple(data(surface._ptr)[:surface.width * surface.height * surface.depth * 4])
+
+
+def test_set_image():
+    surface = Surface()
+    assert surface.set_image(4, 2, 3)
+    assert (surface.width, surface.height, surface.depth) == (4, 2, 3)
+    assert set(_planes(surface)) == {0.0}
+
+
+def test_set_image_data_bgra():
+    surface = Surface()
+    surface.set_image_data(InputFormat.BGRA_8UB, 2, 1, 1, bytes([0, 51, 255, 255, 255, 0, 0, 0]))
+    assert _planes(surface) == pytest.approx([1.0, 0.0, 0.2, 0.0, 0.0, 1.0, 1.0, 0.0])
+
+
+def test_set_image_data_float():
+    surface = Surface()
+    surface.set_image_data(InputFormat.RGBA_32F, 1, 1, 1, struct.pack("4f", 0.5, 2.0, -1.0, 0.25))
+    assert _planes(surface) == (0.5, 2.0, -1.0, 0.25)
+
+
+def test_set_image_rgba():
+    surface = Surface()
+    surface.set_image_rgba(InputFormat.BGRA_8UB, 2, 1, 1, bytes([255, 0]), bytes([0, 255]), bytes([51, 0]), bytes([255, 255]))
+    assert _planes(surface) == pytest.approx([1.0, 0.0, 0.0, 1.0, 0.2, 0.0, 1.0, 1.0])
+
+
+@pytest.mark.parametrize("format, size", [
+    (InputFormat.BGRA_8UB, 4 * 4 * 4),
+    (InputFormat.RGBA_16F, 4 * 4 * 8),
+    (InputFormat.RGBA_32F, 4 * 4 * 16),
+    (InputFormat.R_32F, 4 * 4 * 4),
+])
+def test_set_image_data_checks_size(format, size):
+    surface = Surface()
+    with pytest.raises(ValueError):
+        surface.set_image_data(format, 4, 4, 1, bytes(size - 1))
+    assert surface.set_image_data(format, 4, 4, 1, bytes(size))
+
+
+def test_set_image_rgba_checks_size():
+    surface = Surface()
+    with pytest.raises(ValueError, match="^b "):
+        surface.set_image_rgba(InputFormat.RGBA_32F, 2, 2, 1, bytes(16), bytes(16), bytes(15), bytes(16))
+    with pytest.raises(ValueError, match="^r "):
+        surface.set_image_rgba(InputFormat.R_32F, 2, 2, 1, bytes(15), b"", b"", b"")
+    assert surface.set_image_rgba(InputFormat.R_32F, 2, 2, 1, bytes(16), b"", b"", b"")
+
+
+def test_from_pillow_matches_file(image_file):
+    Image = pytest.importorskip("PIL.Image")
+    with Image.open(image_file) as image:
+        surface = Surface.from_pillow(image)
+    assert surface.has_alpha
+    assert _planes(surface) == _planes(Surface(str(image_file)))
+
+
+def test_from_pillow_modes():
+    Image = pytest.importorskip("PIL.Image")
+    rgb = Surface.from_pillow(Image.new("RGB", (4, 2), (255, 0, 0)))
+    assert (rgb.width, rgb.height, rgb.has_alpha) == (4, 2, False)
+    assert _planes(rgb)[:8] == (1.0,) * 8
+    gray = Surface.from_pillow(Image.new("F", (2, 2), 3.5))
+    assert _planes(gray)[:4] == (3.5,) * 4
+    with pytest.raises(TypeError):
+        Surface().load_pillow(b"not an image")
@@ -0,0 +1,85 @@
+import threading
+import time
+import pytest
+from nvtt.utils.scheduler import MemoryBudgetScheduler, estimate_file_peak_bytes, estimate_peak_bytes
+from nvtt.utils.easy_dds import EasyDDS
+from nvtt.enums import Format
+
+
+class _Tracker:
+    """Job function recording the peak estimated memory and concurrency while jobs run."""
+
+    def __init__(self, sizes: dict[str, int | None]):
+        self.sizes = sizes
+        self.lock = threading.Lock()
+        self.running: list[str] = []
+        self.peak_memory = 0
+        self.alone: set[str] = set()
+
+    def __call__(self, job: str) -> str:
+        with self.lock:
+            self.running.append(job)
+            self.peak_memory = max(self.peak_memory, sum(self.sizes[j] or 0 for j in self.running))
+        time.sleep(0.02)
+        with self.lock:
+            if self.running == [job]:
+                self.alone.add(job)
+            self.running.remove(job)
+        return job.upper()
+
+
+def test_map_respects_budget():
+    sizes = {"a": 40, "b": 30, "c": 30, "d": 20, "e": 10, "f": 10}
+    tracker = _Tracker(sizes)
+    scheduler = MemoryBudgetScheduler(60, workers=4)
+    assert scheduler.map(tracker, list(sizes), sizes.get) == ["A", "B", "C", "D", "E", "F"]
+    assert 0 < tracker.peak_memory <= 60
+    assert scheduler.in_use == 0
+
+
+def test_unknown_and_oversized_jobs_run_alone():
+    sizes = {"big": 500, "unknown": None, "small1": 10, "small2": 10, "small3": 10}
+    tracker = _Tracker(sizes)
+    MemoryBudgetScheduler(100, workers=4).map(tracker, list(sizes), sizes.get)
+    assert {"big", "unknown"} <= tracker.alone
+
+
+def test_failing_estimate_runs_alone():
+    def estimate(job: str) -> int:
+        if job == "bad":
+            raise OSError("unreadable header")
+        return 10
+    sizes = {"bad": None, "x": 10, "y": 10}
+    tracker = _Tracker(sizes)
+    assert MemoryBudgetScheduler(100, workers=3).map(tracker, list(sizes), estimate) == ["BAD", "X", "Y"]
+    assert "bad" in tracker.alone
+
+
+def test_first_failed_job_is_raised():
+    def func(job: int) -> int:
+        if job in (1, 3):
+            raise ValueError(f"job {job}")
+        return job
+    with pytest.raises(ValueError, match="job 1"):
+        MemoryBudgetScheduler(100, workers=2).map(func, range(5), lambda job: 10 * (5 - job))
+
+
+def test_estimates(image_file):
+    assert estimate_peak_bytes(64, 64, Format.BC1) > estimate_peak_bytes(64, 64, Format.BC1, do_mips=False) > 64 * 64 * 16
+    assert estimate_peak_bytes(128, 128, Format.BC1) > estimate_peak_bytes(64, 64, Format.BC1)
+    # One 64x64 float32 surface, plus every compressed BC1 level (2048 + 512 + 128 + 32 + 3 * 8 bytes).
+    assert estimate_peak_bytes(64, 64, Format.BC1) == 64 * 64 * (4 + 16) + 2744
+    assert estimate_file_peak_bytes(image_file, Format.BC1) == estimate_peak_bytes(64, 64, Format.BC1)
+    text = image_file.with_suffix(".txt")
+    text.write_text("not an image")
+    assert estimate_file_peak_bytes(text, Format.BC1) is None
+    with pytest.raises(ValueError):
+        MemoryBudgetScheduler(0)
+
+
+def test_convert_tree_with_budget(tmp_path, make_image):
+    make_image(tmp_path / "a.png")
+    make_image(tmp_path / "b.png", 32, 32)
+    (tmp_path / "broken.png").write_bytes(b"not an image")
+    results = EasyDDS.convert_tree(tmp_path, memory_budget=estimate_peak_bytes(64, 64, Format.DXT1))
+    assert [(r.source.name, r.ok) for r in results] == [("a.png", True), ("b.png", True), ("broken.png", False)]
@@ -0,0 +1,145 @@
+import os
+from pathlib import Path
+import signal
+import subprocess
+import sys
+import threading
+import pytest
+from nvtt.context import Context
+from nvtt.pool import WorkerPool
+from nvtt.preset import CompressionPreset
+from nvtt.server import ConversionClient, ConversionError, ConversionServer
+from nvtt.enums import Format, Quality
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+@pytest.fixture
+def expected(image_file, make_options):
+    """Returns a factory of what the server writes for `image_file` at the default Quality.Normal."""
+    from nvtt.surface import Surface
+
+    def compress(format: Format = Format.DXT1, do_mips: bool = True) -> bytes:
+        return Context().compress_to_bytes(Surface(str(image_file)), make_options(format, Quality.Normal), do_mips=do_mips)
+    return compress
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def server(request, tmp_path):
+    unix_socket = tmp_path / "nvtt.sock" if request.param == "unix" else None
+    server = ConversionServer(port=0, unix_socket=unix_socket, workers=2, roots=[tmp_path], max_body=1024 * 1024)
+    if unix_socket is not None:
+        assert unix_socket.stat().st_mode & 0o777 == 0o600
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.close()
+    if unix_socket is not None:
+        assert not unix_socket.exists()
+
+
+def test_convert_bytes(server, image_file, expected):
+    with ConversionClient(server.address) as client:
+        assert client.convert_bytes(image_file.read_bytes()) == expected()
+        assert client.convert_bytes(image_file.read_bytes(), Format.BC3, do_mips=False) == expected(Format.BC3, False)
+        health = client.health()
+    assert health["status"] == "ok" and health["workers"] == 2 and health["converted"] == 2
+
+
+def test_convert_file(server, image_file, tmp_path, expected):
+    with ConversionClient(server.address) as client:
+        assert client.convert_file(image_file) == image_file.with_suffix(".dds")
+        output = client.convert_file(image_file, tmp_path / "out" / ".." / "named.dds", Format.BC7)
+    assert output == tmp_path / "named.dds"
+    assert image_file.with_suffix(".dds").read_bytes() == expected()
+    assert output.read_bytes() == expected(Format.BC7)
+
+
+def test_errors(server, image_file):
+    with ConversionClient(server.address) as client:
+        with pytest.raises(ConversionError) as error:
+            client.convert_bytes(b"not an image")
+        assert error.value.status == 400
+        with pytest.raises(ConversionError) as error:
+            client.convert_file(image_file.with_name("missing.png"))
+        assert error.value.status == 404
+        with pytest.raises(ConversionError) as error:
+            client._request("POST", "/convert?format=NOPE", b"", "application/octet-stream")
+        assert error.value.status == 400
+        # The connection is still usable after errors.
+        assert client.health()["status"] == "ok"
+
+
+def test_file_mode_restricted_to_roots(server, image_file, tmp_path):
+    outside = tmp_path.parent / f"{tmp_path.name}_outside.png"
+    outside.write_bytes(image_file.read_bytes())
+    try:
+        with ConversionClient(server.address) as client:
+            for source, output in [(outside, None), (image_file, tmp_path / ".." / "escape.dds")]:
+                with pytest.raises(ConversionError) as error:
+                    client.convert_file(source, output)
+                assert error.value.status == 403
+        assert not outside.with_suffix(".dds").exists() and not (tmp_path.parent / "escape.dds").exists()
+    finally:
+        outside.unlink()
+
+
+def test_file_mode_disabled_without_roots(image_file):
+    with ConversionServer(port=0, workers=1) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with ConversionClient(server.address) as client:
+                with pytest.raises(ConversionError) as error:
+                    client.convert_file(image_file)
+                assert error.value.status == 403
+                assert client.convert_bytes(image_file.read_bytes())[:4] == b"DDS "
+        finally:
+            server.shutdown()
+            thread.join()
+
+
+def test_body_checked_before_reading(server, image_file):
+    with ConversionClient(server.address) as client:
+        # Only the headers are sent, the server must answer without waiting for the body.
+        connection = client._connection
+        for path, status in [("/convert", 413), ("/unknown", 404)]:
+            connection.putrequest("POST", path)
+            connection.putheader("Content-Length", str(server.max_body + 1))
+            connection.endheaders()
+            response = connection.getresponse()
+            response.read()
+            assert response.status == status
+            connection.close()
+        assert client.convert_bytes(image_file.read_bytes())[:4] == b"DDS "
+
+
+def test_worker_pool(image_file, tmp_path, expected):
+    with WorkerPool(2, CompressionPreset(Format.DXT1, Quality.Normal)) as pool:
+        assert pool.convert_bytes(image_file.read_bytes()) == expected()
+        futures = [pool.submit_file(image_file, tmp_path / f"{i}.dds", CompressionPreset(Format.BC3, Quality.Normal)) for i in range(3)]
+        assert [f.result() for f in futures] == [tmp_path / f"{i}.dds" for i in range(3)]
+        assert pool.converted == 4
+    assert (tmp_path / "2.dds").read_bytes() == expected(Format.BC3)
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGTERM") or sys.platform.startswith("win"), reason="Unix sockets and SIGTERM.")
+def test_command_line(image_file, tmp_path, expected):
+    unix_socket = tmp_path / "server.sock"
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    process = subprocess.Popen([sys.executable, "-m", "nvtt.server", "--socket", str(unix_socket), "--workers", "1"],
+                               env=env, stdout=subprocess.PIPE, text=True)
+    try:
+        # NVTT may print warnings before the startup line.
+        for line in process.stdout:
+            if line.startswith("Serving"):
+                break
+        with ConversionClient(str(unix_socket)) as client:
+            assert client.convert_bytes(image_file.read_bytes()) == expected()
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(10) == 0
+        process.stdout.close()
+    assert not unix_socket.exists()
@@ -0,0 +1,67 @@
+import pytest
+from nvtt.context import Context
+from nvtt.output import OutputOptions
+from nvtt.tiled import BYTES_PER_TILE_PIXEL, RawTileSource, PillowTileSource, TileSource, tile_size_for_budget
+from nvtt.enums import Container, Filters, Format
+from tests.conftest import gradient
+
+SIZE: int = 128
+# Budget of a 32x32 tile, so level 0 is split into 16 tiles.
+BUDGET: int = 32 * 32 * BYTES_PER_TILE_PIXEL
+
+
+@pytest.fixture
+def raw_file(tmp_path):
+    path = tmp_path / "image.raw"
+    path.write_bytes(b"HEAD" + gradient(SIZE, SIZE))
+    return path
+
+
+@pytest.mark.parametrize("format", [Format.BC1, Format.BC7])
+def test_raw_source_matches_compress_all(make_surface, raw_file, tmp_path, format, make_options):
+    output = tmp_path / "tiled.dds"
+    source = RawTileSource(raw_file, SIZE, SIZE, offset=4)
+    try:
+        tiles = Context().compress_tiled(source, make_options(format), str(output), memory_budget=BUDGET)
+    finally:
+        source.close()
+    assert tiles == 16 + 4 + 1 + 1 + 1 + 1 + 1 + 1
+    expected = Context().compress_to_bytes(make_surface(SIZE, SIZE), make_options(format), mipmap_filter=Filters.BOX)
+    assert output.read_bytes() == expected
+
+
+def test_pillow_source_without_mips(image_file, tmp_path, make_options):
+    Image = pytest.importorskip("PIL.Image")
+    from nvtt.surface import Surface
+    output = tmp_path / "tiled.dds"
+    with Image.open(image_file) as image:
+        image.load()
+        assert Context().compress_tiled(PillowTileSource(image), make_options(), str(output), memory_budget=BUDGET, do_mips=False) == 4
+    assert output.read_bytes() == Context().compress_to_bytes(Surface(str(image_file)), make_options(), do_mips=False)
+
+
+def test_caller_output_options_untouched(make_surface, raw_file, tmp_path, make_options):
+    output = tmp_path / "tiled.dds"
+    oo = OutputOptions()
+    oo.container(Container.DDS10)
+    oo.filename(str(tmp_path / "caller.dds"))
+    Context().compress_tiled(RawTileSource(raw_file, SIZE, SIZE, offset=4), make_options(), str(output), oo, BUDGET)
+    assert output.read_bytes()[84:88] == b"DX10"
+    # The caller's file output still works afterwards.
+    Context().compress_all(make_surface(), make_options(), oo)
+    del oo
+    assert (tmp_path / "caller.dds").read_bytes()[84:88] == b"DX10"
+
+
+def test_tile_size_for_budget():
+    assert tile_size_for_budget(Format.BC1, BUDGET) == 32
+    assert tile_size_for_budget(Format.ASTC_LDR_6x6, BUDGET) % 6 == 0
+    with pytest.raises(ValueError):
+        tile_size_for_budget(Format.BC1, BYTES_PER_TILE_PIXEL)
+
+
+def test_tile_source_is_abstract():
+    class Incomplete(TileSource):
+        pass
+    with pytest.raises(TypeError):
+        Incomplete()
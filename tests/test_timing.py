@@ -0,0 +1,63 @@
+import pytest
+from nvtt.context import Context
+from nvtt.surface import Surface
+from nvtt.timing import TimingContext, DETAIL_SURFACE
+
+
+def test_context_timing_default_level(make_surface, make_options):
+    ctx = Context()
+    ctx.enable_timing(True)
+    ctx.compress_to_bytes(make_surface(), make_options())
+    stages = ctx.timing_context.as_dict()
+    assert {"Estimate size", "Output header", "image to buffer"} <= set(stages)
+    assert all(seconds >= 0 for seconds in stages.values())
+    assert len(ctx.timing_context) == len(ctx.timing_context.records)
+
+
+def test_surface_timing_default_level(image_file):
+    tc = TimingContext()
+    surface = Surface(timing_context=tc)
+    surface.load(str(image_file))
+    surface.build_next_mipmap(0)
+    assert {"Surface::load", "Surface::buildNextMipmap"} <= set(tc.as_dict())
+    stage, seconds = tc.record(0)
+    assert isinstance(stage, str) and seconds >= 0
+
+
+def test_detail_levels(image_file):
+    tc = TimingContext(1)
+    Surface(str(image_file), timing_context=tc)
+    assert len(tc) == 0
+    tc.set_detail_level(DETAIL_SURFACE)
+    Surface(str(image_file), timing_context=tc)
+    assert "Surface::load" in tc.as_dict()
+
+
+def test_timing_disabled(make_surface, make_options):
+    ctx = Context()
+    ctx.enable_timing(False)
+    ctx.compress_to_bytes(make_surface(), make_options())
+    assert ctx.timing_context is None or len(ctx.timing_context) == 0
+
+
+def test_borrowed_timing_context_after_close(make_surface, make_options, image_file):
+    ctx = Context()
+    ctx.enable_timing(True)
+    ctx.compress_to_bytes(make_surface(), make_options())
+    tc = ctx.timing_context
+    ctx.close()
+    assert tc.closed
+    with pytest.raises(RuntimeError):
+        len(tc)
+    with pytest.raises(RuntimeError):
+        Surface(timing_context=tc).load(str(image_file))
+
+
+def test_close(image_file):
+    with TimingContext() as tc:
+        Surface(str(image_file), timing_context=tc)
+        assert len(tc) > 0
+    assert tc.closed
+    with pytest.raises(RuntimeError):
+        tc.records
+    tc.close()
@@ -0,0 +1,94 @@
+import os
+import queue
+import threading
+import pytest
+from nvtt.context import Context
+from nvtt.surface import Surface
+from nvtt.watch import TextureWatcher, WatchEvent, _InotifyWatcher
+from nvtt.enums import Format, Quality
+
+TIMEOUT: float = 10.0
+
+
+@pytest.fixture
+def expected(make_options):
+    """Returns a factory of what the watcher writes for an image at the default DXT1 and Quality.Normal."""
+    def compress(image_file) -> bytes:
+        return Context().compress_to_bytes(Surface(str(image_file)), make_options(Format.DXT1, Quality.Normal))
+    return compress
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def watch(request, tmp_path):
+    """Starts a TextureWatcher on tmp_path / "src" in a thread, yielding it and the queue of its events."""
+    if request.param and not _InotifyWatcher.is_available():
+        pytest.skip("inotify is not available.")
+    root = tmp_path / "src"
+    root.mkdir()
+    events: queue.Queue[WatchEvent] = queue.Queue()
+
+    def start(convert_stale: bool = False, **kwargs) -> TextureWatcher:
+        watcher = TextureWatcher([root], workers=1, debounce=0.05, use_inotify=request.param, on_event=events.put, **kwargs)
+        assert watcher.uses_inotify == request.param
+        thread = threading.Thread(target=watcher.run, args=(convert_stale,), daemon=True)
+        thread.start()
+        started.append((watcher, thread))
+        return watcher
+
+    started: list[tuple[TextureWatcher, threading.Thread]] = []
+    yield root, events, start
+    for watcher, thread in started:
+        watcher.stop()
+        thread.join(TIMEOUT)
+        watcher.close()
+
+
+def test_converts_new_and_changed_files(watch, make_image, expected):
+    root, events, start = watch
+    start()
+    source = make_image(root / "sub" / "a.png", seed=1)
+    event = events.get(timeout=TIMEOUT)
+    assert event.ok and event.source == source and event.output == source.with_suffix(".dds")
+    assert event.output.read_bytes() == expected(source)
+
+    make_image(source, seed=2)
+    event = events.get(timeout=TIMEOUT)
+    assert event.source == source
+    assert event.output.read_bytes() == expected(source)
+    (root / "notes.txt").write_text("ignored")
+    with pytest.raises(queue.Empty):
+        events.get(timeout=0.5)
+
+
+def test_reports_errors(watch):
+    root, events, start = watch
+    start()
+    (root / "broken.png").write_bytes(b"not an image")
+    event = events.get(timeout=TIMEOUT)
+    assert not event.ok and not event.output.exists()
+
+
+def test_convert_stale_and_output_dir(watch, make_image, tmp_path, expected):
+    root, events, start = watch
+    source = make_image(root / "a.png")
+    out = tmp_path / "out"
+    watcher = start(convert_stale=True, output_dir=out)
+    event = events.get(timeout=TIMEOUT)
+    assert event.output == out / "a.dds"
+    assert event.output.read_bytes() == expected(source)
+    assert watcher.stale() == []
+
+
+def test_stale(tmp_path, make_image):
+    source = make_image(tmp_path / "a.png")
+    with TextureWatcher([tmp_path], workers=1, use_inotify=False) as watcher:
+        assert watcher.stale() == [source]
+        output = source.with_suffix(".dds")
+        output.write_bytes(b"DDS ")
+        assert watcher.stale() == []
+        os.utime(output, ns=(0, 0))
+        assert watcher.stale() == [source]
+        with pytest.raises(ValueError):
+            TextureWatcher([tmp_path, tmp_path], output_dir=tmp_path / "out")
+    with pytest.raises(NotADirectoryError):
+        TextureWatcher([tmp_path / "missing"])